@@ -0,0 +1,55 @@
+# Alembic/env.py
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+from sqlmodel import SQLModel
+from app.config import settings
+# Import every model so SQLModel.metadata is complete for autogenerate
+from app.models.user import User  # noqa: F401
+from app.models.habit import Habit  # noqa: F401
+from app.models.habit_progress import HabitProgress  # noqa: F401
+from app.models.reminder import Reminder  # noqa: F401
+from app.models.reminder_change import ReminderChange  # noqa: F401
+from app.models.streak import Streak  # noqa: F401
+from app.models.user_daily_rollup import UserDailyRollup  # noqa: F401
+# Registers the SQLite local_date() function on connect, for data migrations
+import app.utils.sql  # noqa: F401
+
+config = context.config
+config.set_main_option("sqlalchemy.url", settings.database_url)
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = SQLModel.metadata
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout without a database connection"""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run migrations against the configured database"""
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
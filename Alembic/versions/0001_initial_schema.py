@@ -0,0 +1,85 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+The schema the pre-Alembic create_all produced: no streaks.length and, as
+its unique constraint was attached too late to take effect, no
+unique_habit_date. ``python -m app.cli migrate`` stamps such databases at
+this revision; 0007 brings both in.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(length=50), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "habits",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.String(length=500), nullable=True),
+        sa.Column("frequency", sa.Enum("DAILY", "WEEKLY", "CUSTOM", name="frequencytype"), nullable=False),
+        sa.Column("reminder_time", sa.Time(), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("archived", sa.Boolean(), nullable=False),
+    )
+
+    op.create_table(
+        "habit_progress",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("habit_id", sa.Integer(), sa.ForeignKey("habits.id"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("completed", sa.Boolean(), nullable=False),
+        sa.Column("note", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_habit_progress_date", "habit_progress", ["date"])
+
+    op.create_table(
+        "reminders",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("habit_id", sa.Integer(), sa.ForeignKey("habits.id"), nullable=False),
+        sa.Column("reminder_time", sa.Time(), nullable=False),
+        sa.Column("enabled", sa.Boolean(), nullable=False),
+    )
+
+    op.create_table(
+        "streaks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("habit_id", sa.Integer(), sa.ForeignKey("habits.id"), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("longest", sa.Boolean(), nullable=False),
+        sa.Column("current", sa.Boolean(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("streaks")
+    op.drop_table("reminders")
+    op.drop_index("ix_habit_progress_date", table_name="habit_progress")
+    op.drop_table("habit_progress")
+    op.drop_table("habits")
+    sa.Enum(name="frequencytype").drop(op.get_bind(), checkfirst=True)
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_users_username", table_name="users")
+    op.drop_table("users")
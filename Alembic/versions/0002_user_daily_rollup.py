@@ -0,0 +1,30 @@
+"""user_daily_rollup
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Filled from progress history by 0007.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "user_daily_rollup",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("date", sa.Date(), primary_key=True),
+        sa.Column("active_habits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("entries", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completed", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade():
+    op.drop_table("user_daily_rollup")
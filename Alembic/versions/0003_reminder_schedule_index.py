@@ -0,0 +1,21 @@
+"""reminders (enabled, reminder_time) index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_reminders_enabled_time", "reminders", ["enabled", "reminder_time"])
+
+
+def downgrade():
+    op.drop_index("ix_reminders_enabled_time", table_name="reminders")
@@ -0,0 +1,25 @@
+"""users.timezone
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "users",
+        sa.Column("timezone", sa.String(length=64), nullable=False, server_default="UTC"),
+    )
+
+
+def downgrade():
+    op.drop_column("users", "timezone")
@@ -0,0 +1,21 @@
+"""habits (user_id, archived) index
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_habits_user_archived", "habits", ["user_id", "archived"])
+
+
+def downgrade():
+    op.drop_index("ix_habits_user_archived", table_name="habits")
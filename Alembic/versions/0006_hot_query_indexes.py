@@ -0,0 +1,30 @@
+"""indexes for streak, reminder and completed-progress lookups
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_streaks_habit_start", "streaks", ["habit_id", "start_date"])
+    op.create_index("ix_reminders_habit_id", "reminders", ["habit_id"])
+    op.create_index(
+        "ix_habit_progress_completed", "habit_progress", ["habit_id", "date"],
+        postgresql_where=sa.text("completed = true"),
+        sqlite_where=sa.text("completed = 1"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_habit_progress_completed", table_name="habit_progress")
+    op.drop_index("ix_reminders_habit_id", table_name="reminders")
+    op.drop_index("ix_streaks_habit_start", table_name="streaks")
@@ -0,0 +1,48 @@
+"""streaks.length and one progress entry per habit per day
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+Duplicate (habit_id, date) entries are collapsed to the newest before the
+constraint is added. Streak runs and user_daily_rollup are then rebuilt from
+the deduplicated history, so incremental writes start from correct state.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlmodel import Session
+from app.services.rollup_service import RollupService
+from app.services.streak_service import StreakService
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Runs written before this revision carry no length; they are rebuilt below
+    op.execute("DELETE FROM streaks")
+    with op.batch_alter_table("streaks") as batch:
+        batch.add_column(sa.Column("length", sa.Integer(), nullable=False, server_default="0"))
+
+    op.execute(
+        "DELETE FROM habit_progress WHERE id IN ("
+        " SELECT older.id FROM habit_progress older JOIN habit_progress newer"
+        " ON newer.habit_id = older.habit_id AND newer.date = older.date AND newer.id > older.id)"
+    )
+    with op.batch_alter_table("habit_progress") as batch:
+        batch.create_unique_constraint("unique_habit_date", ["habit_id", "date"])
+
+    # Same code as 'rebuild-streaks' and 'rebuild-rollups', inside the migration's transaction
+    with Session(bind=op.get_bind()) as db:
+        StreakService.rebuild_streaks(db)
+        RollupService.rebuild_rollups(db)
+        db.flush()
+
+
+def downgrade():
+    with op.batch_alter_table("habit_progress") as batch:
+        batch.drop_constraint("unique_habit_date", type_="unique")
+    with op.batch_alter_table("streaks") as batch:
+        batch.drop_column("length")
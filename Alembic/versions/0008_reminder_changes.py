@@ -0,0 +1,30 @@
+"""reminder_changes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "reminder_changes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("habit_id", sa.Integer(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_reminder_changes_created_at", "reminder_changes", ["created_at"])
+
+
+def downgrade():
+    op.drop_index("ix_reminder_changes_created_at", table_name="reminder_changes")
+    op.drop_table("reminder_changes")
@@ -0,0 +1,194 @@
+# app/cli.py
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlmodel import Session
+from app.config import settings
+from app.database import engine
+# Import every model so relationship() string references resolve
+from app.models.user import User  # noqa: F401
+from app.models.habit import Habit  # noqa: F401
+from app.models.habit_progress import HabitProgress  # noqa: F401
+from app.models.reminder import Reminder  # noqa: F401
+from app.models.reminder_change import ReminderChange  # noqa: F401
+from app.models.streak import Streak  # noqa: F401
+from app.models.user_daily_rollup import UserDailyRollup  # noqa: F401
+from app.services.export_service import ExportService, RECORD_TYPES
+from app.services.import_service import ImportService, IMPORT_FORMATS
+from app.services.rollup_service import RollupService
+from app.services.streak_service import StreakService
+from app.utils.query_plans import check_hot_queries
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALEMBIC_INI = os.path.join(PROJECT_ROOT, "Alembic", "alembic.ini")
+
+# Run in a fresh interpreter per sample: import app.main, then its startup handlers
+_STARTUP_PROBE = """
+import asyncio, json, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+asyncio.run(app.main.app.router.startup())
+ready = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "startup_ms": (ready - imported) * 1000}))
+"""
+
+
+def migrate(args):
+    """Apply Alembic migrations; run once per deploy, before starting workers.
+
+    A database created by the pre-Alembic create_all has the tables but no
+    alembic_version; it is stamped at the baseline revision 0001 first.
+    """
+    config = Config(ALEMBIC_INI)
+    tables = set(inspect(engine).get_table_names())
+    if "users" in tables and "alembic_version" not in tables:
+        if "user_daily_rollup" in tables:
+            sys.exit(
+                "Unversioned database newer than the baseline schema; "
+                "stamp its revision with 'alembic stamp' before migrating"
+            )
+        print("Unversioned baseline database: stamping revision 0001")
+        command.stamp(config, "0001")
+    command.upgrade(config, args.revision)
+
+
+def startup_bench(args):
+    """Time cold import plus startup of app.main; exits 1 over startup_target_ms"""
+    env = dict(os.environ, REMINDER_SCHEDULER_ENABLED="false")
+    samples = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _STARTUP_PROBE], cwd=PROJECT_ROOT, env=env,
+            check=True, capture_output=True, text=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    for key in ("import_ms", "startup_ms"):
+        values = [sample[key] for sample in samples]
+        print(f"{key}: median {statistics.median(values):.0f} max {max(values):.0f}")
+    total = statistics.median(sample["import_ms"] + sample["startup_ms"] for sample in samples)
+    print(f"total_ms: median {total:.0f} (target {settings.startup_target_ms})")
+    if total > settings.startup_target_ms:
+        sys.exit(1)
+
+
+def rebuild_streaks(args):
+    """Backfill the streaks table from progress history"""
+    with Session(engine) as db:
+        written = StreakService.rebuild_streaks(db, args.habit_id or None)
+        db.commit()
+    print(f"Rebuilt {written} streak runs")
+
+
+def rebuild_rollups(args):
+    """Backfill user_daily_rollup from progress history"""
+    with Session(engine) as db:
+        written = RollupService.rebuild_rollups(db, args.user_id or None)
+        db.commit()
+    print(f"Rebuilt {written} rollup rows")
+
+
+def check_rollups(args):
+    """Report rollup rows that disagree with habit_progress; exits 1 on any"""
+    with Session(engine) as db:
+        mismatches = RollupService.check_rollups(db, args.user_id or None)
+    for user_id, day, stored, expected in mismatches:
+        print(f"user {user_id} {day}: stored={stored} expected={expected}")
+    print(f"{len(mismatches)} mismatched rollup rows")
+    if mismatches:
+        sys.exit(1)
+
+
+def export(args):
+    """Write a user's data as NDJSON or CSV, streaming from the database"""
+    output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        with Session(engine) as db:
+            for chunk in ExportService.stream(db, args.user_id, args.format, args.include or RECORD_TYPES, args.gzip):
+                output.write(chunk)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+
+
+def import_progress(args):
+    """Load progress history for a user from an NDJSON or CSV file"""
+    with Session(engine) as db:
+        user = db.get(User, args.user_id)
+        if user is None:
+            sys.exit(f"No user with id {args.user_id}")
+        with open(args.path, encoding="utf-8-sig", newline="") as lines:
+            result = ImportService.import_progress(db, user, lines, args.format)
+    for error in result.errors:
+        print(f"line {error.line}: {error.message}")
+    print(
+        f"Read {result.rows_read} rows: wrote {result.progress_written} progress entries, "
+        f"rejected {result.rows_rejected}, skipped {result.rows_skipped}, created {result.habits_created} habits"
+    )
+
+
+def check_indexes(args):
+    """EXPLAIN every hot service query; exits 1 if any reads a large table in full"""
+    with Session(engine) as db:
+        problems = check_hot_queries(db)
+    for name, tables in problems:
+        print(f"{name}: full scan of {', '.join(tables)}")
+    print(f"{len(problems)} queries without a usable index")
+    if problems:
+        sys.exit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Smart Habit Tracker maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrator = subparsers.add_parser("migrate", help="Upgrade the database schema (Alembic)")
+    migrator.add_argument("revision", nargs="?", default="head")
+    migrator.set_defaults(func=migrate)
+
+    bench = subparsers.add_parser("startup-bench", help="Measure cold import plus startup time of the app")
+    bench.add_argument("--runs", type=int, default=5)
+    bench.set_defaults(func=startup_bench)
+
+    rebuild = subparsers.add_parser("rebuild-streaks", help="Recompute stored streak runs from progress history")
+    rebuild.add_argument("--habit-id", type=int, action="append", help="Limit to a habit (repeatable)")
+    rebuild.set_defaults(func=rebuild_streaks)
+
+    rollups = subparsers.add_parser("rebuild-rollups", help="Recompute user_daily_rollup from progress history")
+    rollups.add_argument("--user-id", type=int, action="append", help="Limit to a user (repeatable)")
+    rollups.set_defaults(func=rebuild_rollups)
+
+    check = subparsers.add_parser("check-rollups", help="Compare user_daily_rollup with progress history")
+    check.add_argument("--user-id", type=int, action="append", help="Limit to a user (repeatable)")
+    check.set_defaults(func=check_rollups)
+
+    exporter = subparsers.add_parser("export", help="Stream a user's habits, progress, reminders and streaks")
+    exporter.add_argument("--user-id", type=int, required=True)
+    exporter.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    exporter.add_argument("--include", choices=RECORD_TYPES, action="append", help="Record type (repeatable, default all)")
+    exporter.add_argument("--gzip", action="store_true", help="Compress the output")
+    exporter.add_argument("--output", default="-", help="File to write, or - for stdout")
+    exporter.set_defaults(func=export)
+
+    importer = subparsers.add_parser("import", help="Bulk-load a user's progress history from a file")
+    importer.add_argument("--user-id", type=int, required=True)
+    importer.add_argument("--format", choices=IMPORT_FORMATS, default="ndjson")
+    importer.add_argument("path", help="NDJSON or CSV file of habit_id/habit_name, date, completed, note")
+    importer.set_defaults(func=import_progress)
+
+    indexes = subparsers.add_parser("check-indexes", help="Check that hot service queries are served by indexes")
+    indexes.set_defaults(func=check_indexes)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,89 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
     environment: str = "development"
     
+    # Database engines: reads go to database_read_url when set, otherwise to the primary
+    database_read_url: Optional[str] = None
+    db_echo: bool = False
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    # Startup: workers only check the schema revision ('python -m app.cli migrate' applies it).
+    # db_auto_create runs create_all instead, for throwaway SQLite databases in development and tests
+    db_auto_create: bool = False
+    db_schema_check: bool = True
+    # Connections opened per engine before serving the first request
+    db_pool_warmup: int = 2
+    # Budget for import plus startup of app.main, checked by 'python -m app.cli startup-bench'
+    startup_target_ms: int = 2500
+    # Postgres statement_timeout per connection; 0 disables it
+    db_statement_timeout_ms: int = 30000
+    # After a user's own commit their reads stay on the primary this long (read-your-writes).
+    # The replica is only used when every worker sees those markers: a shared cache_url,
+    # or read_your_writes_single_process for one worker
+    read_your_writes_seconds: int = 5
+    read_your_writes_max_entries: int = 10000
+    read_your_writes_single_process: bool = False
+    
+    # Request logs: one JSON line for this fraction of requests, plus every 5xx and slow request
+    request_log_sample_rate: float = 0.01
+    slow_request_ms: int = 1000
+    # Debug profiling: X-DB-Queries/X-DB-Time headers and N+1 warnings for statement
+    # shapes repeated at least db_n_plus_one_threshold times in one request
+    db_profiling: bool = False
+    db_n_plus_one_threshold: int = 3
+    
+    # Sync route handlers and their database calls run in this many worker threads
+    threadpool_size: int = 40
+    # Worker processes serving the app (uvicorn and gunicorn read WEB_CONCURRENCY too);
+    # startup warns when per-process state would be split across them
+    web_concurrency: int = 1
+    
+    # Password hashing: bcrypt cost and the bounded pool it runs on
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+    password_hash_timeout_seconds: float = 5.0
+    
+    # Caching: None/"memory://" keeps caches in-process, "redis://..." shares them between workers
+    cache_url: Optional[str] = None
+    identity_cache_ttl_seconds: int = 60
+    identity_cache_max_entries: int = 10000
+    bitmap_cache_ttl_seconds: int = 60
+    bitmap_cache_max_entries: int = 50000
+    dashboard_cache_ttl_seconds: int = 300
+    dashboard_cache_max_entries: int = 10000
+    # The bitmap cache, and the dashboard cache with its ETags, need a shared cache_url
+    # (invalidation must reach every worker), unless the app runs as one process
+    bitmap_cache_single_process: bool = False
+    dashboard_cache_single_process: bool = False
+    
+    # Rate limits: counters live in rate_limit_storage_uri ("memory://" for one process and
+    # tests, "redis://..." shared between workers)
+    rate_limit_enabled: bool = True
+    rate_limit_storage_uri: str = "memory://"
+    rate_limit_strategy: str = "sliding-window-counter"
+    rate_limit_default: str = "100/minute"
+    rate_limit_auth: str = "5/minute"
+    rate_limit_export: str = "10/hour"
+    rate_limit_import: str = "10/hour"
+    # Proxies in front of the app that append to X-Forwarded-For (0 = use the socket address)
+    rate_limit_trusted_proxies: int = 0
+    
+    # Exports: rows fetched per server-side cursor batch
+    export_yield_per: int = 1000
+    
+    # Imports: rows validated and staged per chunk, and row errors reported back
+    import_chunk_rows: int = 5000
+    import_max_errors: int = 100
+    
+    # Reminder scheduler: off by default, enable it in exactly one process; sink is "log" or "queue"
+    reminder_scheduler_enabled: bool = False
+    reminder_sink: str = "log"
+    reminder_resync_minutes: int = 10
+    reminder_max_catch_up_minutes: int = 5
+    
     class Config:
         env_file = ".env"
 
@@ -1,25 +1,180 @@
+import time
+from typing import Optional
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
 from sqlmodel import SQLModel, create_engine, Session
-from sqlalchemy import UniqueConstraint
 from app.config import settings
+from app.utils.cache import NamedCache, create_cache
+from app.utils.metrics import Counter, Gauge, Histogram
 
-# Database engine
-engine = create_engine(
-    settings.database_url,
-    echo=settings.environment == "development"
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a pooled database connection",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
 )
+POOL_IN_USE = Gauge("db_pool_connections_in_use", "Database connections checked out of the pool", ["engine"])
+POOL_OVERFLOW = Counter("db_pool_overflow_total", "Connections opened beyond the pool size", ["engine"])
+POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Checkouts that gave up waiting for a connection", ["engine"])
+READ_SESSIONS = Counter("db_read_sessions_total", "Read-only sessions by the engine they were routed to", ["engine"])
 
-def create_db_and_tables():
-    """Create database tables with constraints"""
-    from app.models.habit_progress import HabitProgress
-    
-    # Add unique constraint to HabitProgress table
-    HabitProgress.__table_args__ = (
-        UniqueConstraint('habit_id', 'date', name='unique_habit_date'),
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout latency, connections in use and overflow.
+
+    Only public pool API is used: checkout latency and timeouts around
+    ``connect()``, the rest from pool events and ``checkedout()``/``overflow()``.
+    """
+    metrics_name = "primary"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        event.listen(self, "connect", self._on_connect)
+        event.listen(self, "checkout", self._on_checkout)
+        event.listen(self, "checkin", self._on_checkin)
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.inc(engine=self.metrics_name)
+            raise
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start, engine=self.metrics_name)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        # overflow() already counts the connection being opened; above zero it is past pool_size
+        if self.overflow() > 0:
+            POOL_OVERFLOW.inc(engine=self.metrics_name)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        POOL_IN_USE.set(self.checkedout(), engine=self.metrics_name)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        # Fires before the connection is back in the pool
+        POOL_IN_USE.set(max(self.checkedout() - 1, 0), engine=self.metrics_name)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+def _engine_options(url: str) -> dict:
+    """create_engine keyword arguments for a database URL, from settings"""
+    options = {"echo": settings.db_echo, "pool_pre_ping": settings.db_pool_pre_ping}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite needs its single shared connection
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
     )
-    
+    if parsed.get_backend_name() == "postgresql" and settings.db_statement_timeout_ms:
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+    return options
+
+
+def build_engine(url: str, name: str):
+    """Create an engine whose pool metrics are labelled ``name``"""
+    new_engine = create_engine(url, **_engine_options(url))
+    if isinstance(new_engine.pool, InstrumentedQueuePool):
+        new_engine.pool.metrics_name = name
+    return new_engine
+
+
+# Database engines
+engine = build_engine(settings.database_url, "primary")
+read_engine = build_engine(settings.database_read_url, "replica") if settings.database_read_url else engine
+
+# user id -> marker set when that user's session commits; reads stay on the primary until it expires
+recent_writes = NamedCache(
+    "recent_writes",
+    create_cache(settings.cache_url, settings.read_your_writes_max_entries, settings.read_your_writes_seconds)
+)
+
+def replica_enabled() -> bool:
+    """Whether reads may go to the replica.
+
+    Only when every worker sees the read-your-writes markers; otherwise a user's
+    next read could land on a worker that missed their write and go to a replica
+    that has not caught up.
+    """
+    return read_engine is not engine and (recent_writes.backend.shared or settings.read_your_writes_single_process)
+
+@event.listens_for(Session, "after_commit")
+def _remember_write(session):
+    # get_current_user tags the request's primary session with the user id
+    user_id = session.info.get("user_id")
+    if user_id is not None and replica_enabled():
+        recent_writes.set(f"recent_writes:{user_id}", True)
+
+def read_bind(user_id: Optional[int] = None):
+    """Engine for a read-only session: the replica unless the user just wrote"""
+    if not replica_enabled() or (user_id is not None and recent_writes.get(f"recent_writes:{user_id}")):
+        return engine
+    return read_engine
+
+# Alembic revision this code expects; bump it with every new migration
+SCHEMA_REVISION = "0008"
+
+
+class SchemaVersionError(RuntimeError):
+    """The database is not migrated to SCHEMA_REVISION"""
+
+
+def create_db_and_tables():
+    """Create missing tables straight from the models (db_auto_create only).
+
+    Databases that outlive a test run are managed with ``python -m app.cli migrate``.
+    """
     SQLModel.metadata.create_all(engine)
 
+def check_schema_version():
+    """One-row read of alembic_version; raises SchemaVersionError unless it is SCHEMA_REVISION"""
+    with engine.connect() as connection:
+        try:
+            current = connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except DBAPIError:
+            # No alembic_version table: the database was never migrated
+            current = None
+    if current != SCHEMA_REVISION:
+        raise SchemaVersionError(
+            f"Database schema is at {current or 'no revision'}, expected {SCHEMA_REVISION}; "
+            "run 'python -m app.cli migrate'"
+        )
+
+def warm_pool(db_engine, connections: int) -> int:
+    """Open up to ``connections`` pooled connections now instead of on the first requests"""
+    pool_size = db_engine.pool.size() if isinstance(db_engine.pool, QueuePool) else 1
+    opened = []
+    try:
+        for _ in range(min(connections, pool_size)):
+            opened.append(db_engine.connect())
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
 def get_session():
-    """Database session dependency"""
+    """Database session dependency.
+
+    Sessions are synchronous: routes and dependencies that use one are declared
+    with plain ``def`` so FastAPI runs them in its threadpool, off the event loop.
+    """
     with Session(engine) as session:
         yield session
+
+def open_read_session(user_id: Optional[int] = None) -> Session:
+    """Session for read-only work, routed by read_bind"""
+    bind = read_bind(user_id)
+    READ_SESSIONS.inc(engine="primary" if bind is engine else "replica")
+    return Session(bind)
@@ -1,15 +1,18 @@
 # Updated app/main.py
-from fastapi import FastAPI
+import logging
+import anyio
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from app.database import create_db_and_tables
-from app.routers import auth, habits, progress, streaks, dashboard, reminders
-from app.middleware.logging import LoggingMiddleware
+from fastapi.responses import PlainTextResponse
+from app.config import settings
+from app.routers import auth, habits, progress, streaks, dashboard, reminders, export
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.rate_limiting import api_rate_limit
+from app.services.reminder_scheduler import reminder_scheduler
+from app.utils.metrics import REGISTRY
+from app.utils.startup import prepare_worker
 
-# Create rate limiter
-limiter = Limiter(key_func=get_remote_address)
+logging.basicConfig(level=logging.INFO)
 
 # Create FastAPI app
 app = FastAPI(
@@ -20,12 +23,8 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
-# Add rate limiting
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # Add middleware
-app.add_middleware(LoggingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -33,21 +32,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-DB-Queries", "X-DB-Time", "X-RateLimit-Limit", "Retry-After"],
 )
 
-# Include all routers
+# Include all routers; auth applies its own per-route limits
+rate_limited = [Depends(api_rate_limit)]
 app.include_router(auth.router)
-app.include_router(habits.router)
-app.include_router(progress.router)
-app.include_router(streaks.router)
-app.include_router(dashboard.router)
-app.include_router(reminders.router)
-app.include_router(reminders.reminder_router)
+app.include_router(habits.router, dependencies=rate_limited)
+app.include_router(progress.router, dependencies=rate_limited)
+app.include_router(streaks.router, dependencies=rate_limited)
+app.include_router(dashboard.router, dependencies=rate_limited)
+app.include_router(reminders.router, dependencies=rate_limited)
+app.include_router(reminders.reminder_router, dependencies=rate_limited)
+app.include_router(export.router, dependencies=rate_limited)
 
 @app.on_event("startup")
 def on_startup():
-    """Create database tables on startup"""
-    create_db_and_tables()
+    """Check the schema revision, warm the pool and precompile hot queries"""
+    prepare_worker()
+
+@app.on_event("startup")
+async def configure_threadpool():
+    """Size the threadpool that runs sync route handlers and database calls"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+
+@app.on_event("startup")
+async def start_reminder_scheduler():
+    """Start firing reminders in the background"""
+    if settings.reminder_scheduler_enabled:
+        reminder_scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_reminder_scheduler():
+    await reminder_scheduler.stop()
 
 @app.get("/")
 async def root():
@@ -62,3 +79,8 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "version": "1.0.0"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of the in-process metrics"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
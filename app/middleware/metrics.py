@@ -0,0 +1,92 @@
+# app/middleware/metrics.py
+import json
+import logging
+import random
+import time
+from starlette.datastructures import MutableHeaders
+from app.config import settings
+from app.utils.metrics import Counter, Gauge, Histogram
+from app.utils.query_stats import begin_request, end_request
+
+logger = logging.getLogger("app.requests")
+
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "Request latency by route template", ["method", "route"])
+REQUESTS = Counter("http_requests_total", "Requests by route template and status code", ["method", "route", "status"])
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served", ["method"])
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per request", ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+)
+REQUEST_DB_SECONDS = Histogram("http_request_db_seconds", "Time spent in SQL statements per request", ["route"])
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency, status and database usage.
+
+    Routes are labelled by their path template (``/habits/{habit_id}``) so label
+    cardinality stays bounded. One structured log line is written for a sampled
+    fraction of requests, and always for server errors and slow requests.
+
+    In profiling mode (``db_profiling``) responses carry ``X-DB-Queries`` and
+    ``X-DB-Time`` headers, and repeated statement shapes are logged as N+1 suspects.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.db_profiling:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.count)
+                    headers["X-DB-Time"] = f"{stats.seconds * 1000:.2f}"
+            await send(message)
+
+        IN_FLIGHT.inc(method=method)
+        stats, token = begin_request(track_shapes=settings.db_profiling)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            end_request(token)
+            IN_FLIGHT.dec(method=method)
+
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            REQUEST_SECONDS.observe(duration, method=method, route=route)
+            REQUESTS.inc(method=method, route=route, status=str(status_code))
+            REQUEST_DB_QUERIES.observe(stats.count, route=route)
+            REQUEST_DB_SECONDS.observe(stats.seconds, route=route)
+
+            if (
+                status_code >= 500
+                or duration * 1000 >= settings.slow_request_ms
+                or random.random() < settings.request_log_sample_rate
+            ):
+                logger.info(json.dumps({
+                    "method": method,
+                    "route": route,
+                    "status": status_code,
+                    "duration_ms": round(duration * 1000, 2),
+                    "db_queries": stats.count,
+                    "db_ms": round(stats.seconds * 1000, 2),
+                }))
+
+            for shape, count in stats.repeated(settings.db_n_plus_one_threshold):
+                logger.warning(json.dumps({
+                    "event": "n_plus_one_suspect",
+                    "method": method,
+                    "route": route,
+                    "count": count,
+                    "statement": shape,
+                }))
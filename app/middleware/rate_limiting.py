@@ -1,15 +1,95 @@
 # app/middleware/rate_limiting.py
-from fastapi import Request, HTTPException, status
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-import redis
+import logging
+import math
+import time
+from typing import Optional
+from fastapi import Request, Response, HTTPException, status
+from jose import JWTError, jwt
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+from app.config import settings
+from app.utils.metrics import Counter
 
-# Redis connection for rate limiting (optional)
-# redis_client = redis.Redis(host='localhost', port=6379, db=0)
+logger = logging.getLogger(__name__)
 
-limiter = Limiter(key_func=get_remote_address)
+RATE_LIMITED = Counter("rate_limited_total", "Requests rejected by a rate limit", ["scope"])
 
-# Rate limit decorator for different endpoints
-auth_rate_limit = limiter.limit("5/minute")  # Auth endpoints
-api_rate_limit = limiter.limit("100/minute")  # General API endpoints
+# One counter store for every worker: "memory://" for local runs and tests,
+# "redis://host:6379" (or any limits storage URI) in production
+storage = storage_from_string(settings.rate_limit_storage_uri)
+strategy = STRATEGIES[settings.rate_limit_strategy](storage)
+
+
+def _forwarded_ip(request: Request) -> Optional[str]:
+    """Client address as seen by the outermost trusted proxy"""
+    hops = settings.rate_limit_trusted_proxies
+    if hops > 0:
+        forwarded = [ip.strip() for ip in request.headers.get("x-forwarded-for", "").split(",") if ip.strip()]
+        if forwarded:
+            # Each trusted proxy appends one address; anything further left is client-supplied
+            return forwarded[-min(hops, len(forwarded))]
+    return request.client.host if request.client else None
+
+
+def rate_limit_key(request: Request) -> str:
+    """Authenticated user id from the bearer token, else the client IP"""
+    authorization = request.headers.get("authorization", "")
+    if authorization[:7].lower() == "bearer ":
+        try:
+            payload = jwt.decode(authorization[7:], settings.secret_key, algorithms=[settings.algorithm])
+        except JWTError:
+            payload = {}
+        if payload.get("uid") is not None:
+            return f"user:{payload['uid']}"
+        if payload.get("sub"):
+            return f"username:{payload['sub']}"
+    return f"ip:{_forwarded_ip(request)}"
+
+
+class RateLimit:
+    """FastAPI dependency enforcing one limit, shared by every route it guards.
+
+    Each request costs a single counter update in the shared store. If the
+    store is unreachable the request is let through rather than failed.
+    """
+
+    def __init__(self, limit: str, scope: str):
+        self.limit = parse(limit)
+        self.scope = scope
+
+    def __call__(self, request: Request, response: Response):
+        if not settings.rate_limit_enabled:
+            return
+        key = rate_limit_key(request)
+        try:
+            allowed = strategy.hit(self.limit, self.scope, key)
+        except Exception:
+            logger.warning("Rate limit store unavailable; allowing request", exc_info=True)
+            return
+
+        response.headers["X-RateLimit-Limit"] = str(self.limit.amount)
+        if allowed:
+            return
+
+        RATE_LIMITED.inc(scope=self.scope)
+        reset_time, _ = strategy.get_window_stats(self.limit, self.scope, key)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded: {self.limit}",
+            headers={
+                "Retry-After": str(max(1, math.ceil(reset_time - time.time()))),
+                "X-RateLimit-Limit": str(self.limit.amount),
+                "X-RateLimit-Remaining": "0",
+            },
+        )
+
+
+# Credential endpoints, keyed by client IP since callers are not yet authenticated
+auth_rate_limit = RateLimit(settings.rate_limit_auth, "auth")
+# Everything else, keyed by user
+api_rate_limit = RateLimit(settings.rate_limit_default, "api")
+# Full data exports, on top of the api limit
+export_rate_limit = RateLimit(settings.rate_limit_export, "export")
+# Bulk imports, on top of the api limit
+import_rate_limit = RateLimit(settings.rate_limit_import, "import")
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime, time
 from enum import Enum
@@ -16,6 +17,10 @@ class FrequencyType(str, Enum):
 
 class Habit(SQLModel, table=True):
     __tablename__ = "habits"
+    __table_args__ = (
+        # Every habit list and ownership lookup is per user, mostly active only
+        Index("ix_habits_user_archived", "user_id", "archived"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(max_length=100)
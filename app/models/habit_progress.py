@@ -1,24 +1,30 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, UniqueConstraint, text
 from typing import Optional, TYPE_CHECKING
-from datetime import datetime, date
+from datetime import datetime, date as date_type
 
 if TYPE_CHECKING:
     from app.models.habit import Habit
 
 class HabitProgress(SQLModel, table=True):
     __tablename__ = "habit_progress"
+    __table_args__ = (
+        # One entry per habit per day; also the target of progress upserts
+        UniqueConstraint("habit_id", "date", name="unique_habit_date"),
+        # Completed days only: streak rebuilds walk these in (habit_id, date) order
+        Index(
+            "ix_habit_progress_completed", "habit_id", "date",
+            postgresql_where=text("completed = true"),
+            sqlite_where=text("completed = 1"),
+        ),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     habit_id: int = Field(foreign_key="habits.id")
-    date: date = Field(index=True)
+    date: date_type = Field(index=True)
     completed: bool = Field(default=False)
     note: Optional[str] = Field(default=None, max_length=500)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     # Relationships - use string reference
     habit: "Habit" = Relationship(back_populates="progress_entries")
-    
-    class Config:
-        # Note: SQLModel doesn't use table_args the same way as SQLAlchemy
-        # The unique constraint should be handled differently
-        pass
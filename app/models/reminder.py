@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 from typing import Optional, TYPE_CHECKING
 from datetime import time
 
@@ -7,6 +8,12 @@ if TYPE_CHECKING:
 
 class Reminder(SQLModel, table=True):
     __tablename__ = "reminders"
+    __table_args__ = (
+        # Cold load of the reminder scheduler
+        Index("ix_reminders_enabled_time", "enabled", "reminder_time"),
+        # Reminders of a habit: listing, scheduler reloads, habit deletion
+        Index("ix_reminders_habit_id", "habit_id"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     habit_id: int = Field(foreign_key="habits.id")
@@ -0,0 +1,23 @@
+# app/models/reminder_change.py
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
+from typing import Optional
+from datetime import datetime
+
+class ReminderChange(SQLModel, table=True):
+    """A habit's reminders or a user's timezone changed; read by the reminder scheduler process.
+
+    Written in the same transaction as the change, so the scheduler never
+    misses a committed one, whichever worker made it.
+    """
+    __tablename__ = "reminder_changes"
+    __table_args__ = (
+        # Polled by creation time every minute, pruned by it on full reloads
+        Index("ix_reminder_changes_created_at", "created_at"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # Either a habit whose reminders to re-read, or a user whose reminders to re-place
+    habit_id: Optional[int] = Field(default=None)
+    user_id: Optional[int] = Field(default=None)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 from typing import Optional, TYPE_CHECKING
 from datetime import date
 
@@ -6,14 +7,20 @@ if TYPE_CHECKING:
     from app.models.habit import Habit
 
 class Streak(SQLModel, table=True):
+    """A run of consecutive completed days; maintained by StreakService"""
     __tablename__ = "streaks"
+    __table_args__ = (
+        # Every streak read is per habit; runs come back in start_date order
+        Index("ix_streaks_habit_start", "habit_id", "start_date"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     habit_id: int = Field(foreign_key="habits.id")
     start_date: date
     end_date: Optional[date] = Field(default=None)
+    length: int = Field(default=0)
     longest: bool = Field(default=False)
     current: bool = Field(default=False)
     
     # Relationships - use string reference
-    habit: "Habit" = Relationship(back_populates="streaks")
\ No newline at end of file
+    habit: "Habit" = Relationship(back_populates="streaks")
@@ -14,6 +14,8 @@ class User(SQLModel, table=True):
     username: str = Field(unique=True, index=True, max_length=50)
     email: str = Field(unique=True, index=True)
     password_hash: str
+    # IANA name; decides where the user's days start and end
+    timezone: str = Field(default="UTC", max_length=64)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = Field(default=None)
     
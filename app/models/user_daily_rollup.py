@@ -0,0 +1,14 @@
+# app/models/user_daily_rollup.py
+from sqlmodel import SQLModel, Field
+from datetime import date as date_type
+
+class UserDailyRollup(SQLModel, table=True):
+    """Per-user, per-day progress totals over non-archived habits; maintained by RollupService"""
+    __tablename__ = "user_daily_rollup"
+    
+    user_id: int = Field(foreign_key="users.id", primary_key=True)
+    date: date_type = Field(primary_key=True)
+    # Non-archived habits created on or before this date
+    active_habits: int = Field(default=0)
+    entries: int = Field(default=0)
+    completed: int = Field(default=0)
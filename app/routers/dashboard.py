@@ -1,36 +1,93 @@
 # app/routers/dashboard.py
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
 from sqlmodel import Session
-from app.database import get_session
-from app.schemas.dashboard import DashboardOverview, DashboardStatistics, MonthlyCalendar
+from app.schemas.dashboard import DashboardHome, DashboardOverview, DashboardStatistics, MonthlyCalendar, YearlyCalendar
+from app.services.dashboard_cache import DashboardCache
 from app.services.dashboard_service import DashboardService
-from app.utils.dependencies import get_current_user
+from app.utils.dependencies import get_current_user, get_local_today, get_read_session
 from app.models.user import User
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+# Calendar years: anything outside is a typo, and past 9998 the month/year bounds overflow date()
+MIN_YEAR = 1900
+MAX_YEAR = 2999
+
+@router.get("/home", response_model=DashboardHome)
+def get_home(
+    request: Request,
+    response: Response,
+    year: Optional[int] = Query(None, ge=MIN_YEAR, le=MAX_YEAR),
+    month: Optional[int] = Query(None, ge=1, le=12),
+    current_user: User = Depends(get_current_user),
+    today: date = Depends(get_local_today),
+    db: Session = Depends(get_read_session)
+):
+    """Home screen in one call: overview, statistics, habits and a month calendar"""
+    year = year or today.year
+    month = month or today.month
+    return DashboardCache.serve(
+        request, response, current_user.id, today, f"home:{year}:{month}",
+        lambda: DashboardService.get_home(db, current_user, today, year, month)
+    )
+
 @router.get("/overview", response_model=DashboardOverview)
-async def get_overview(
+def get_overview(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_session)
+    today: date = Depends(get_local_today),
+    db: Session = Depends(get_read_session)
 ):
     """Get dashboard overview"""
-    return DashboardService.get_overview(db, current_user)
+    return DashboardCache.serve(
+        request, response, current_user.id, today, "overview",
+        lambda: DashboardService.get_overview(db, current_user, today)
+    )
 
 @router.get("/statistics", response_model=DashboardStatistics)
-async def get_statistics(
+def get_statistics(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_session)
+    today: date = Depends(get_local_today),
+    db: Session = Depends(get_read_session)
 ):
     """Get detailed statistics"""
-    return DashboardService.get_statistics(db, current_user)
+    return DashboardCache.serve(
+        request, response, current_user.id, today, "statistics",
+        lambda: DashboardService.get_statistics(db, current_user, today)
+    )
 
 @router.get("/calendar/{year}/{month}", response_model=MonthlyCalendar)
-async def get_monthly_calendar(
-    year: int,
-    month: int,
+def get_monthly_calendar(
+    request: Request,
+    response: Response,
+    year: int = Path(ge=MIN_YEAR, le=MAX_YEAR),
+    month: int = Path(ge=1, le=12),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_session)
+    today: date = Depends(get_local_today),
+    db: Session = Depends(get_read_session)
 ):
     """Get monthly calendar view"""
-    return DashboardService.get_monthly_calendar(db, current_user, month, year)
+    return DashboardCache.serve(
+        request, response, current_user.id, today, f"calendar:{year}:{month}",
+        lambda: DashboardService.get_monthly_calendar(db, current_user, month, year)
+    )
+
+@router.get("/calendar/{year}", response_model=YearlyCalendar)
+def get_yearly_calendar(
+    request: Request,
+    response: Response,
+    year: int = Path(ge=MIN_YEAR, le=MAX_YEAR),
+    current_user: User = Depends(get_current_user),
+    today: date = Depends(get_local_today),
+    db: Session = Depends(get_read_session)
+):
+    """Get a year of daily completion counts (heatmap)"""
+    return DashboardCache.serve(
+        request, response, current_user.id, today, f"calendar:{year}",
+        lambda: DashboardService.get_yearly_calendar(db, current_user, year)
+    )
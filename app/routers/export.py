@@ -0,0 +1,34 @@
+# app/routers/export.py
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from app.middleware.rate_limiting import export_rate_limit
+from app.services.export_service import ExportService, RECORD_TYPES
+from app.utils.dependencies import get_current_user
+from app.models.user import User
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+@router.get("/", dependencies=[Depends(export_rate_limit)])
+def export_data(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    include: str = Query(",".join(RECORD_TYPES), description="Comma-separated record types"),
+    gzip: bool = Query(False),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the user's habits, progress, reminders and streaks as NDJSON or CSV"""
+    types = [record_type.strip() for record_type in include.split(",") if record_type.strip()]
+    unknown = set(types) - set(RECORD_TYPES)
+    if unknown or not types:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"include must list some of: {', '.join(RECORD_TYPES)}"
+        )
+    
+    filename = f"habit-export-{current_user.id}.{export_format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        ExportService.stream_for_user(current_user.id, export_format, types, gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,98 @@
+# app/routers/habits.py
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, Query, Response
+from sqlmodel import Session
+from app.database import get_session
+from app.models.habit import FrequencyType
+from app.schemas.habit import HabitCreate, HabitUpdate, HabitResponse, HabitCompact
+from app.services.habit_service import HabitService
+from app.utils.dependencies import get_current_user, get_read_session
+from app.models.user import User
+
+router = APIRouter(prefix="/habits", tags=["Habits"])
+
+@router.post("/", response_model=HabitResponse)
+def create_habit(
+    habit_data: HabitCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """Create new habit"""
+    return HabitService.create_habit(db, habit_data, current_user)
+
+@router.get("/", response_model=List[Union[HabitResponse, HabitCompact]])
+def get_habits(
+    response: Response,
+    habit_status: Literal["active", "archived", "all"] = Query("active", alias="status"),
+    frequency: Optional[FrequencyType] = None,
+    prefix: Optional[str] = Query(None, max_length=100, description="Case-insensitive name prefix"),
+    sort: Literal["id", "name", "created_at"] = "id",
+    order: Literal["asc", "desc"] = "asc",
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    fields: Literal["full", "compact"] = "full",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_session)
+):
+    """Get user habits, active only by default; paged when a limit is given"""
+    compact = fields == "compact"
+    rows, next_cursor = HabitService.get_user_habits(
+        db, current_user,
+        habit_status=habit_status, frequency=frequency, prefix=prefix,
+        sort=sort, descending=order == "desc", after=cursor, limit=limit, compact=compact
+    )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if compact:
+        return [
+            HabitCompact(id=row.id, name=row.name, frequency=row.frequency, archived=row.archived)
+            for row in rows
+        ]
+    return rows
+
+@router.get("/{habit_id}", response_model=HabitResponse)
+def get_habit(
+    habit_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_session)
+):
+    """Get habit by ID"""
+    return HabitService.get_habit_by_id(db, habit_id, current_user)
+
+@router.put("/{habit_id}", response_model=HabitResponse)
+def update_habit(
+    habit_id: int,
+    habit_data: HabitUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """Update habit"""
+    return HabitService.update_habit(db, habit_id, habit_data, current_user)
+
+@router.delete("/{habit_id}")
+def delete_habit(
+    habit_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """Delete habit"""
+    HabitService.delete_habit(db, habit_id, current_user)
+    return {"message": "Habit deleted successfully"}
+
+@router.patch("/{habit_id}/archive", response_model=HabitResponse)
+def archive_habit(
+    habit_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """Archive habit (soft delete)"""
+    return HabitService.archive_habit(db, habit_id, current_user)
+
+@router.patch("/{habit_id}/unarchive", response_model=HabitResponse)
+def unarchive_habit(
+    habit_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """Restore an archived habit"""
+    return HabitService.unarchive_habit(db, habit_id, current_user)
@@ -1,18 +1,51 @@
 # app/routers/progress.py
-from typing import List
+import io
+from typing import List, Literal, Optional, Union
 from datetime import date
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
 from sqlmodel import Session
 from app.database import get_session
-from app.schemas.habit_progress import HabitProgressCreate, HabitProgressUpdate, HabitProgressResponse
+from app.middleware.rate_limiting import import_rate_limit
+from app.schemas.habit_progress import (
+    HabitProgressCreate, HabitProgressUpdate, HabitProgressResponse, HabitProgressCompact,
+    HabitProgressBatch, HabitProgressBatchResult, ProgressImportResult
+)
+from app.services.import_service import ImportService
 from app.services.progress_service import ProgressService
-from app.utils.dependencies import get_current_user
+from app.utils.dependencies import get_current_user, get_read_session
 from app.models.user import User
 
 router = APIRouter(prefix="/habits", tags=["Progress"])
 
+@router.post("/progress/batch", response_model=List[HabitProgressBatchResult])
+def create_progress_batch(
+    batch: HabitProgressBatch,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """Mark many habits done/undone across dates in one request"""
+    return ProgressService.bulk_upsert_progress(db, batch.entries, current_user)
+
+@router.post("/progress/import", response_model=ProgressImportResult, dependencies=[Depends(import_rate_limit)])
+def import_progress(
+    file: UploadFile = File(...),
+    import_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """Load progress history from an NDJSON or CSV upload, e.g. from another tracker"""
+    # utf-8-sig drops the byte order mark spreadsheet apps put in front of CSV files
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return ImportService.import_progress(db, current_user, lines, import_format)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload must be UTF-8 text"
+        )
+
 @router.post("/{habit_id}/progress", response_model=HabitProgressResponse)
-async def create_progress(
+def create_progress(
     habit_id: int,
     progress_data: HabitProgressCreate,
     current_user: User = Depends(get_current_user),
@@ -21,21 +54,36 @@ async def create_progress(
     """Mark habit as done/undone for specific date"""
     return ProgressService.create_or_update_progress(db, habit_id, progress_data, current_user)
 
-@router.get("/{habit_id}/progress", response_model=List[HabitProgressResponse])
-async def get_habit_progress(
+@router.get("/{habit_id}/progress", response_model=List[Union[HabitProgressResponse, HabitProgressCompact]])
+def get_habit_progress(
     habit_id: int,
+    response: Response,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    cursor: Optional[date] = Query(None, description="X-Next-Cursor value from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    fields: Literal["full", "compact"] = "full",
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_session)
+    db: Session = Depends(get_read_session)
 ):
-    """Get all progress logs for habit"""
-    return ProgressService.get_habit_progress(db, habit_id, current_user)
+    """Get progress logs for habit, oldest first; paged when a limit is given"""
+    compact = fields == "compact"
+    rows, next_cursor = ProgressService.get_habit_progress(
+        db, habit_id, current_user,
+        start=from_date, end=to_date, after=cursor, limit=limit, compact=compact
+    )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor.isoformat()
+    if compact:
+        return [HabitProgressCompact(date=day, completed=completed) for day, completed in rows]
+    return rows
 
 @router.get("/{habit_id}/progress/{target_date}", response_model=HabitProgressResponse)
-async def get_progress_by_date(
+def get_progress_by_date(
     habit_id: int,
     target_date: date,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_session)
+    db: Session = Depends(get_read_session)
 ):
     """Get progress for specific date"""
     return ProgressService.get_progress_by_date(db, habit_id, target_date, current_user)
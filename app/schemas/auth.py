@@ -1,12 +1,21 @@
 # app/schemas/auth.py
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional
+from app.utils.timezones import is_valid_timezone
 
 class UserRegister(BaseModel):
     username: str
     email: EmailStr
     password: str
+    timezone: str = "UTC"
+    
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, value):
+        if not is_valid_timezone(value):
+            raise ValueError("Unknown timezone")
+        return value
 
 class UserLogin(BaseModel):
     username: str
@@ -18,3 +27,4 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: Optional[str] = None
+    user_id: Optional[int] = None
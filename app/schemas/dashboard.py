@@ -2,6 +2,7 @@
 from pydantic import BaseModel
 from typing import List, Dict
 from datetime import date
+from app.schemas.habit import HabitResponse
 
 class DashboardOverview(BaseModel):
     total_habits: int
@@ -31,3 +32,13 @@ class MonthlyCalendar(BaseModel):
     month: int
     year: int
     entries: List[CalendarEntry]
+
+class YearlyCalendar(BaseModel):
+    year: int
+    entries: List[CalendarEntry]
+
+class DashboardHome(BaseModel):
+    overview: DashboardOverview
+    statistics: DashboardStatistics
+    habits: List[HabitResponse]
+    calendar: MonthlyCalendar
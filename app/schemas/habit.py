@@ -26,4 +26,10 @@ class HabitResponse(HabitBase):
     archived: bool
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class HabitCompact(BaseModel):
+    id: int
+    name: str
+    frequency: FrequencyType
+    archived: bool
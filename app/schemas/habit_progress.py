@@ -1,6 +1,6 @@
 # app/schemas/habit_progress.py
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
 from datetime import datetime, date
 
 class HabitProgressBase(BaseModel):
@@ -21,4 +21,65 @@ class HabitProgressResponse(HabitProgressBase):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class HabitProgressCompact(BaseModel):
+    date: date
+    completed: bool
+
+class HabitProgressBatchItem(HabitProgressBase):
+    habit_id: int
+
+class HabitProgressBatch(BaseModel):
+    """Results come back one per entry, in order, so each (habit_id, date) may appear once"""
+    entries: List[HabitProgressBatchItem] = Field(min_length=1, max_length=1000)
+
+    @model_validator(mode="after")
+    def no_duplicate_days(self):
+        seen = set()
+        for entry in self.entries:
+            key = (entry.habit_id, entry.date)
+            if key in seen:
+                raise ValueError(f"Duplicate entry for habit {entry.habit_id} on {entry.date.isoformat()}")
+            seen.add(key)
+        return self
+
+class HabitProgressBatchResult(BaseModel):
+    habit_id: int
+    date: date
+    status: Literal["created", "updated", "not_found"]
+    id: Optional[int] = None
+
+class ProgressImportRow(BaseModel):
+    """One imported check-in; the habit is given by id or by name (created if missing)"""
+    habit_id: Optional[int] = None
+    habit_name: Optional[str] = Field(default=None, max_length=100)
+    date: date
+    completed: bool
+    note: Optional[str] = Field(default=None, max_length=500)
+
+    @model_validator(mode="before")
+    @classmethod
+    def blank_cells_are_missing(cls, data):
+        # CSV has no null: an empty cell means the field was not given
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if value != ""}
+        return data
+
+    @model_validator(mode="after")
+    def habit_is_given(self):
+        if self.habit_id is None and not self.habit_name:
+            raise ValueError("habit_id or habit_name is required")
+        return self
+
+class ProgressImportError(BaseModel):
+    line: int
+    message: str
+
+class ProgressImportResult(BaseModel):
+    rows_read: int = 0
+    rows_rejected: int = 0
+    rows_skipped: int = 0
+    progress_written: int = 0
+    habits_created: int = 0
+    errors: List[ProgressImportError] = []
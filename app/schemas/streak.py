@@ -8,6 +8,7 @@ class StreakResponse(BaseModel):
     habit_id: int
     start_date: date
     end_date: Optional[date] = None
+    length: int
     longest: bool
     current: bool
     
@@ -1,7 +1,8 @@
 # app/schemas/user.py
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional
 from datetime import datetime
+from app.utils.timezones import is_valid_timezone
 
 class UserBase(BaseModel):
     username: str
@@ -13,9 +14,18 @@ class UserCreate(UserBase):
 class UserUpdate(BaseModel):
     username: Optional[str] = None
     email: Optional[EmailStr] = None
+    timezone: Optional[str] = None
+    
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, value):
+        if value is not None and not is_valid_timezone(value):
+            raise ValueError("Unknown timezone")
+        return value
 
 class UserResponse(UserBase):
     id: int
+    timezone: str
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -1,25 +1,61 @@
-from sqlmodel import SQLModel, create_engine, Session
-from sqlalchemy import UniqueConstraint
+# app/services/auth_service.py
+from datetime import timedelta
+from sqlmodel import Session, select
+from fastapi import HTTPException, status
 from app.config import settings
+from app.models.user import User
+from app.schemas.auth import UserRegister, UserLogin
+from app.utils.security import get_password_hash, verify_and_update_password, create_access_token
 
-# Database engine
-engine = create_engine(
-    settings.database_url,
-    echo=settings.environment == "development"
-)
+class AuthService:
+    @staticmethod
+    def create_user(db: Session, user_data: UserRegister) -> User:
+        """Register new user"""
+        statement = select(User).where(
+            (User.username == user_data.username) | (User.email == user_data.email)
+        )
+        if db.exec(statement).first():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username or email already registered"
+            )
 
-def create_db_and_tables():
-    """Create database tables with constraints"""
-    from app.models.habit_progress import HabitProgress
-    
-    # Add unique constraint to HabitProgress table
-    HabitProgress.__table_args__ = (
-        UniqueConstraint('habit_id', 'date', name='unique_habit_date'),
-    )
-    
-    SQLModel.metadata.create_all(engine)
+        user = User(
+            username=user_data.username,
+            email=user_data.email,
+            password_hash=get_password_hash(user_data.password),
+            timezone=user_data.timezone
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
 
-def get_session():
-    """Database session dependency"""
-    with Session(engine) as session:
-        yield session
+    @staticmethod
+    def authenticate_user(db: Session, login_data: UserLogin) -> str:
+        """Verify credentials and return an access token"""
+        credentials_exception = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+        statement = select(User).where(User.username == login_data.username)
+        user = db.exec(statement).first()
+        if not user:
+            raise credentials_exception
+
+        valid, new_hash = verify_and_update_password(login_data.password, user.password_hash)
+        if not valid:
+            raise credentials_exception
+
+        # Transparently move the stored hash to the configured bcrypt cost
+        if new_hash:
+            user.password_hash = new_hash
+            db.add(user)
+            db.commit()
+
+        return create_access_token(
+            data={"sub": user.username, "uid": user.id},
+            expires_delta=timedelta(minutes=settings.access_token_expire_minutes)
+        )
@@ -0,0 +1,72 @@
+# app/services/bitmap_service.py
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, Tuple
+from sqlmodel import Session, select
+from app.config import settings
+from app.models.habit_progress import HabitProgress
+from app.utils.bitmap import CompletionBitmap
+from app.utils.cache import NamedCache, create_cache
+
+# habit id -> [origin, completed, logged] of its CompletionBitmap (ints as hex, to
+# stay JSON and unbounded), dropped whenever the habit's progress changes
+bitmap_cache = NamedCache(
+    "bitmap",
+    create_cache(settings.cache_url, settings.bitmap_cache_max_entries, settings.bitmap_cache_ttl_seconds)
+)
+
+class BitmapService:
+    """Completion bitmaps, cached between requests where invalidation reaches every worker.
+
+    Writes drop a habit's entry, but an in-process backend only drops it in the
+    writing worker; the others would keep serving the old history until the TTL.
+    So with an in-process backend bitmaps are read from the database every time,
+    unless ``bitmap_cache_single_process`` says there is only one worker.
+    """
+
+    @staticmethod
+    def cache_enabled() -> bool:
+        return bitmap_cache.backend.shared or settings.bitmap_cache_single_process
+
+    @staticmethod
+    def get_bitmaps(db: Session, habits: Iterable[Tuple[int, datetime]]) -> Dict[int, CompletionBitmap]:
+        """Completion bitmaps for (habit_id, created_at) pairs; misses load in one date-only query"""
+        if not BitmapService.cache_enabled():
+            return BitmapService.load_bitmaps(db, {habit_id: created_at.date() for habit_id, created_at in habits})
+        bitmaps = {}
+        missing = {}
+        for habit_id, created_at in habits:
+            cached = bitmap_cache.get(f"bitmap:{habit_id}")
+            if cached is None:
+                missing[habit_id] = created_at.date()
+            else:
+                origin, completed, logged = cached
+                bitmaps[habit_id] = CompletionBitmap(date.fromisoformat(origin), int(completed, 16), int(logged, 16))
+        
+        if missing:
+            for habit_id, bitmap in BitmapService.load_bitmaps(db, missing).items():
+                bitmap_cache.set(
+                    f"bitmap:{habit_id}",
+                    [bitmap.origin.isoformat(), format(bitmap.completed, "x"), format(bitmap.logged, "x")]
+                )
+                bitmaps[habit_id] = bitmap
+        return bitmaps
+    
+    @staticmethod
+    def load_bitmaps(db: Session, origins: Dict[int, date]) -> Dict[int, CompletionBitmap]:
+        """Bitmaps straight from habit_progress for habit id -> origin, in one date-only query"""
+        entries = defaultdict(list)
+        statement = select(
+            HabitProgress.habit_id, HabitProgress.date, HabitProgress.completed
+        ).where(HabitProgress.habit_id.in_(list(origins)))
+        for habit_id, day, completed in db.exec(statement).all():
+            entries[habit_id].append((day, completed))
+        return {
+            habit_id: CompletionBitmap.from_entries(origin, entries.get(habit_id, ()))
+            for habit_id, origin in origins.items()
+        }
+    
+    @staticmethod
+    def invalidate(*habit_ids: int):
+        """Drop cached bitmaps after progress writes"""
+        bitmap_cache.delete(*(f"bitmap:{habit_id}" for habit_id in habit_ids))
@@ -0,0 +1,69 @@
+# app/services/dashboard_cache.py
+import hashlib
+import uuid
+from datetime import date
+from typing import Callable
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from app.config import settings
+from app.utils.cache import NamedCache, create_cache
+
+# Per-user dashboard responses, keyed by a version token that writes replace
+dashboard_cache = NamedCache(
+    "dashboard",
+    create_cache(settings.cache_url, settings.dashboard_cache_max_entries, settings.dashboard_cache_ttl_seconds)
+)
+
+class DashboardCache:
+    """Read-through cache for dashboard views with ETag revalidation.
+
+    Every cached view embeds the user's current version token in its key and
+    ETag. Writes replace the token instead of deleting entries, so stale views
+    simply become unreachable and age out through LRU/TTL eviction. Tokens are
+    random rather than counters so an evicted token can never be reissued.
+
+    The token must be seen by every worker, or one that missed a write keeps
+    serving (and 304-ing) the old view. With an in-process backend the cache
+    is therefore bypassed, and no ETag sent, unless
+    ``dashboard_cache_single_process`` says there is only one worker.
+    """
+
+    @staticmethod
+    def enabled() -> bool:
+        return dashboard_cache.backend.shared or settings.dashboard_cache_single_process
+
+    @staticmethod
+    def _version(user_id: int) -> str:
+        version_key = f"dashboard_version:{user_id}"
+        version = dashboard_cache.backend.get(version_key)
+        if version is None:
+            version = uuid.uuid4().hex
+            dashboard_cache.backend.set(version_key, version, ttl=0)
+        return version
+
+    @staticmethod
+    def invalidate(user_id: int):
+        """Mark every cached dashboard view of a user as stale"""
+        dashboard_cache.backend.set(f"dashboard_version:{user_id}", uuid.uuid4().hex, ttl=0)
+
+    @staticmethod
+    def serve(request: Request, response: Response, user_id: int, today: date, view: str, compute: Callable):
+        """Return the cached view, a bare 304 if the client's copy is current, or compute it"""
+        if not DashboardCache.enabled():
+            return compute()
+        # Views depend on the user's local date (streaks, "completed today")
+        key = f"dashboard:{user_id}:{DashboardCache._version(user_id)}:{view}:{today.isoformat()}"
+        etag = '"' + hashlib.sha1(key.encode()).hexdigest() + '"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        result = dashboard_cache.get(key)
+        if result is None:
+            result = compute()
+            # Cached as plain JSON data; the route's response_model validates either form
+            dashboard_cache.set(key, jsonable_encoder(result))
+        response.headers.update(headers)
+        return result
@@ -1,46 +1,31 @@
 # app/services/dashboard_service.py
-from typing import List
-from datetime import date, timedelta, datetime
-from sqlmodel import Session, select, func
+from typing import Dict, List, Tuple
+from datetime import date, timedelta
+from sqlmodel import Session, select, func, case
 from app.models.habit import Habit
 from app.models.habit_progress import HabitProgress
 from app.models.user import User
-from app.schemas.dashboard import DashboardOverview, DashboardStatistics, HabitStatistics, MonthlyCalendar, CalendarEntry
+from app.schemas.dashboard import (
+    DashboardHome, DashboardOverview, DashboardStatistics, HabitStatistics, MonthlyCalendar, YearlyCalendar, CalendarEntry
+)
+from app.services.bitmap_service import BitmapService
+from app.services.statistics_service import StatisticsService
 from app.services.streak_service import StreakService
+from app.utils.bitmap import CompletionBitmap
 
 class DashboardService:
     @staticmethod
-    def get_overview(db: Session, user: User) -> DashboardOverview:
-        """Get dashboard overview"""
+    def _overview(
+        habits: List[Tuple[int, str, CompletionBitmap]], streaks: Dict[int, Tuple[int, int]], today: date
+    ) -> DashboardOverview:
         # Total active habits
-        total_habits_stmt = select(func.count(Habit.id)).where(
-            (Habit.user_id == user.id) & (Habit.archived == False)
-        )
-        total_habits = db.exec(total_habits_stmt).first() or 0
+        total_habits = len(habits)
         
         # Completed today
-        today = date.today()
-        completed_today_stmt = select(func.count(HabitProgress.id)).join(
-            Habit, HabitProgress.habit_id == Habit.id
-        ).where(
-            (Habit.user_id == user.id) &
-            (HabitProgress.date == today) &
-            (HabitProgress.completed == True) &
-            (Habit.archived == False)
-        )
-        completed_today = db.exec(completed_today_stmt).first() or 0
+        completed_today = sum(1 for _, _, bitmap in habits if bitmap.is_completed(today))
         
         # Active streaks (habits with current streak > 0)
-        habits_stmt = select(Habit).where(
-            (Habit.user_id == user.id) & (Habit.archived == False)
-        )
-        habits = db.exec(habits_stmt).all()
-        
-        active_streaks = 0
-        for habit in habits:
-            current_streak = StreakService.calculate_current_streak(db, habit.id, user)
-            if current_streak > 0:
-                active_streaks += 1
+        active_streaks = sum(1 for habit_id, _, _ in habits if streaks[habit_id][0] > 0)
         
         # Completion percentage
         completion_percentage = (completed_today / total_habits * 100) if total_habits > 0 else 0
@@ -53,89 +38,25 @@ class DashboardService:
         )
     
     @staticmethod
-    def get_statistics(db: Session, user: User) -> DashboardStatistics:
-        """Get detailed statistics"""
-        # Get all active habits
-        habits_stmt = select(Habit).where(
-            (Habit.user_id == user.id) & (Habit.archived == False)
-        )
-        habits = db.exec(habits_stmt).all()
-        
-        # Calculate weekly and monthly completion rates
-        today = date.today()
-        week_ago = today - timedelta(days=7)
-        month_ago = today - timedelta(days=30)
+    def _statistics(
+        db: Session, user: User, habits: List[Tuple[int, str, CompletionBitmap]],
+        streaks: Dict[int, Tuple[int, int]], today: date
+    ) -> DashboardStatistics:
+        # Weekly and monthly completion rates
+        weekly_rate, monthly_rate = StatisticsService.get_completion_rates(db, user, today)
         
-        # Weekly completion rate
-        weekly_total_stmt = select(func.count(HabitProgress.id)).join(
-            Habit, HabitProgress.habit_id == Habit.id
-        ).where(
-            (Habit.user_id == user.id) &
-            (HabitProgress.date >= week_ago) &
-            (Habit.archived == False)
-        )
-        weekly_total = db.exec(weekly_total_stmt).first() or 0
-        
-        weekly_completed_stmt = select(func.count(HabitProgress.id)).join(
-            Habit, HabitProgress.habit_id == Habit.id
-        ).where(
-            (Habit.user_id == user.id) &
-            (HabitProgress.date >= week_ago) &
-            (HabitProgress.completed == True) &
-            (Habit.archived == False)
-        )
-        weekly_completed = db.exec(weekly_completed_stmt).first() or 0
-        
-        weekly_rate = (weekly_completed / weekly_total * 100) if weekly_total > 0 else 0
-        
-        # Monthly completion rate
-        monthly_total_stmt = select(func.count(HabitProgress.id)).join(
-            Habit, HabitProgress.habit_id == Habit.id
-        ).where(
-            (Habit.user_id == user.id) &
-            (HabitProgress.date >= month_ago) &
-            (Habit.archived == False)
-        )
-        monthly_total = db.exec(monthly_total_stmt).first() or 0
-        
-        monthly_completed_stmt = select(func.count(HabitProgress.id)).join(
-            Habit, HabitProgress.habit_id == Habit.id
-        ).where(
-            (Habit.user_id == user.id) &
-            (HabitProgress.date >= month_ago) &
-            (HabitProgress.completed == True) &
-            (Habit.archived == False)
-        )
-        monthly_completed = db.exec(monthly_completed_stmt).first() or 0
-        
-        monthly_rate = (monthly_completed / monthly_total * 100) if monthly_total > 0 else 0
-        
-        # Habit statistics
         habits_stats = []
-        for habit in habits:
-            # Total completions
-            total_completions_stmt = select(func.count(HabitProgress.id)).where(
-                (HabitProgress.habit_id == habit.id) &
-                (HabitProgress.completed == True)
-            )
-            total_completions = db.exec(total_completions_stmt).first() or 0
-            
-            # Total progress entries
-            total_entries_stmt = select(func.count(HabitProgress.id)).where(
-                HabitProgress.habit_id == habit.id
-            )
-            total_entries = db.exec(total_entries_stmt).first() or 0
+        for habit_id, habit_name, bitmap in habits:
+            total_completions = bitmap.total_completed()
+            total_entries = bitmap.total_logged()
+            current_streak, longest_streak = streaks[habit_id]
             
             # Success rate
             success_rate = (total_completions / total_entries * 100) if total_entries > 0 else 0
             
-            # Streaks
-            current_streak = StreakService.calculate_current_streak(db, habit.id, user)
-            longest_streak = StreakService.calculate_longest_streak(db, habit.id, user)
-            
             habits_stats.append(HabitStatistics(
-                habit_id=habit.id,
-                habit_name=habit.name,
+                habit_id=habit_id,
+                habit_name=habit_name,
                 success_rate=round(success_rate, 1),
                 current_streak=current_streak,
                 longest_streak=longest_streak,
@@ -149,56 +70,117 @@ class DashboardService:
         )
     
     @staticmethod
-    def get_monthly_calendar(db: Session, user: User, month: int, year: int) -> MonthlyCalendar:
-        """Get monthly calendar view"""
-        # Get first and last day of month
-        first_day = date(year, month, 1)
-        if month == 12:
-            last_day = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            last_day = date(year, month + 1, 1) - timedelta(days=1)
+    def get_overview(db: Session, user: User, today: date) -> DashboardOverview:
+        """Get dashboard overview; ``today`` is the user's local date"""
+        habits = StatisticsService.get_active_habit_bitmaps(db, user)
+        streaks = StreakService.get_streak_lengths(db, [habit_id for habit_id, _, _ in habits], today)
+        return DashboardService._overview(habits, streaks, today)
+    
+    @staticmethod
+    def get_statistics(db: Session, user: User, today: date) -> DashboardStatistics:
+        """Get detailed statistics; ``today`` is the user's local date"""
+        habits = StatisticsService.get_active_habit_bitmaps(db, user)
+        streaks = StreakService.get_streak_lengths(db, [habit_id for habit_id, _, _ in habits], today)
+        return DashboardService._statistics(db, user, habits, streaks, today)
+    
+    @staticmethod
+    def get_home(db: Session, user: User, today: date, year: int, month: int) -> DashboardHome:
+        """Overview, statistics, habit list and a month calendar from one snapshot.
+        
+        One habits query and one (usually cached) bitmap load feed every section;
+        streak lengths come from the streaks table and completion rates from the
+        daily rollup.
+        """
+        statement = select(Habit).where(
+            (Habit.user_id == user.id) & (Habit.archived == False)
+        ).order_by(Habit.id)
+        habit_rows = db.exec(statement).all()
+        bitmaps = BitmapService.get_bitmaps(db, ((habit.id, habit.created_at) for habit in habit_rows))
+        habits = [(habit.id, habit.name, bitmaps[habit.id]) for habit in habit_rows]
+        streaks = StreakService.get_streak_lengths(db, [habit.id for habit in habit_rows], today)
+        
+        first_day, last_day = DashboardService._month_bounds(year, month)
+        calendar_entries = []
+        for day_index in range((last_day - first_day).days + 1):
+            current_date = first_day + timedelta(days=day_index)
+            completed = sum(1 for _, _, bitmap in habits if bitmap.is_completed(current_date))
+            logged = sum(1 for _, _, bitmap in habits if bitmap.is_logged(current_date))
+            calendar_entries.append(CalendarEntry(
+                date=current_date,
+                completed_habits=completed,
+                total_habits=max(logged, len(habits))
+            ))
         
-        # Get all progress for the month
-        progress_stmt = select(HabitProgress).join(
+        return DashboardHome(
+            overview=DashboardService._overview(habits, streaks, today),
+            statistics=DashboardService._statistics(db, user, habits, streaks, today),
+            habits=habit_rows,
+            calendar=MonthlyCalendar(month=month, year=year, entries=calendar_entries)
+        )
+    
+    @staticmethod
+    def _calendar_entries(db: Session, user: User, first_day: date, last_day: date) -> List[CalendarEntry]:
+        """Per-day completed/total counts from one grouped query, gaps filled with zeros"""
+        active = (Habit.user_id == user.id) & (Habit.archived == False)
+        total_habits_subq = select(func.count(Habit.id)).where(active).scalar_subquery()
+        
+        statement = select(
+            HabitProgress.date,
+            func.count(case((HabitProgress.completed == True, HabitProgress.id))),
+            func.count(HabitProgress.id),
+            total_habits_subq,
+        ).join(
             Habit, HabitProgress.habit_id == Habit.id
         ).where(
-            (Habit.user_id == user.id) &
+            active &
             (HabitProgress.date >= first_day) &
-            (HabitProgress.date <= last_day) &
-            (Habit.archived == False)
-        )
-        progress_entries = db.exec(progress_stmt).all()
+            (HabitProgress.date <= last_day)
+        ).group_by(HabitProgress.date)
+        rows = db.exec(statement).all()
         
-        # Get total active habits count
-        total_habits_stmt = select(func.count(Habit.id)).where(
-            (Habit.user_id == user.id) & (Habit.archived == False)
-        )
-        total_habits = db.exec(total_habits_stmt).first() or 0
-        
-        # Group by date
-        calendar_entries = {}
-        for progress in progress_entries:
-            if progress.date not in calendar_entries:
-                calendar_entries[progress.date] = {"completed": 0, "total": 0}
-            
-            calendar_entries[progress.date]["total"] += 1
-            if progress.completed:
-                calendar_entries[progress.date]["completed"] += 1
+        if rows:
+            total_habits = rows[0][3]
+        else:
+            # Nothing logged in the range; still need the habit count
+            total_habits = db.exec(select(func.count(Habit.id)).where(active)).one()
         
-        # Create calendar entries for all days in month
+        by_date = {day: (completed, total) for day, completed, total, _ in rows}
         entries = []
         current_date = first_day
         while current_date <= last_day:
-            day_data = calendar_entries.get(current_date, {"completed": 0, "total": 0})
+            completed, total = by_date.get(current_date, (0, 0))
             entries.append(CalendarEntry(
                 date=current_date,
-                completed_habits=day_data["completed"],
-                total_habits=max(day_data["total"], total_habits)
+                completed_habits=completed,
+                total_habits=max(total, total_habits)
             ))
             current_date += timedelta(days=1)
-        
+        return entries
+    
+    @staticmethod
+    def _month_bounds(year: int, month: int) -> Tuple[date, date]:
+        """First and last day of a month"""
+        first_day = date(year, month, 1)
+        if month == 12:
+            last_day = date(year + 1, 1, 1) - timedelta(days=1)
+        else:
+            last_day = date(year, month + 1, 1) - timedelta(days=1)
+        return first_day, last_day
+    
+    @staticmethod
+    def get_monthly_calendar(db: Session, user: User, month: int, year: int) -> MonthlyCalendar:
+        """Get monthly calendar view"""
+        first_day, last_day = DashboardService._month_bounds(year, month)
         return MonthlyCalendar(
             month=month,
             year=year,
-            entries=entries
+            entries=DashboardService._calendar_entries(db, user, first_day, last_day)
+        )
+    
+    @staticmethod
+    def get_yearly_calendar(db: Session, user: User, year: int) -> YearlyCalendar:
+        """Get a whole year of calendar entries (heatmap) in one pass"""
+        return YearlyCalendar(
+            year=year,
+            entries=DashboardService._calendar_entries(db, user, date(year, 1, 1), date(year, 12, 31))
         )
@@ -0,0 +1,127 @@
+# app/services/export_service.py
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Dict, Iterable, Iterator, Sequence, Tuple
+from sqlmodel import Session, select
+from app.config import settings
+from app.database import open_read_session
+from app.models.habit import Habit
+from app.models.habit_progress import HabitProgress
+from app.models.reminder import Reminder
+from app.models.streak import Streak
+
+RECORD_TYPES = ("habits", "progress", "reminders", "streaks")
+
+# Columns per record type; plain column selects skip ORM object construction
+_COLUMNS = {
+    "habits": (Habit.id, Habit.name, Habit.description, Habit.frequency, Habit.reminder_time, Habit.created_at, Habit.archived),
+    "progress": (HabitProgress.id, HabitProgress.habit_id, HabitProgress.date, HabitProgress.completed, HabitProgress.note, HabitProgress.created_at),
+    "reminders": (Reminder.id, Reminder.habit_id, Reminder.reminder_time, Reminder.enabled),
+    "streaks": (Streak.id, Streak.habit_id, Streak.start_date, Streak.end_date, Streak.length, Streak.current, Streak.longest),
+}
+_FIELDS = {record_type: tuple(column.key for column in columns) for record_type, columns in _COLUMNS.items()}
+
+# CSV carries every record type in one table: record_type plus the union of fields
+CSV_FIELDS = ("record_type",) + tuple(dict.fromkeys(field for fields in _FIELDS.values() for field in fields))
+
+# Bytes buffered before a chunk is handed to the response or file
+_CHUNK_SIZE = 64 * 1024
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class ExportService:
+    """Streams a user's data without holding it in memory.
+
+    Rows come from server-side cursors (``yield_per``), are serialized one at a
+    time and leave in fixed-size chunks, so memory stays flat however long the
+    history is.
+    """
+
+    @staticmethod
+    def iter_records(db: Session, user_id: int, types: Sequence[str] = RECORD_TYPES) -> Iterator[Tuple[str, Dict]]:
+        """(record_type, fields) for every requested record of a user"""
+        for record_type in RECORD_TYPES:
+            if record_type not in types:
+                continue
+            columns = _COLUMNS[record_type]
+            if record_type == "habits":
+                statement = select(*columns).where(Habit.user_id == user_id).order_by(Habit.id)
+            else:
+                model = columns[0].class_
+                statement = select(*columns).join(
+                    Habit, model.habit_id == Habit.id
+                ).where(Habit.user_id == user_id).order_by(model.habit_id, model.id)
+
+            fields = _FIELDS[record_type]
+            result = db.exec(statement.execution_options(yield_per=settings.export_yield_per))
+            for row in result:
+                yield record_type, {field: _plain(value) for field, value in zip(fields, row)}
+
+    @staticmethod
+    def _chunked(pieces: Iterable[str]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        for piece in pieces:
+            buffer.write(piece)
+            if buffer.tell() >= _CHUNK_SIZE:
+                yield buffer.getvalue().encode()
+                buffer = io.StringIO()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    @staticmethod
+    def ndjson_lines(records: Iterable[Tuple[str, Dict]]) -> Iterator[str]:
+        for record_type, fields in records:
+            yield json.dumps({"record_type": record_type, **fields}) + "\n"
+
+    @staticmethod
+    def csv_lines(records: Iterable[Tuple[str, Dict]]) -> Iterator[str]:
+        line = io.StringIO()
+        writer = csv.DictWriter(line, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for record_type, fields in records:
+            writer.writerow({"record_type": record_type, **fields})
+            yield line.getvalue()
+            line.seek(0)
+            line.truncate()
+        yield line.getvalue()
+
+    @staticmethod
+    def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Compress a byte stream on the fly into gzip format"""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    @staticmethod
+    def stream(
+        db: Session, user_id: int, export_format: str = "ndjson",
+        types: Sequence[str] = RECORD_TYPES, compress: bool = False
+    ) -> Iterator[bytes]:
+        """Export chunks in NDJSON or CSV, optionally gzipped"""
+        records = ExportService.iter_records(db, user_id, types)
+        lines = ExportService.csv_lines(records) if export_format == "csv" else ExportService.ndjson_lines(records)
+        chunks = ExportService._chunked(lines)
+        return ExportService.gzip_chunks(chunks) if compress else chunks
+
+    @staticmethod
+    def stream_for_user(
+        user_id: int, export_format: str = "ndjson",
+        types: Sequence[str] = RECORD_TYPES, compress: bool = False
+    ) -> Iterator[bytes]:
+        """Like ``stream`` but owns its session, for responses consumed after the route returns"""
+        with open_read_session(user_id) as db:
+            yield from ExportService.stream(db, user_id, export_format, types, compress)
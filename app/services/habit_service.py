@@ -1,9 +1,26 @@
-from typing import List
-from sqlmodel import Session, select
+import base64
+import json
+from datetime import datetime
+from typing import Iterable, Optional, Set, Tuple
+from sqlmodel import Session, select, delete, tuple_
 from fastapi import HTTPException, status
-from app.models.habit import Habit
+from app.models.habit import FrequencyType, Habit
+from app.models.habit_progress import HabitProgress
+from app.models.reminder import Reminder
+from app.models.streak import Streak
 from app.models.user import User
 from app.schemas.habit import HabitCreate, HabitUpdate
+from app.services.bitmap_service import BitmapService
+from app.services.dashboard_cache import DashboardCache
+from app.services.reminder_scheduler import ReminderScheduler
+from app.services.rollup_service import RollupService
+
+_FULL_COLUMNS = (
+    Habit.id, Habit.name, Habit.description, Habit.frequency, Habit.reminder_time,
+    Habit.user_id, Habit.created_at, Habit.archived,
+)
+_COMPACT_COLUMNS = (Habit.id, Habit.name, Habit.frequency, Habit.archived)
+_SORT_COLUMNS = {"id": Habit.id, "name": Habit.name, "created_at": Habit.created_at}
 
 class HabitService:
     @staticmethod
@@ -11,24 +28,92 @@ class HabitService:
         """Create new habit"""
         habit = Habit(**habit_data.model_dump(), user_id=user.id)
         db.add(habit)
+        RollupService.apply_habit_created(db, habit, user.timezone)
         db.commit()
         db.refresh(habit)
+        DashboardCache.invalidate(user.id)
         return habit
     
     @staticmethod
-    def get_user_habits(db: Session, user: User) -> List[Habit]:
-        """Get all habits for user"""
-        statement = select(Habit).where(
-            (Habit.user_id == user.id) & (Habit.archived == False)
+    def _encode_cursor(key, habit_id: int) -> str:
+        if isinstance(key, datetime):
+            key = key.isoformat()
+        return base64.urlsafe_b64encode(json.dumps([key, habit_id]).encode()).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str, sort: str) -> Tuple:
+        try:
+            key, habit_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if sort == "created_at":
+                key = datetime.fromisoformat(key)
+            return key, int(habit_id)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    @staticmethod
+    def get_user_habits(
+        db: Session,
+        user: User,
+        habit_status: str = "active",
+        frequency: Optional[FrequencyType] = None,
+        prefix: Optional[str] = None,
+        sort: str = "id",
+        descending: bool = False,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+        compact: bool = False
+    ) -> Tuple[list, Optional[str]]:
+        """Get a page of the user's habits, filtered and sorted.
+        
+        Keyset pagination on (sort key, id): pass the returned cursor as
+        ``after`` for the next page. Only the needed columns are selected;
+        compact rows hold id, name, frequency and archived.
+        """
+        columns = _COMPACT_COLUMNS if compact else _FULL_COLUMNS
+        # Served by the (user_id, archived) index
+        criteria = Habit.user_id == user.id
+        if habit_status != "all":
+            criteria = criteria & (Habit.archived == (habit_status == "archived"))
+        if frequency is not None:
+            criteria = criteria & (Habit.frequency == frequency)
+        if prefix:
+            criteria = criteria & Habit.name.istartswith(prefix, autoescape=True)
+        
+        sort_column = _SORT_COLUMNS[sort]
+        if after is not None:
+            key, habit_id = HabitService._decode_cursor(after, sort)
+            position = tuple_(sort_column, Habit.id) if sort != "id" else Habit.id
+            boundary = tuple_(key, habit_id) if sort != "id" else habit_id
+            criteria = criteria & (position < boundary if descending else position > boundary)
+        
+        if sort != "id":
+            # Included even in compact rows so the cursor can be built
+            columns = tuple(dict.fromkeys(columns + (sort_column,)))
+        order = [sort_column, Habit.id] if sort != "id" else [Habit.id]
+        statement = select(*columns).where(criteria).order_by(
+            *(column.desc() if descending else column for column in order)
         )
-        return db.exec(statement).all()
+        if limit is None:
+            return db.exec(statement).all(), None
+        
+        rows = db.exec(statement.limit(limit + 1)).all()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, HabitService._encode_cursor(getattr(last, sort), last.id)
     
     @staticmethod
-    def get_habit_by_id(db: Session, habit_id: int, user: User) -> Habit:
-        """Get habit by ID with ownership check"""
+    def get_habit_by_id(db: Session, habit_id: int, user: User, lock: bool = False) -> Habit:
+        """Get habit by ID with ownership check; ``lock`` holds the row until commit"""
         statement = select(Habit).where(
             (Habit.id == habit_id) & (Habit.user_id == user.id)
         )
+        if lock:
+            statement = statement.with_for_update()
         habit = db.exec(statement).first()
         
         if not habit:
@@ -38,6 +123,41 @@ class HabitService:
             )
         return habit
     
+    @staticmethod
+    def ensure_habit_owned(db: Session, habit_id: int, user: User, lock: bool = False):
+        """Ownership check without fetching the habit row.
+        
+        Always asks the database: a cached answer outlives habits deleted
+        through another worker. Reads put the ownership join in their own query
+        instead and only call this to tell "not found" from "no rows". Writers
+        pass ``lock`` so changes to one habit's progress and streaks are
+        serialized until commit.
+        """
+        statement = select(Habit.id).where(
+            (Habit.id == habit_id) & (Habit.user_id == user.id)
+        )
+        if lock:
+            statement = statement.with_for_update()
+        if db.exec(statement).first() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Habit not found"
+            )
+    
+    @staticmethod
+    def get_owned_habit_ids(db: Session, user: User, habit_ids: Iterable[int], lock: bool = False) -> Set[int]:
+        """Those of the given habit ids the user owns; ``lock`` locks them in id order"""
+        habit_ids = sorted(set(habit_ids))
+        if not habit_ids:
+            return set()
+        statement = select(Habit.id).where(
+            (Habit.user_id == user.id) & Habit.id.in_(habit_ids)
+        )
+        if lock:
+            # A fixed order keeps concurrent batches from deadlocking
+            statement = statement.order_by(Habit.id).with_for_update()
+        return set(db.exec(statement).all())
+    
     @staticmethod
     def update_habit(db: Session, habit_id: int, habit_data: HabitUpdate, user: User) -> Habit:
         """Update habit"""
@@ -48,23 +168,53 @@ class HabitService:
             setattr(habit, key, value)
         
         db.add(habit)
+        if "name" in update_data:
+            # Due reminders carry the habit name
+            ReminderScheduler.record_change(db, habit_id=habit.id)
         db.commit()
         db.refresh(habit)
+        DashboardCache.invalidate(user.id)
         return habit
     
     @staticmethod
     def delete_habit(db: Session, habit_id: int, user: User):
         """Delete habit"""
-        habit = HabitService.get_habit_by_id(db, habit_id, user)
+        habit = HabitService.get_habit_by_id(db, habit_id, user, lock=True)
+        if not habit.archived:
+            RollupService.apply_habit_activation(db, habit, user.timezone, active=False)
+        # Child rows go first: the relationships do not cascade
+        for model in (HabitProgress, Streak, Reminder):
+            db.exec(delete(model).where(model.habit_id == habit.id))
         db.delete(habit)
+        ReminderScheduler.record_change(db, habit_id=habit.id)
         db.commit()
+        BitmapService.invalidate(habit.id)
+        DashboardCache.invalidate(user.id)
     
     @staticmethod
     def archive_habit(db: Session, habit_id: int, user: User) -> Habit:
         """Archive habit (soft delete)"""
         habit = HabitService.get_habit_by_id(db, habit_id, user)
-        habit.archived = True
-        db.add(habit)
-        db.commit()
-        db.refresh(habit)
+        if not habit.archived:
+            habit.archived = True
+            db.add(habit)
+            RollupService.apply_habit_activation(db, habit, user.timezone, active=False)
+            ReminderScheduler.record_change(db, habit_id=habit.id)
+            db.commit()
+            db.refresh(habit)
+            DashboardCache.invalidate(user.id)
+        return habit
+    
+    @staticmethod
+    def unarchive_habit(db: Session, habit_id: int, user: User) -> Habit:
+        """Restore an archived habit"""
+        habit = HabitService.get_habit_by_id(db, habit_id, user)
+        if habit.archived:
+            habit.archived = False
+            db.add(habit)
+            RollupService.apply_habit_activation(db, habit, user.timezone, active=True)
+            ReminderScheduler.record_change(db, habit_id=habit.id)
+            db.commit()
+            db.refresh(habit)
+            DashboardCache.invalidate(user.id)
         return habit
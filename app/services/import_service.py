@@ -0,0 +1,253 @@
+# app/services/import_service.py
+import csv
+import heapq
+import io
+import json
+from datetime import datetime, time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Boolean, Column, Date, DateTime, Integer, MetaData, String, Table, distinct, literal
+from sqlmodel import Session, select, func
+from app.config import settings
+from app.models.habit import Habit
+from app.models.habit_progress import HabitProgress
+from app.models.user import User
+from app.schemas.habit_progress import ProgressImportError, ProgressImportResult, ProgressImportRow
+from app.services.bitmap_service import BitmapService
+from app.services.dashboard_cache import DashboardCache
+from app.services.rollup_service import RollupService
+from app.services.streak_service import StreakService
+from app.utils.sql import dialect_insert
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+# Validates a whole chunk in one call
+_ROWS = TypeAdapter(List[ProgressImportRow])
+
+# Per-connection scratch table: uploads are copied in, then merged into
+# habit_progress with one statement. Postgres drops it at commit.
+import_staging = Table(
+    "import_staging", MetaData(),
+    Column("seq", Integer, nullable=False),
+    Column("habit_id", Integer, nullable=False),
+    Column("date", Date, nullable=False),
+    Column("completed", Boolean, nullable=False),
+    Column("note", String(500)),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+_STAGING_COLUMNS = ("seq", "habit_id", "date", "completed", "note")
+
+# A parsed record, or the reason the line could not be parsed
+Record = Union[Dict, str]
+
+
+class ImportFailures:
+    """Rejected lines of an upload: all are counted, only the ``limit`` earliest are kept"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.count = 0
+        # Max-heap on line number (stored negated), so the latest kept line is dropped first
+        self._kept: List[Tuple[int, str]] = []
+
+    def add(self, line_no: int, message: str):
+        self.count += 1
+        if len(self._kept) < self.limit:
+            heapq.heappush(self._kept, (-line_no, message))
+        elif self._kept and -self._kept[0][0] > line_no:
+            heapq.heapreplace(self._kept, (-line_no, message))
+
+    def errors(self) -> List[ProgressImportError]:
+        return [
+            ProgressImportError(line=-negated, message=message)
+            for negated, message in sorted(self._kept, reverse=True)
+        ]
+
+
+class ImportService:
+    """Bulk-loads progress history exported from other trackers.
+
+    Uploads are read line by line and validated a chunk at a time, so memory
+    stays flat. Valid rows are COPYed (Postgres) or batch-inserted into a
+    staging table and merged into habit_progress by a single upsert; streaks
+    and rollups are rebuilt once for what was touched, not per row.
+    """
+
+    @staticmethod
+    def read_records(lines: Iterable[str], import_format: str = "ndjson") -> Iterator[Tuple[int, Record]]:
+        """(line number, record) for every data line of an NDJSON or CSV upload"""
+        if import_format == "csv":
+            reader = csv.DictReader(lines)
+            for record in reader:
+                yield reader.line_num, record
+            return
+        for line_no, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield line_no, f"Invalid JSON: {exc}"
+                continue
+            yield line_no, record if isinstance(record, dict) else "Expected a JSON object"
+
+    @staticmethod
+    def validate_chunk(
+        chunk: List[Tuple[int, Record]], failures: ImportFailures
+    ) -> List[Tuple[int, ProgressImportRow]]:
+        """Valid rows of a chunk with their line numbers; the rest go to ``failures``"""
+        parsed = [(line_no, record) for line_no, record in chunk if isinstance(record, dict)]
+        for line_no, record in chunk:
+            if isinstance(record, str):
+                failures.add(line_no, record)
+        try:
+            rows = _ROWS.validate_python([record for _, record in parsed])
+        except ValidationError as exc:
+            # Slow path only for chunks with bad rows: drop them and validate the rest again
+            bad = {}
+            for error in exc.errors(include_url=False):
+                index, *field = error["loc"]
+                where = ".".join(str(part) for part in field)
+                bad.setdefault(index, f"{where}: {error['msg']}" if where else error["msg"])
+            for index, message in bad.items():
+                failures.add(parsed[index][0], message)
+            parsed = [item for index, item in enumerate(parsed) if index not in bad]
+            rows = _ROWS.validate_python([record for _, record in parsed])
+        return [(line_no, row) for (line_no, _), row in zip(parsed, rows)]
+
+    @staticmethod
+    def _stage(db: Session, rows: List[Dict]):
+        if not rows:
+            return
+        if db.get_bind().dialect.name == "postgresql":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                # An unquoted empty field is NULL in COPY's csv format
+                writer.writerow([row["seq"], row["habit_id"], row["date"].isoformat(), row["completed"], row["note"]])
+            buffer.seek(0)
+            cursor = db.connection().connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY import_staging ({', '.join(_STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            finally:
+                cursor.close()
+        else:
+            db.execute(import_staging.insert(), rows)
+
+    @staticmethod
+    def _merge(db: Session) -> int:
+        """Upsert the staged rows into habit_progress; the last row for a (habit, date) wins"""
+        latest = select(func.max(import_staging.c.seq)).group_by(import_staging.c.habit_id, import_staging.c.date)
+        source = select(
+            import_staging.c.habit_id,
+            import_staging.c.date,
+            import_staging.c.completed,
+            import_staging.c.note,
+            literal(datetime.utcnow(), DateTime),
+        ).where(import_staging.c.seq.in_(latest))
+        insert_stmt = dialect_insert(db, HabitProgress).from_select(
+            ["habit_id", "date", "completed", "note", "created_at"], source
+        )
+        upsert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=["habit_id", "date"],
+            set_={
+                "completed": insert_stmt.excluded.completed,
+                # A row without a note keeps the stored one
+                "note": func.coalesce(insert_stmt.excluded.note, HabitProgress.note),
+            }
+        )
+        return db.execute(upsert_stmt).rowcount
+
+    @staticmethod
+    def import_progress(
+        db: Session, user: User, lines: Iterable[str], import_format: str = "ndjson"
+    ) -> ProgressImportResult:
+        """Load an upload into the user's progress history in one transaction.
+
+        Rows name an owned habit by ``habit_id`` or by ``habit_name``; unknown
+        names create the habit. Records of another ``record_type`` (as found in
+        a full export) are skipped.
+        """
+        result = ProgressImportResult()
+        failures = ImportFailures(settings.import_max_errors)
+        owned_ids = set()
+        habit_names = {}
+        # Locked: the streak rebuild below must not interleave with live writes
+        habits_stmt = select(Habit.id, Habit.name).where(Habit.user_id == user.id).order_by(Habit.id).with_for_update()
+        for habit_id, name in db.exec(habits_stmt).all():
+            owned_ids.add(habit_id)
+            habit_names.setdefault(name, habit_id)
+        created: Dict[int, Habit] = {}
+
+        connection = db.connection()
+        # SQLite keeps temp tables for the life of the connection
+        import_staging.drop(connection, checkfirst=True)
+        import_staging.create(connection)
+
+        records = ImportService.read_records(lines, import_format)
+        while True:
+            chunk = list(islice(records, settings.import_chunk_rows))
+            if not chunk:
+                break
+            result.rows_read += len(chunk)
+            wanted = [
+                (line_no, record) for line_no, record in chunk
+                if not isinstance(record, dict) or record.get("record_type") in (None, "", "progress")
+            ]
+            result.rows_skipped += len(chunk) - len(wanted)
+
+            staged = []
+            for line_no, row in ImportService.validate_chunk(wanted, failures):
+                habit_id = row.habit_id
+                if habit_id is None:
+                    habit_id = habit_names.get(row.habit_name)
+                    if habit_id is None:
+                        habit = Habit(name=row.habit_name, user_id=user.id)
+                        db.add(habit)
+                        db.flush()
+                        habit_id = habit_names[row.habit_name] = habit.id
+                        created[habit_id] = habit
+                        owned_ids.add(habit_id)
+                if habit_id not in owned_ids:
+                    failures.add(line_no, "habit_id: Habit not found")
+                    continue
+                staged.append({
+                    "seq": line_no, "habit_id": habit_id, "date": row.date,
+                    "completed": row.completed, "note": row.note,
+                })
+            ImportService._stage(db, staged)
+
+        result.progress_written = ImportService._merge(db)
+        touched = sorted(db.exec(select(distinct(import_staging.c.habit_id))).all())
+
+        if created:
+            # Backdate new habits to their first imported day so rollups count them as active
+            first_days = db.exec(
+                select(import_staging.c.habit_id, func.min(import_staging.c.date))
+                .where(import_staging.c.habit_id.in_(list(created)))
+                .group_by(import_staging.c.habit_id)
+            ).all()
+            for habit_id, first_day in first_days:
+                habit = created[habit_id]
+                habit.created_at = min(habit.created_at, datetime.combine(first_day, time()))
+                db.add(habit)
+
+        if touched:
+            StreakService.rebuild_streaks(db, touched)
+        if touched or created:
+            RollupService.rebuild_rollups(db, [user.id])
+        import_staging.drop(connection)
+        db.commit()
+
+        BitmapService.invalidate(*touched)
+        DashboardCache.invalidate(user.id)
+
+        result.rows_rejected = failures.count
+        result.habits_created = len(created)
+        result.errors = failures.errors()
+        return result
@@ -1,11 +1,19 @@
-from typing import List
-from datetime import date
-from sqlmodel import Session, select
+from typing import List, Optional, Tuple
+from datetime import date, datetime
+from sqlmodel import Session, select, func, tuple_
 from fastapi import HTTPException, status
+from app.models.habit import Habit
 from app.models.habit_progress import HabitProgress
 from app.models.user import User
-from app.schemas.habit_progress import HabitProgressCreate, HabitProgressUpdate
+from app.schemas.habit_progress import (
+    HabitProgressCreate, HabitProgressUpdate, HabitProgressBatchItem, HabitProgressBatchResult
+)
+from app.services.bitmap_service import BitmapService
+from app.services.dashboard_cache import DashboardCache
 from app.services.habit_service import HabitService
+from app.services.rollup_service import RollupService
+from app.services.streak_service import StreakService
+from app.utils.sql import dialect_insert
 
 class ProgressService:
     @staticmethod
@@ -16,8 +24,8 @@ class ProgressService:
         user: User
     ) -> HabitProgress:
         """Create or update progress entry"""
-        # Verify habit ownership
-        HabitService.get_habit_by_id(db, habit_id, user)
+        # Verify habit ownership; the row lock serializes streak updates for the habit
+        HabitService.ensure_habit_owned(db, habit_id, user, lock=True)
         
         # Check if progress already exists
         statement = select(HabitProgress).where(
@@ -28,28 +36,156 @@ class ProgressService:
         
         if existing_progress:
             # Update existing
+            was_completed = existing_progress.completed
             update_data = progress_data.model_dump(exclude_unset=True)
             for key, value in update_data.items():
                 setattr(existing_progress, key, value)
-            db.add(existing_progress)
-            db.commit()
-            db.refresh(existing_progress)
-            return existing_progress
+            progress = existing_progress
         else:
             # Create new
+            was_completed = False
             progress = HabitProgress(**progress_data.model_dump(), habit_id=habit_id)
-            db.add(progress)
-            db.commit()
-            db.refresh(progress)
-            return progress
+        
+        db.add(progress)
+        StreakService.apply_progress_change(
+            db, habit_id, progress.date, was_completed, progress.completed
+        )
+        RollupService.apply_progress_deltas(db, user.id, {
+            (habit_id, progress.date): (
+                0 if existing_progress else 1,
+                int(progress.completed) - int(was_completed)
+            )
+        })
+        db.commit()
+        BitmapService.invalidate(habit_id)
+        DashboardCache.invalidate(user.id)
+        db.refresh(progress)
+        return progress
     
     @staticmethod
-    def get_habit_progress(db: Session, habit_id: int, user: User) -> List[HabitProgress]:
-        """Get all progress entries for a habit"""
-        HabitService.get_habit_by_id(db, habit_id, user)
+    def bulk_upsert_progress(
+        db: Session,
+        entries: List[HabitProgressBatchItem],
+        user: User
+    ) -> List[HabitProgressBatchResult]:
+        """Create or update many progress entries, across habits, in one transaction.
         
-        statement = select(HabitProgress).where(HabitProgress.habit_id == habit_id)
-        return db.exec(statement).all()
+        Returns one result per entry, in the order given.
+        """
+        owned_ids = HabitService.get_owned_habit_ids(
+            db, user, (entry.habit_id for entry in entries), lock=True
+        )
+        
+        # HabitProgressBatch rejects repeated (habit_id, date) pairs, so keys are unique
+        requested = {(entry.habit_id, entry.date): entry for entry in entries}
+        accepted = {key: entry for key, entry in requested.items() if entry.habit_id in owned_ids}
+        
+        ids = {}
+        previous = {}
+        if accepted:
+            # Prior state decides created vs updated and which streaks changed
+            existing_stmt = select(
+                HabitProgress.habit_id, HabitProgress.date, HabitProgress.completed
+            ).where(
+                # The plain IN lets every planner seek on (habit_id, date); SQLite
+                # cannot use an index for a row-value IN list alone
+                HabitProgress.habit_id.in_({habit_id for habit_id, _ in accepted}) &
+                tuple_(HabitProgress.habit_id, HabitProgress.date).in_(list(accepted))
+            )
+            previous = {(habit_id, day): completed for habit_id, day, completed in db.exec(existing_stmt).all()}
+            
+            now = datetime.utcnow()
+            insert_stmt = dialect_insert(db, HabitProgress).values([
+                {
+                    "habit_id": entry.habit_id,
+                    "date": entry.date,
+                    "completed": entry.completed,
+                    "note": entry.note,
+                    "created_at": now,
+                }
+                for entry in accepted.values()
+            ])
+            upsert_stmt = insert_stmt.on_conflict_do_update(
+                index_elements=["habit_id", "date"],
+                set_={
+                    "completed": insert_stmt.excluded.completed,
+                    # An omitted note keeps the stored one
+                    "note": func.coalesce(insert_stmt.excluded.note, HabitProgress.note),
+                }
+            ).returning(HabitProgress.id, HabitProgress.habit_id, HabitProgress.date)
+            ids = {(habit_id, day): row_id for row_id, habit_id, day in db.execute(upsert_stmt).all()}
+            
+            changed_habits = {
+                habit_id for (habit_id, day), entry in accepted.items()
+                if previous.get((habit_id, day), False) != entry.completed
+            }
+            if changed_habits:
+                StreakService.rebuild_streaks(db, sorted(changed_habits))
+            
+            RollupService.apply_progress_deltas(db, user.id, {
+                key: (
+                    0 if key in previous else 1,
+                    int(entry.completed) - int(previous.get(key, False))
+                )
+                for key, entry in accepted.items()
+            })
+        
+        db.commit()
+        BitmapService.invalidate(*{habit_id for habit_id, _ in accepted})
+        DashboardCache.invalidate(user.id)
+        
+        results = []
+        for key, entry in requested.items():
+            if key not in accepted:
+                outcome = "not_found"
+            elif key in previous:
+                outcome = "updated"
+            else:
+                outcome = "created"
+            results.append(HabitProgressBatchResult(
+                habit_id=entry.habit_id, date=entry.date, status=outcome, id=ids.get(key)
+            ))
+        return results
+    
+    @staticmethod
+    def get_habit_progress(
+        db: Session,
+        habit_id: int,
+        user: User,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        after: Optional[date] = None,
+        limit: Optional[int] = None,
+        compact: bool = False
+    ) -> Tuple[list, Optional[date]]:
+        """Get a page of progress entries for a habit, ordered by date.
+        
+        Keyset pagination: pass the returned cursor as ``after`` to fetch the next
+        page. Compact pages hold (date, completed) rows instead of full entries.
+        """
+        columns = (HabitProgress.date, HabitProgress.completed) if compact else (HabitProgress,)
+        # Ownership is part of the query; it is only checked separately when nothing matched
+        criteria = (HabitProgress.habit_id == habit_id) & (Habit.user_id == user.id)
+        if start is not None:
+            criteria = criteria & (HabitProgress.date >= start)
+        if end is not None:
+            criteria = criteria & (HabitProgress.date <= end)
+        if after is not None:
+            criteria = criteria & (HabitProgress.date > after)
+        
+        # Served by the (habit_id, date) unique index
+        statement = select(*columns).join(
+            Habit, HabitProgress.habit_id == Habit.id
+        ).where(criteria).order_by(HabitProgress.date)
+        if limit is not None:
+            statement = statement.limit(limit + 1)
+        rows = db.exec(statement).all()
+        if not rows:
+            HabitService.ensure_habit_owned(db, habit_id, user)
+        if limit is None or len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, rows[-1].date
     
     @staticmethod
     def get_progress_by_date(
@@ -59,15 +195,17 @@ class ProgressService:
         user: User
     ) -> HabitProgress:
         """Get progress for specific date"""
-        HabitService.get_habit_by_id(db, habit_id, user)
-        
-        statement = select(HabitProgress).where(
+        statement = select(HabitProgress).join(
+            Habit, HabitProgress.habit_id == Habit.id
+        ).where(
             (HabitProgress.habit_id == habit_id) & 
-            (HabitProgress.date == target_date)
+            (HabitProgress.date == target_date) &
+            (Habit.user_id == user.id)
         )
         progress = db.exec(statement).first()
         
         if not progress:
+            HabitService.ensure_habit_owned(db, habit_id, user)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Progress entry not found"
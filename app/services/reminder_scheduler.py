@@ -0,0 +1,298 @@
+# app/services/reminder_scheduler.py
+import asyncio
+import calendar
+from abc import ABC, abstractmethod
+import json
+import logging
+import queue
+import threading
+from dataclasses import dataclass, asdict
+from datetime import datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set
+import anyio
+from sqlmodel import Session, select, delete
+from app.config import settings
+from app.database import engine
+from app.models.habit import Habit
+from app.models.reminder import Reminder
+from app.models.reminder_change import ReminderChange
+from app.models.user import User
+from app.utils.metrics import Counter, Gauge
+from app.utils.timezones import local_today, utc_minute_of_day
+
+logger = logging.getLogger(__name__)
+
+REMINDERS_DISPATCHED = Counter("reminders_dispatched_total", "Reminders emitted to the sink")
+REMINDERS_SCHEDULED = Gauge("reminders_scheduled", "Enabled reminders held in the timing wheel")
+
+MINUTES_PER_DAY = 24 * 60
+
+# Changes are re-read this far back, so ones committed late or stamped by a
+# worker with a slightly slow clock are still applied (re-applying is harmless)
+CHANGE_OVERLAP = timedelta(minutes=1)
+
+
+@dataclass(frozen=True)
+class ScheduledReminder:
+    reminder_id: int
+    habit_id: int
+    user_id: int
+    habit_name: str
+    reminder_time: time
+    timezone: str
+
+
+@dataclass(frozen=True)
+class DueReminder:
+    reminder_id: int
+    habit_id: int
+    user_id: int
+    habit_name: str
+    due_at: datetime
+
+
+class ReminderSink(ABC):
+    """Destination for due reminders; replace with a push/email integration"""
+
+    @abstractmethod
+    def emit(self, reminders: List[DueReminder]):
+        ...
+
+
+class LogSink(ReminderSink):
+    def emit(self, reminders: List[DueReminder]):
+        for reminder in reminders:
+            payload = asdict(reminder)
+            payload["due_at"] = reminder.due_at.isoformat()
+            logger.info(json.dumps({"event": "reminder_due", **payload}))
+
+
+class QueueSink(ReminderSink):
+    """Hands due reminders to a local consumer; drops them when the queue is full"""
+
+    def __init__(self, maxsize: int = 10000):
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def emit(self, reminders: List[DueReminder]):
+        for reminder in reminders:
+            try:
+                self.queue.put_nowait(reminder)
+            except queue.Full:
+                logger.warning("Reminder queue full, dropping reminder %s", reminder.reminder_id)
+
+
+class TimingWheel:
+    """Enabled reminders bucketed by UTC minute of day.
+
+    Looking up the reminders due in a minute costs one dict access, and
+    adding, moving or removing a reminder is O(1), whatever the table size.
+    Reminder times are wall-clock times in the user's timezone, placed with
+    today's UTC offset; periodic reloads pick up DST changes.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[int, Dict[int, ScheduledReminder]] = {}
+        self._slots: Dict[int, int] = {}
+        self._by_habit: Dict[int, Set[int]] = {}
+
+    def __len__(self):
+        return len(self._slots)
+
+    @staticmethod
+    def minute_of(entry: ScheduledReminder) -> int:
+        return utc_minute_of_day(entry.reminder_time, entry.timezone, local_today(entry.timezone))
+
+    def upsert(self, entry: ScheduledReminder):
+        self.remove(entry.reminder_id)
+        minute = self.minute_of(entry)
+        self._buckets.setdefault(minute, {})[entry.reminder_id] = entry
+        self._slots[entry.reminder_id] = minute
+        self._by_habit.setdefault(entry.habit_id, set()).add(entry.reminder_id)
+
+    def remove(self, reminder_id: int):
+        minute = self._slots.pop(reminder_id, None)
+        if minute is None:
+            return
+        entry = self._buckets[minute].pop(reminder_id)
+        if not self._buckets[minute]:
+            del self._buckets[minute]
+        habit_reminders = self._by_habit[entry.habit_id]
+        habit_reminders.discard(reminder_id)
+        if not habit_reminders:
+            del self._by_habit[entry.habit_id]
+
+    def remove_habit(self, habit_id: int):
+        for reminder_id in list(self._by_habit.get(habit_id, ())):
+            self.remove(reminder_id)
+
+    def due(self, minute: int) -> List[ScheduledReminder]:
+        return list(self._buckets.get(minute % MINUTES_PER_DAY, {}).values())
+
+
+class ReminderScheduler:
+    """Background worker that fires enabled reminders at their time of day.
+
+    Every process that runs it fires every reminder, so it is off by default:
+    set ``reminder_scheduler_enabled`` in exactly one process. The wheel is
+    loaded from the (enabled, reminder_time) index, then kept current from
+    reminder_changes: whichever worker changes a reminder, habit or timezone
+    records it with ``record_change`` in the same transaction, and the
+    scheduler re-reads just those habits and users once a minute. A full
+    reload every ``reminder_resync_minutes`` also prunes the change rows.
+    """
+
+    def __init__(self, sink: Optional[ReminderSink] = None):
+        self.sink = sink or (QueueSink() if settings.reminder_sink == "queue" else LogSink())
+        self.wheel = TimingWheel()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._last_minute: Optional[int] = None
+        # Changes created at or after this (naive UTC) time are still to be applied
+        self._changes_since: Optional[datetime] = None
+
+    @staticmethod
+    def record_change(db: Session, habit_id: Optional[int] = None, user_id: Optional[int] = None):
+        """Tell the scheduler process to re-read a habit's or a user's reminders.
+
+        Added to the caller's session, so it commits (or rolls back) with the change.
+        """
+        db.add(ReminderChange(habit_id=habit_id, user_id=user_id))
+
+    @staticmethod
+    def _query(habit_ids: Optional[Iterable[int]] = None, user_id: Optional[int] = None):
+        statement = select(
+            Reminder.id, Reminder.habit_id, Habit.user_id, Habit.name, Reminder.reminder_time, User.timezone
+        ).join(
+            Habit, Reminder.habit_id == Habit.id
+        ).join(
+            User, Habit.user_id == User.id
+        ).where(
+            (Reminder.enabled == True) & (Habit.archived == False)
+        )
+        if habit_ids is not None:
+            statement = statement.where(Reminder.habit_id.in_(list(habit_ids)))
+        if user_id is not None:
+            statement = statement.where(Habit.user_id == user_id)
+        return statement
+
+    @staticmethod
+    def _changes_query(since: datetime):
+        return select(ReminderChange.habit_id, ReminderChange.user_id).where(ReminderChange.created_at >= since)
+
+    def load(self, db: Session):
+        """Replace the wheel with every enabled reminder of an active habit"""
+        started = datetime.utcnow()
+        wheel = TimingWheel()
+        for row in db.exec(self._query()).all():
+            wheel.upsert(ScheduledReminder(*row))
+        with self._lock:
+            self.wheel = wheel
+            self._changes_since = started - CHANGE_OVERLAP
+        REMINDERS_SCHEDULED.set(len(wheel))
+        # Older changes are part of what was just loaded
+        db.exec(delete(ReminderChange).where(ReminderChange.created_at < self._changes_since))
+        db.commit()
+
+    def apply_changes(self, db: Session) -> int:
+        """Re-read the habits and users recorded in reminder_changes since the last poll"""
+        if self._changes_since is None:
+            return 0
+        started = datetime.utcnow()
+        rows = db.exec(self._changes_query(self._changes_since)).all()
+        habit_ids = {habit_id for habit_id, _ in rows if habit_id is not None}
+        if habit_ids:
+            self.load_habits(db, habit_ids)
+        for user_id in {user_id for _, user_id in rows if user_id is not None}:
+            self.load_user(db, user_id)
+        self._changes_since = started - CHANGE_OVERLAP
+        return len(rows)
+
+    def load_habits(self, db: Session, habit_ids: Iterable[int]):
+        """Re-read the reminders of some habits; drops those of deleted or archived habits"""
+        habit_ids = list(habit_ids)
+        rows = db.exec(self._query(habit_ids)).all()
+        with self._lock:
+            for habit_id in habit_ids:
+                self.wheel.remove_habit(habit_id)
+            for row in rows:
+                self.wheel.upsert(ScheduledReminder(*row))
+            REMINDERS_SCHEDULED.set(len(self.wheel))
+
+    def load_user(self, db: Session, user_id: int):
+        """Re-place a user's reminders, e.g. after a timezone change"""
+        rows = db.exec(self._query(user_id=user_id)).all()
+        with self._lock:
+            for row in rows:
+                self.wheel.upsert(ScheduledReminder(*row))
+            REMINDERS_SCHEDULED.set(len(self.wheel))
+
+    def dispatch_until(self, now: datetime) -> int:
+        """Emit reminders for every minute since the last call, up to ``now``.
+
+        ``now`` is an aware datetime, or a naive one in UTC; the host timezone
+        never matters.
+        """
+        current = calendar.timegm(now.utctimetuple()) // 60
+        if self._last_minute is None or current - self._last_minute > settings.reminder_max_catch_up_minutes:
+            self._last_minute = current - 1
+        dispatched = 0
+        for minute in range(self._last_minute + 1, current + 1):
+            due_at = datetime.fromtimestamp(minute * 60, timezone.utc)
+            with self._lock:
+                entries = self.wheel.due(minute)
+            if entries:
+                self.sink.emit([
+                    DueReminder(entry.reminder_id, entry.habit_id, entry.user_id, entry.habit_name, due_at)
+                    for entry in entries
+                ])
+                dispatched += len(entries)
+        self._last_minute = current
+        REMINDERS_DISPATCHED.inc(dispatched)
+        return dispatched
+
+    def _reload(self):
+        with Session(engine) as db:
+            self.load(db)
+
+    def _poll_changes(self):
+        with Session(engine) as db:
+            self.apply_changes(db)
+
+    async def run(self):
+        """Load the wheel, then apply recorded changes and dispatch once per minute boundary.
+
+        A failed load (e.g. the database is not up yet) is logged and retried
+        on the next minute; nothing is dispatched until one succeeds.
+        """
+        last_resync = None
+        while True:
+            now = datetime.now(timezone.utc)
+            try:
+                if last_resync is None or now - last_resync >= timedelta(minutes=settings.reminder_resync_minutes):
+                    await anyio.to_thread.run_sync(self._reload)
+                    last_resync = now
+                else:
+                    await anyio.to_thread.run_sync(self._poll_changes)
+                self.dispatch_until(now)
+            except Exception:
+                logger.exception("Reminder dispatch failed" if last_resync else "Reminder wheel load failed")
+            await self._sleep_until(now.replace(second=0, microsecond=0) + timedelta(minutes=1))
+
+    async def _sleep_until(self, moment: datetime):
+        await asyncio.sleep(max(0.0, (moment - datetime.now(timezone.utc)).total_seconds()))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+reminder_scheduler = ReminderScheduler()
@@ -2,30 +2,40 @@
 from typing import List
 from sqlmodel import Session, select
 from fastapi import HTTPException, status
+from app.models.habit import Habit
 from app.models.reminder import Reminder
 from app.models.user import User
 from app.schemas.reminder import ReminderCreate, ReminderUpdate
+from app.services.dashboard_cache import DashboardCache
 from app.services.habit_service import HabitService
+from app.services.reminder_scheduler import ReminderScheduler
 
 class ReminderService:
     @staticmethod
     def create_reminder(db: Session, habit_id: int, reminder_data: ReminderCreate, user: User) -> Reminder:
         """Create reminder for habit"""
-        HabitService.get_habit_by_id(db, habit_id, user)
+        HabitService.ensure_habit_owned(db, habit_id, user)
         
         reminder = Reminder(**reminder_data.model_dump(), habit_id=habit_id)
         db.add(reminder)
+        ReminderScheduler.record_change(db, habit_id=habit_id)
         db.commit()
         db.refresh(reminder)
+        DashboardCache.invalidate(user.id)
         return reminder
     
     @staticmethod
     def get_habit_reminders(db: Session, habit_id: int, user: User) -> List[Reminder]:
         """Get all reminders for a habit"""
-        HabitService.get_habit_by_id(db, habit_id, user)
-        
-        statement = select(Reminder).where(Reminder.habit_id == habit_id)
-        return db.exec(statement).all()
+        statement = select(Reminder).join(
+            Habit, Reminder.habit_id == Habit.id
+        ).where(
+            (Reminder.habit_id == habit_id) & (Habit.user_id == user.id)
+        )
+        reminders = db.exec(statement).all()
+        if not reminders:
+            HabitService.ensure_habit_owned(db, habit_id, user)
+        return reminders
     
     @staticmethod
     def get_reminder_by_id(db: Session, reminder_id: int, user: User) -> Reminder:
@@ -54,8 +64,10 @@ class ReminderService:
             setattr(reminder, key, value)
         
         db.add(reminder)
+        ReminderScheduler.record_change(db, habit_id=reminder.habit_id)
         db.commit()
         db.refresh(reminder)
+        DashboardCache.invalidate(user.id)
         return reminder
     
     @staticmethod
@@ -63,4 +75,6 @@ class ReminderService:
         """Delete reminder"""
         reminder = ReminderService.get_reminder_by_id(db, reminder_id, user)
         db.delete(reminder)
+        ReminderScheduler.record_change(db, habit_id=reminder.habit_id)
         db.commit()
+        DashboardCache.invalidate(user.id)
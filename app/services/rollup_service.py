@@ -0,0 +1,187 @@
+# app/services/rollup_service.py
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import insert
+from sqlmodel import Session, select, func, case, delete, update
+from app.models.habit import Habit
+from app.models.habit_progress import HabitProgress
+from app.models.user import User
+from app.models.user_daily_rollup import UserDailyRollup
+from app.utils.sql import dialect_insert, local_date
+from app.utils.timezones import to_local_date
+
+class RollupService:
+    """Maintains user_daily_rollup so window rates are sums over a few small rows.
+
+    A row holds the user's progress entries and completions for one date,
+    counting only habits that are currently not archived, plus the number of
+    such habits created on or before that date. Creation dates are taken in
+    the user's timezone. Callers commit.
+    """
+
+    @staticmethod
+    def _active_habits(db: Session, user_id: int) -> Tuple[set, List[date]]:
+        """Ids and sorted local creation dates of the user's non-archived habits"""
+        statement = select(Habit.id, local_date(Habit.created_at, User.timezone)).join(
+            User, Habit.user_id == User.id
+        ).where(
+            (Habit.user_id == user_id) & (Habit.archived == False)
+        )
+        habits = db.exec(statement).all()
+        return {habit_id for habit_id, _ in habits}, sorted(created for _, created in habits)
+
+    @staticmethod
+    def _upsert(db: Session, user_id: int, per_date: Dict[date, List[int]], created_dates: List[date]):
+        """Add (entries, completed) deltas to each date's row, creating missing rows"""
+        rows = [
+            {
+                "user_id": user_id,
+                "date": day,
+                "active_habits": bisect_right(created_dates, day),
+                "entries": entries,
+                "completed": completed,
+            }
+            for day, (entries, completed) in per_date.items()
+            if entries or completed
+        ]
+        if not rows:
+            return
+        insert_stmt = dialect_insert(db, UserDailyRollup).values(rows)
+        db.execute(insert_stmt.on_conflict_do_update(
+            index_elements=["user_id", "date"],
+            set_={
+                "entries": UserDailyRollup.entries + insert_stmt.excluded.entries,
+                "completed": UserDailyRollup.completed + insert_stmt.excluded.completed,
+            }
+        ))
+
+    @staticmethod
+    def apply_progress_deltas(db: Session, user_id: int, deltas: Dict[Tuple[int, date], Tuple[int, int]]):
+        """Record progress writes: (habit_id, date) -> (entries delta, completed delta)"""
+        if not any(entries or completed for entries, completed in deltas.values()):
+            return
+        active_ids, created_dates = RollupService._active_habits(db, user_id)
+
+        per_date = defaultdict(lambda: [0, 0])
+        for (habit_id, day), (entries, completed) in deltas.items():
+            # Archived habits are left out of the rollup until unarchived
+            if habit_id in active_ids:
+                per_date[day][0] += entries
+                per_date[day][1] += completed
+        RollupService._upsert(db, user_id, per_date, created_dates)
+
+    @staticmethod
+    def apply_habit_activation(db: Session, habit: Habit, timezone: str, active: bool):
+        """Add (unarchive) or remove (archive/delete) a habit's contribution"""
+        sign = 1 if active else -1
+        db.flush()
+        db.exec(
+            update(UserDailyRollup).where(
+                (UserDailyRollup.user_id == habit.user_id) &
+                (UserDailyRollup.date >= to_local_date(habit.created_at, timezone))
+            ).values(active_habits=UserDailyRollup.active_habits + sign)
+        )
+
+        statement = select(HabitProgress.date, HabitProgress.completed).where(HabitProgress.habit_id == habit.id)
+        per_date = {day: [sign, sign if completed else 0] for day, completed in db.exec(statement).all()}
+        if per_date:
+            _, created_dates = RollupService._active_habits(db, habit.user_id)
+            RollupService._upsert(db, habit.user_id, per_date, created_dates)
+
+    @staticmethod
+    def apply_habit_created(db: Session, habit: Habit, timezone: str):
+        """Count a new habit as active on existing rows from its local creation date"""
+        db.exec(
+            update(UserDailyRollup).where(
+                (UserDailyRollup.user_id == habit.user_id) &
+                (UserDailyRollup.date >= to_local_date(habit.created_at, timezone))
+            ).values(active_habits=UserDailyRollup.active_habits + 1)
+        )
+
+    @staticmethod
+    def get_window_totals(db: Session, user_id: int, *starts: date) -> List[Tuple[int, int]]:
+        """(entries, completed) summed over dates >= each start, in one query"""
+        columns = []
+        for start in starts:
+            in_window = UserDailyRollup.date >= start
+            columns.append(func.coalesce(func.sum(case((in_window, UserDailyRollup.entries), else_=0)), 0))
+            columns.append(func.coalesce(func.sum(case((in_window, UserDailyRollup.completed), else_=0)), 0))
+        statement = select(*columns).where(
+            (UserDailyRollup.user_id == user_id) & (UserDailyRollup.date >= min(starts))
+        )
+        totals = db.exec(statement).one()
+        return [(totals[i], totals[i + 1]) for i in range(0, len(totals), 2)]
+
+    @staticmethod
+    def compute_rollups(db: Session, user_ids: Optional[List[int]] = None) -> Dict[Tuple[int, date], Tuple[int, int, int]]:
+        """(user_id, date) -> (active_habits, entries, completed) straight from habit_progress"""
+        active = Habit.archived == False
+        if user_ids is not None:
+            active = active & Habit.user_id.in_(user_ids)
+
+        statement = select(
+            Habit.user_id,
+            HabitProgress.date,
+            func.count(HabitProgress.id),
+            func.count(case((HabitProgress.completed == True, HabitProgress.id))),
+        ).join(
+            Habit, HabitProgress.habit_id == Habit.id
+        ).where(active).group_by(Habit.user_id, HabitProgress.date)
+
+        # Local creation dates for every user in one query, converted in SQL
+        created_stmt = select(Habit.user_id, local_date(Habit.created_at, User.timezone)).join(
+            User, Habit.user_id == User.id
+        ).where(active)
+        created = defaultdict(list)
+        for user_id, created_on in db.exec(created_stmt).all():
+            created[user_id].append(created_on)
+        for dates in created.values():
+            dates.sort()
+
+        return {
+            (user_id, day): (bisect_right(created[user_id], day), entries, completed)
+            for user_id, day, entries, completed in db.exec(statement).all()
+        }
+
+    @staticmethod
+    def rebuild_rollups(db: Session, user_ids: Optional[List[int]] = None) -> int:
+        """Backfill rollup rows from habit_progress; returns the number of rows written"""
+        delete_stmt = delete(UserDailyRollup)
+        if user_ids is not None:
+            delete_stmt = delete_stmt.where(UserDailyRollup.user_id.in_(user_ids))
+        db.exec(delete_stmt)
+
+        rows = [
+            {"user_id": user_id, "date": day, "active_habits": active_habits, "entries": entries, "completed": completed}
+            for (user_id, day), (active_habits, entries, completed) in RollupService.compute_rollups(db, user_ids).items()
+        ]
+        if rows:
+            db.execute(insert(UserDailyRollup), rows)
+        return len(rows)
+
+    @staticmethod
+    def check_rollups(
+        db: Session, user_ids: Optional[List[int]] = None
+    ) -> List[Tuple[int, date, Optional[Tuple[int, int, int]], Optional[Tuple[int, int, int]]]]:
+        """Compare stored rows with habit_progress; returns (user_id, date, stored, expected) mismatches"""
+        expected = RollupService.compute_rollups(db, user_ids)
+
+        statement = select(UserDailyRollup)
+        if user_ids is not None:
+            statement = statement.where(UserDailyRollup.user_id.in_(user_ids))
+        stored = {
+            (row.user_id, row.date): (row.active_habits, row.entries, row.completed)
+            for row in db.exec(statement).all()
+        }
+
+        mismatches = []
+        for key in sorted(set(expected) | set(stored)):
+            stored_row, expected_row = stored.get(key), expected.get(key)
+            # Rows whose counts dropped to zero are equivalent to missing rows
+            if stored_row is not None and expected_row is None and stored_row[1:] == (0, 0):
+                continue
+            if stored_row != expected_row:
+                mismatches.append((key[0], key[1], stored_row, expected_row))
+        return mismatches
@@ -0,0 +1,39 @@
+# app/services/statistics_service.py
+from typing import List, Tuple
+from datetime import date, timedelta
+from sqlmodel import Session, select
+from app.models.habit import Habit
+from app.models.user import User
+from app.services.bitmap_service import BitmapService
+from app.services.rollup_service import RollupService
+from app.utils.bitmap import CompletionBitmap
+
+
+class StatisticsService:
+    """Statistics engine over completion bitmaps and the daily rollup: a fixed
+    number of queries whatever the habit count"""
+
+    @staticmethod
+    def get_active_habit_bitmaps(db: Session, user: User) -> List[Tuple[int, str, CompletionBitmap]]:
+        """(habit_id, name, bitmap) for every active habit"""
+        statement = select(Habit.id, Habit.name, Habit.created_at).where(
+            (Habit.user_id == user.id) & (Habit.archived == False)
+        ).order_by(Habit.id)
+        habits = db.exec(statement).all()
+
+        bitmaps = BitmapService.get_bitmaps(db, ((habit_id, created_at) for habit_id, _, created_at in habits))
+        return [(habit_id, name, bitmaps[habit_id]) for habit_id, name, _ in habits]
+
+    @staticmethod
+    def get_completion_rates(db: Session, user: User, today: date) -> Tuple[float, float]:
+        """Weekly and monthly completion rates (percent) from the daily rollup"""
+        week_ago = today - timedelta(days=7)
+        month_ago = today - timedelta(days=30)
+
+        (weekly_total, weekly_completed), (monthly_total, monthly_completed) = RollupService.get_window_totals(
+            db, user.id, week_ago, month_ago
+        )
+
+        weekly_rate = (weekly_completed / weekly_total * 100) if weekly_total > 0 else 0
+        monthly_rate = (monthly_completed / monthly_total * 100) if monthly_total > 0 else 0
+        return weekly_rate, monthly_rate
@@ -1,120 +1,247 @@
 # app/services/streak_service.py
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import date, timedelta
-from sqlmodel import Session, select, desc
+from sqlalchemy import insert
+from sqlmodel import Session, select, desc, delete, func
+from app.models.habit import Habit
 from app.models.streak import Streak
 from app.models.habit_progress import HabitProgress
 from app.models.user import User
 from app.services.habit_service import HabitService
+from app.utils.sql import day_number
 
 class StreakService:
+    """Streaks are stored as runs of consecutive completed days, one Streak row per run.
+
+    The most recent run is flagged ``current`` and the longest run (latest on ties)
+    is flagged ``longest``, so streak reads never scan progress history.
+    """
+
     @staticmethod
-    def calculate_current_streak(db: Session, habit_id: int, user: User) -> int:
-        """Calculate current streak for a habit"""
-        HabitService.get_habit_by_id(db, habit_id, user)
-        
-        # Get progress entries ordered by date descending
-        statement = select(HabitProgress).where(
-            (HabitProgress.habit_id == habit_id) &
-            (HabitProgress.completed == True)
-        ).order_by(desc(HabitProgress.date))
-        
-        completed_dates = db.exec(statement).all()
-        
-        if not completed_dates:
-            return 0
-        
-        # Calculate consecutive days from today backwards
-        current_date = date.today()
-        streak_count = 0
-        
-        for progress in completed_dates:
-            if progress.date == current_date - timedelta(days=streak_count):
-                streak_count += 1
-            else:
-                break
-        
-        return streak_count
-    
+    def get_streak_state(
+        db: Session, habit_id: int, user: Optional[User] = None
+    ) -> Tuple[Optional[Streak], Optional[Streak]]:
+        """Get the (current, longest) runs for a habit, only if ``user`` owns it when given"""
+        statement = select(Streak).where(
+            (Streak.habit_id == habit_id) &
+            ((Streak.current == True) | (Streak.longest == True))
+        )
+        if user is not None:
+            statement = statement.join(Habit, Streak.habit_id == Habit.id).where(Habit.user_id == user.id)
+        current_run = longest_run = None
+        for streak in db.exec(statement).all():
+            if streak.current:
+                current_run = streak
+            if streak.longest:
+                longest_run = streak
+        return current_run, longest_run
+
+    @staticmethod
+    def calculate_current_streak(db: Session, habit_id: int, user: User, today: date) -> int:
+        """Calculate current streak for a habit; ``today`` is the user's local date"""
+        current_run, longest_run = StreakService.get_streak_state(db, habit_id, user)
+        if longest_run is None:
+            # No runs at all, or not the user's habit
+            HabitService.ensure_habit_owned(db, habit_id, user)
+        if current_run and current_run.end_date == today:
+            return current_run.length
+        return 0
+
+    @staticmethod
+    def get_streak_lengths(db: Session, habit_ids: List[int], today: date) -> Dict[int, Tuple[int, int]]:
+        """(current, longest) lengths for many habits from one query; ``today`` is the user's local date"""
+        lengths = {habit_id: (0, 0) for habit_id in habit_ids}
+        if not habit_ids:
+            return lengths
+        statement = select(Streak.habit_id, Streak.end_date, Streak.length, Streak.current, Streak.longest).where(
+            Streak.habit_id.in_(habit_ids) &
+            ((Streak.current == True) | (Streak.longest == True))
+        )
+        for habit_id, end_date, length, current, longest in db.exec(statement).all():
+            current_length, longest_length = lengths[habit_id]
+            if current and end_date == today:
+                current_length = length
+            if longest:
+                longest_length = length
+            lengths[habit_id] = (current_length, longest_length)
+        return lengths
+
     @staticmethod
     def calculate_longest_streak(db: Session, habit_id: int, user: User) -> int:
         """Calculate longest streak for a habit"""
-        HabitService.get_habit_by_id(db, habit_id, user)
-        
-        statement = select(HabitProgress).where(
-            (HabitProgress.habit_id == habit_id) &
-            (HabitProgress.completed == True)
-        ).order_by(HabitProgress.date)
-        
-        completed_dates = [p.date for p in db.exec(statement).all()]
-        
-        if not completed_dates:
-            return 0
-        
-        max_streak = 0
-        current_streak = 1
-        
-        for i in range(1, len(completed_dates)):
-            if completed_dates[i] == completed_dates[i-1] + timedelta(days=1):
-                current_streak += 1
-            else:
-                max_streak = max(max_streak, current_streak)
-                current_streak = 1
-        
-        return max(max_streak, current_streak)
-    
+        _, longest_run = StreakService.get_streak_state(db, habit_id, user)
+        if longest_run is None:
+            HabitService.ensure_habit_owned(db, habit_id, user)
+        return longest_run.length if longest_run else 0
+
     @staticmethod
     def get_habit_streaks(db: Session, habit_id: int, user: User) -> List[Streak]:
         """Get all streaks for a habit"""
-        HabitService.get_habit_by_id(db, habit_id, user)
-        
-        statement = select(Streak).where(Streak.habit_id == habit_id)
-        return db.exec(statement).all()
-    
+        statement = select(Streak).join(Habit, Streak.habit_id == Habit.id).where(
+            (Streak.habit_id == habit_id) & (Habit.user_id == user.id)
+        ).order_by(Streak.start_date)
+        streaks = db.exec(statement).all()
+        if not streaks:
+            HabitService.ensure_habit_owned(db, habit_id, user)
+        return streaks
+
     @staticmethod
-    def update_streaks(db: Session, habit_id: int, user: User):
-        """Update streak records for a habit"""
-        current_streak_length = StreakService.calculate_current_streak(db, habit_id, user)
-        longest_streak_length = StreakService.calculate_longest_streak(db, habit_id, user)
-        
-        # Update or create current streak record
-        current_streak_stmt = select(Streak).where(
-            (Streak.habit_id == habit_id) & (Streak.current == True)
+    def apply_progress_change(db: Session, habit_id: int, day: date, was_completed: bool, completed: bool):
+        """Update stored runs after a day flips; the caller holds the habit row lock and commits"""
+        if was_completed == completed:
+            return
+
+        if completed:
+            StreakService._add_day(db, habit_id, day)
+        else:
+            StreakService._remove_day(db, habit_id, day)
+
+        db.flush()
+        StreakService._refresh_flags(db, habit_id)
+
+    @staticmethod
+    def _add_day(db: Session, habit_id: int, day: date):
+        """Extend or merge the runs adjacent to a newly completed day"""
+        statement = select(Streak).where(
+            (Streak.habit_id == habit_id) &
+            ((Streak.end_date == day - timedelta(days=1)) | (Streak.start_date == day + timedelta(days=1)))
         )
-        current_streak = db.exec(current_streak_stmt).first()
-        
-        if current_streak_length > 0:
-            if not current_streak:
-                current_streak = Streak(
-                    habit_id=habit_id,
-                    start_date=date.today() - timedelta(days=current_streak_length-1),
-                    current=True
-                )
-                db.add(current_streak)
+        before = after = None
+        for streak in db.exec(statement).all():
+            if streak.end_date == day - timedelta(days=1):
+                before = streak
             else:
-                current_streak.end_date = None  # Still ongoing
+                after = streak
+
+        if before and after:
+            before.end_date = after.end_date
+            before.length += after.length + 1
+            db.add(before)
+            db.delete(after)
+        elif before:
+            before.end_date = day
+            before.length += 1
+            db.add(before)
+        elif after:
+            after.start_date = day
+            after.length += 1
+            db.add(after)
         else:
-            if current_streak:
-                current_streak.current = False
-                current_streak.end_date = date.today() - timedelta(days=1)
-        
-        # Update longest streak record
-        longest_streak_stmt = select(Streak).where(
-            (Streak.habit_id == habit_id) & (Streak.longest == True)
+            db.add(Streak(habit_id=habit_id, start_date=day, end_date=day, length=1))
+
+    @staticmethod
+    def _remove_day(db: Session, habit_id: int, day: date):
+        """Shrink or split the run containing a day that is no longer completed"""
+        statement = select(Streak).where(
+            (Streak.habit_id == habit_id) &
+            (Streak.start_date <= day) &
+            (Streak.end_date >= day)
         )
-        longest_streak = db.exec(longest_streak_stmt).first()
-        
-        if not longest_streak or longest_streak_length > (longest_streak.end_date - longest_streak.start_date).days + 1:
-            if longest_streak:
-                longest_streak.longest = False
-            
-            # Create new longest streak record
-            new_longest = Streak(
+        streak = db.exec(statement).first()
+        if not streak:
+            return
+
+        if streak.start_date == streak.end_date:
+            db.delete(streak)
+        elif streak.start_date == day:
+            streak.start_date = day + timedelta(days=1)
+            streak.length -= 1
+            db.add(streak)
+        elif streak.end_date == day:
+            streak.end_date = day - timedelta(days=1)
+            streak.length -= 1
+            db.add(streak)
+        else:
+            tail = Streak(
                 habit_id=habit_id,
-                start_date=date.today() - timedelta(days=longest_streak_length-1),
-                end_date=date.today(),
-                longest=True
+                start_date=day + timedelta(days=1),
+                end_date=streak.end_date,
+                length=(streak.end_date - day).days
             )
-            db.add(new_longest)
-        
-        db.commit()
+            streak.end_date = day - timedelta(days=1)
+            streak.length = (streak.end_date - streak.start_date).days + 1
+            db.add(streak)
+            db.add(tail)
+
+    @staticmethod
+    def _refresh_flags(db: Session, habit_id: int):
+        """Re-point the current and longest flags after runs changed"""
+        current_run, longest_run = StreakService.get_streak_state(db, habit_id)
+
+        latest = db.exec(
+            select(Streak).where(Streak.habit_id == habit_id).order_by(desc(Streak.end_date)).limit(1)
+        ).first()
+        longest = db.exec(
+            select(Streak).where(Streak.habit_id == habit_id)
+            .order_by(desc(Streak.length), desc(Streak.end_date)).limit(1)
+        ).first()
+
+        for streak, flag, target in (
+            (current_run, "current", latest),
+            (longest_run, "longest", longest),
+        ):
+            if streak is not None and streak is not target:
+                setattr(streak, flag, False)
+                db.add(streak)
+            if target is not None and not getattr(target, flag):
+                setattr(target, flag, True)
+                db.add(target)
+
+    @staticmethod
+    def rebuild_streaks(db: Session, habit_ids: Optional[List[int]] = None) -> int:
+        """Recompute stored runs from progress history; the caller commits.
+
+        The habit rows are locked first (the caller may already hold them), so
+        a rebuild never interleaves with incremental updates to the same habit.
+        Returns the number of runs written.
+        """
+        lock_stmt = select(Habit.id).order_by(Habit.id).with_for_update()
+        if habit_ids is not None:
+            lock_stmt = lock_stmt.where(Habit.id.in_(habit_ids))
+        db.exec(lock_stmt).all()
+
+        delete_stmt = delete(Streak)
+        if habit_ids is not None:
+            delete_stmt = delete_stmt.where(Streak.habit_id.in_(habit_ids))
+        db.exec(delete_stmt)
+
+        # Gaps-and-islands: day number minus row number is constant within a run
+        criteria = HabitProgress.completed == True
+        if habit_ids is not None:
+            criteria = criteria & HabitProgress.habit_id.in_(habit_ids)
+        islands = select(
+            HabitProgress.habit_id,
+            HabitProgress.date,
+            (
+                day_number(HabitProgress.date) -
+                func.row_number().over(
+                    partition_by=HabitProgress.habit_id,
+                    order_by=HabitProgress.date
+                )
+            ).label("grp")
+        ).where(criteria).subquery()
+
+        runs_stmt = select(
+            islands.c.habit_id,
+            func.min(islands.c.date),
+            func.max(islands.c.date),
+            func.count(),
+        ).group_by(islands.c.habit_id, islands.c.grp).order_by(islands.c.habit_id)
+
+        runs_by_habit = {}
+        for habit_id, start, end, length in db.exec(runs_stmt).all():
+            runs_by_habit.setdefault(habit_id, []).append({
+                "habit_id": habit_id, "start_date": start, "end_date": end,
+                "length": length, "current": False, "longest": False,
+            })
+
+        rows = []
+        for runs in runs_by_habit.values():
+            max(runs, key=lambda run: run["end_date"])["current"] = True
+            max(runs, key=lambda run: (run["length"], run["end_date"]))["longest"] = True
+            rows.extend(runs)
+
+        # Plain executemany: no ORM objects or RETURNING round trips per run
+        if rows:
+            db.execute(insert(Streak), rows)
+        return len(rows)
@@ -0,0 +1,114 @@
+# app/utils/bitmap.py
+import re
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+_RUN = re.compile("1+")
+
+
+def _bits_from_indices(indices: Iterable[int]) -> int:
+    """Build an int with the given bit positions set in one pass"""
+    indices = list(indices)
+    if not indices:
+        return 0
+    buffer = bytearray(max(indices) // 8 + 1)
+    for i in indices:
+        buffer[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class CompletionBitmap:
+    """Day-by-day history of one habit packed into two integers.
+
+    Bit ``i`` stands for ``origin + i`` days: ``completed`` has it set when that
+    day was completed, ``logged`` when any entry exists. A year of history costs
+    about 46 bytes per bitmap instead of hundreds of ORM rows.
+    """
+    __slots__ = ("origin", "completed", "logged")
+
+    def __init__(self, origin: date, completed: int = 0, logged: int = 0):
+        self.origin = origin
+        self.completed = completed
+        self.logged = logged
+
+    @classmethod
+    def from_entries(cls, origin: date, entries: Iterable[Tuple[date, bool]]) -> "CompletionBitmap":
+        """Build from (date, completed) pairs; origin moves back to the earliest entry"""
+        entries = list(entries)
+        if entries:
+            origin = min(origin, min(day for day, _ in entries))
+        completed = _bits_from_indices((day - origin).days for day, done in entries if done)
+        logged = _bits_from_indices((day - origin).days for day, _ in entries)
+        return cls(origin, completed, logged)
+
+    def _index(self, day: date) -> int:
+        return (day - self.origin).days
+
+    def _window(self, bits: int, start: date, end: Optional[date] = None) -> int:
+        """Bits for start..end inclusive (open-ended without end), shifted so the
+        later of start and origin is bit 0"""
+        first = max(self._index(start), 0)
+        if end is None:
+            return bits >> first
+        last = self._index(end)
+        if last < first:
+            return 0
+        return (bits >> first) & ((1 << (last - first + 1)) - 1)
+
+    def is_completed(self, day: date) -> bool:
+        i = self._index(day)
+        return i >= 0 and bool(self.completed >> i & 1)
+
+    def is_logged(self, day: date) -> bool:
+        i = self._index(day)
+        return i >= 0 and bool(self.logged >> i & 1)
+
+    def total_completed(self) -> int:
+        return self.completed.bit_count()
+
+    def total_logged(self) -> int:
+        return self.logged.bit_count()
+
+    def completed_between(self, start: date, end: Optional[date] = None) -> int:
+        return self._window(self.completed, start, end).bit_count()
+
+    def logged_between(self, start: date, end: Optional[date] = None) -> int:
+        return self._window(self.logged, start, end).bit_count()
+
+    def current_streak(self, today: date) -> int:
+        """Consecutive completed days ending today (0 if today is not completed)"""
+        t = self._index(today)
+        if t < 0:
+            return 0
+        mask = (1 << (t + 1)) - 1
+        gaps = ~self.completed & mask
+        if not gaps:
+            return t + 1
+        return t - (gaps.bit_length() - 1)
+
+    def longest_streak(self) -> int:
+        if not self.completed:
+            return 0
+        return max(map(len, bin(self.completed)[2:].split("0")))
+
+    def runs(self) -> List[Tuple[date, date]]:
+        """(start, end) of every run of consecutive completed days, oldest first"""
+        lsb_first = bin(self.completed)[:1:-1] if self.completed else ""
+        return [
+            (self.origin + timedelta(days=m.start()), self.origin + timedelta(days=m.end() - 1))
+            for m in _RUN.finditer(lsb_first)
+        ]
+
+    def days(self, start: date, end: date) -> Iterator[Tuple[date, bool, bool]]:
+        """(day, completed, logged) for each day from start to end inclusive"""
+        completed = self._window(self.completed, start, end)
+        logged = self._window(self.logged, start, end)
+        # The window starts at origin when start precedes it
+        offset = max(0, -self._index(start))
+        for n in range((end - start).days + 1):
+            i = n - offset
+            yield (
+                start + timedelta(days=n),
+                i >= 0 and bool(completed >> i & 1),
+                i >= 0 and bool(logged >> i & 1),
+            )
@@ -0,0 +1,131 @@
+# app/utils/cache.py
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from app.utils.metrics import Counter
+
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by cache name and result", ["cache", "result"])
+
+
+class CacheBackend:
+    """Minimal key/value interface shared by the in-process and shared caches.
+
+    Values must be JSON-serializable (dicts, lists, strings, numbers): the
+    shared backend stores JSON and never unpickles.
+    """
+
+    # Whether every worker process sees the same entries
+    shared = False
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    def delete(self, *keys: str):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """Thread-safe in-process cache with LRU eviction and per-entry TTL"""
+
+    def __init__(self, max_entries: int = 10000, default_ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """Cache shared between workers, backed by Redis (requires the ``redis`` package).
+
+    Values are stored as JSON, so whoever can write to Redis can at most feed
+    the app bad data, never code.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, default_ttl: Optional[float] = None, prefix: str = "habits:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        self.client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000) if ttl else None)
+
+    def delete(self, *keys: str):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+
+class NamedCache:
+    """A cache backend wrapper that counts hits and misses under a name"""
+
+    def __init__(self, name: str, backend: CacheBackend):
+        self.name = name
+        self.backend = backend
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.backend.get(key)
+        CACHE_REQUESTS.inc(cache=self.name, result="miss" if value is None else "hit")
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self.backend.set(key, value, ttl)
+
+    def delete(self, *keys: str):
+        self.backend.delete(*keys)
+
+    def stats(self) -> dict:
+        return {
+            "hits": CACHE_REQUESTS.value(cache=self.name, result="hit"),
+            "misses": CACHE_REQUESTS.value(cache=self.name, result="miss"),
+        }
+
+
+def create_cache(url: Optional[str], max_entries: int, default_ttl: Optional[float]) -> CacheBackend:
+    """Build the cache backend for a URL: None/'memory://' is in-process, 'redis://...' is shared"""
+    if not url or url.startswith("memory://"):
+        return MemoryCache(max_entries=max_entries, default_ttl=default_ttl)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCache(url, default_ttl=default_ttl)
+    raise ValueError(f"Unsupported cache URL: {url}")
@@ -1,12 +1,40 @@
 # app/utils/dependencies.py
+from datetime import date
 from fastapi import Depends, HTTPException, status
 from sqlmodel import Session, select
-from app.database import get_session
+from app.config import settings
+from app.database import get_session, open_read_session
 from app.models.user import User
+from app.schemas.user import UserResponse
+from app.utils.cache import NamedCache, create_cache
 from app.utils.security import oauth2_scheme, verify_token
+from app.utils.timezones import local_today
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_session)):
-    """Get current authenticated user"""
+# Token subject -> public fields of the user row (never the password hash), so
+# authenticated requests skip the user lookup
+identity_cache = NamedCache(
+    "identity",
+    create_cache(settings.cache_url, settings.identity_cache_max_entries, settings.identity_cache_ttl_seconds)
+)
+
+def _identity_keys(user_id=None, username=None):
+    keys = []
+    if user_id is not None:
+        keys.append(f"identity:id:{user_id}")
+    if username is not None:
+        keys.append(f"identity:name:{username}")
+    return keys
+
+def invalidate_user(user: User):
+    """Drop a user's cached identity after the row changes"""
+    identity_cache.delete(*_identity_keys(user.id, user.username))
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_session)):
+    """Get current authenticated user.
+
+    The returned User is a detached snapshot of the public fields, without
+    ``password_hash``; load the row with ``db.get`` before modifying it.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -15,9 +43,41 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     
     token_data = verify_token(token, credentials_exception)
     
-    statement = select(User).where(User.username == token_data.username)
-    user = db.exec(statement).first()
+    # Tokens issued before the uid claim are keyed by username
+    if token_data.user_id is not None:
+        cache_key = _identity_keys(user_id=token_data.user_id)[0]
+    else:
+        cache_key = _identity_keys(username=token_data.username)[0]
     
-    if user is None:
+    user_data = identity_cache.get(cache_key)
+    if user_data is None:
+        if token_data.user_id is not None:
+            user = db.get(User, token_data.user_id)
+        else:
+            statement = select(User).where(User.username == token_data.username)
+            user = db.exec(statement).first()
+        
+        if user is None:
+            raise credentials_exception
+        user_data = UserResponse.model_validate(user).model_dump(mode="json")
+        identity_cache.set(cache_key, user_data)
+    
+    # A renamed user's old tokens stay invalid
+    if user_data["username"] != token_data.username:
         raise credentials_exception
-    return user
+    # Commits on this session pin the user's reads to the primary for a while
+    db.info["user_id"] = user_data["id"]
+    return User(**UserResponse.model_validate(user_data).model_dump())
+
+def get_read_session(current_user: User = Depends(get_current_user)):
+    """Session dependency for read-only routes.
+
+    Uses the replica when one is configured, except shortly after the current
+    user's own writes so they always see them.
+    """
+    with open_read_session(current_user.id) as session:
+        yield session
+
+def get_local_today(current_user: User = Depends(get_current_user)) -> date:
+    """Today's date in the current user's timezone, computed once per request"""
+    return local_today(current_user.timezone)
@@ -0,0 +1,133 @@
+# app/utils/query_plans.py
+import json
+import re
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlmodel import Session
+from app.models.user import User
+from app.services.bitmap_service import BitmapService
+from app.services.dashboard_service import DashboardService
+from app.services.habit_service import HabitService
+from app.services.progress_service import ProgressService
+from app.services.reminder_scheduler import ReminderScheduler
+from app.services.reminder_service import ReminderService
+from app.services.streak_service import StreakService
+from app.utils.query_stats import count_queries, statement_shape
+from app.utils.timezones import local_today
+
+# Tables that grow with usage; request-path queries must reach them through an index
+INDEXED_TABLES = ("habits", "habit_progress", "reminders", "reminder_changes", "streaks", "user_daily_rollup")
+
+# Ids no row has: every read still runs its real statements, then finds nothing
+_NO_USER_ID = -1
+_NO_HABIT_ID = -2
+
+# Statements EXPLAIN accepts and that can read a table
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+def run_hot_reads(db: Session, user: User, habit_id: int, today: date):
+    """Call the read services behind the hot endpoints, as the routers do.
+
+    Not-found errors are ignored: services only raise them after their own
+    query ran, which is all callers need.
+    """
+    calls = (
+        lambda: HabitService.get_user_habits(db, user),
+        lambda: HabitService.get_user_habits(db, user, limit=50, compact=True),
+        lambda: HabitService.get_habit_by_id(db, habit_id, user),
+        lambda: ProgressService.get_habit_progress(db, habit_id, user),
+        lambda: ProgressService.get_habit_progress(db, habit_id, user, limit=100),
+        lambda: ProgressService.get_progress_by_date(db, habit_id, today, user),
+        lambda: StreakService.get_habit_streaks(db, habit_id, user),
+        lambda: StreakService.calculate_current_streak(db, habit_id, user, today),
+        lambda: StreakService.calculate_longest_streak(db, habit_id, user),
+        lambda: ReminderService.get_habit_reminders(db, habit_id, user),
+        lambda: DashboardService.get_statistics(db, user, today),
+        lambda: DashboardService.get_home(db, user, today, today.year, today.month),
+        lambda: DashboardService.get_monthly_calendar(db, user, today.month, today.year),
+        lambda: DashboardService.get_yearly_calendar(db, user, today.year),
+        # Normally behind the bitmap cache, and skipped above when the user has no habits
+        lambda: BitmapService.load_bitmaps(db, {habit_id: today}),
+        lambda: StreakService.get_streak_lengths(db, [habit_id], today),
+        lambda: db.exec(ReminderScheduler._query(habit_ids=[habit_id])).all(),
+        lambda: db.exec(ReminderScheduler._changes_query(datetime.utcnow())).all(),
+    )
+    for call in calls:
+        try:
+            call()
+        except HTTPException:
+            pass
+
+
+def capture_hot_reads(db: Session, user: Optional[User] = None, habit_id: int = _NO_HABIT_ID) -> List[Tuple[str, object]]:
+    """(statement, parameters) as sent to the driver by run_hot_reads"""
+    user = user or User(id=_NO_USER_ID, username="", email="", timezone="UTC")
+    with count_queries(keep_statements=True) as stats:
+        run_hot_reads(db, user, habit_id, local_today(user.timezone))
+    db.rollback()
+    return stats.statements
+
+
+def _walk(plan: dict) -> Iterable[dict]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _walk(child)
+
+
+def full_scans(db: Session, statement: str, parameters=None, tables: Iterable[str] = INDEXED_TABLES) -> List[str]:
+    """Tables from ``tables`` that the database would read in full for a
+    statement as sent to the driver (e.g. captured by count_queries)"""
+    tables = set(tables)
+    connection = db.connection()
+    parameters = parameters if parameters is not None else ()
+    if connection.dialect.name == "postgresql":
+        # Makes the planner pick any usable index, so a Seq Scan means none exists
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return [
+            node["Relation Name"] for node in _walk(plan[0]["Plan"])
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in tables
+        ]
+    # SQLite: "SCAN t" reads the whole table (or index), "SEARCH t USING ..." seeks
+    scans = []
+    for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all():
+        words = row[-1].split()
+        if len(words) > 1 and words[0] == "SCAN" and words[1] in tables:
+            scans.append(words[1])
+    return scans
+
+
+def check_statements(db: Session, statements: Iterable[Tuple[str, object]]) -> List[Tuple[str, List[str]]]:
+    """(statement shape, fully scanned tables) for every captured statement that misses an index"""
+    problems = []
+    seen = set()
+    for statement, parameters in statements:
+        shape = statement_shape(statement)
+        # executemany parameter lists are INSERTs; nothing to plan
+        if shape in seen or not _EXPLAINABLE.match(statement) or isinstance(parameters, list):
+            continue
+        seen.add(shape)
+        scans = full_scans(db, statement, parameters)
+        if scans:
+            problems.append((shape, scans))
+    db.rollback()
+    return problems
+
+
+def check_hot_queries(db: Session) -> List[Tuple[str, List[str]]]:
+    """EXPLAIN the statements the hot read services actually run"""
+    return check_statements(db, capture_hot_reads(db))
+
+
+def precompile_hot_queries(db: Session) -> int:
+    """Run the hot read services once for ids that do not exist.
+
+    Configures the mappers, initializes the dialect and fills the engine's
+    compiled-statement cache with the services' own statements before the
+    first request needs them. Returns the number of statements run.
+    """
+    return len(capture_hot_reads(db))
@@ -0,0 +1,132 @@
+# app/utils/query_stats.py
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Bound-parameter lists such as IN (?, ?, ?) or IN (%(id_1)s, %(id_2)s)
+_PARAM_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)\s*,)+\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with whitespace and parameter lists collapsed"""
+    return _PARAM_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """SQL statements executed, and time spent in them, during one request.
+
+    With ``track_shapes`` each statement shape is counted too, so shapes that
+    repeat within a request can be reported as N+1 suspects. With
+    ``keep_statements`` the (statement, parameters) pairs are kept as sent to
+    the driver, e.g. to EXPLAIN them afterwards.
+    """
+    __slots__ = ("count", "seconds", "shapes", "statements")
+
+    def __init__(self, track_shapes: bool = False, keep_statements: bool = False):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter() if track_shapes else None
+        self.statements = [] if keep_statements else None
+
+    def record(self, statement: str, seconds: float, parameters=None):
+        self.count += 1
+        self.seconds += seconds
+        if self.shapes is not None:
+            self.shapes[statement_shape(statement)] += 1
+        if self.statements is not None:
+            self.statements.append((statement, parameters))
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """(shape, count) for shapes executed at least ``threshold`` times, most frequent first"""
+        if not self.shapes:
+            return []
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+# Set by the metrics middleware; copied into the threadpool with the request context
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Process-wide collectors (see count_queries), fed from every thread
+_observers: List[QueryStats] = []
+_observers_lock = threading.Lock()
+
+
+def begin_request(track_shapes: bool = False):
+    """Start counting statements for the current request; returns (stats, token)"""
+    stats = QueryStats(track_shapes)
+    return stats, _current_stats.set(stats)
+
+
+def end_request(token):
+    _current_stats.reset(token)
+
+
+@contextmanager
+def count_queries(keep_statements: bool = False):
+    """Count every statement any thread executes inside the block, by shape"""
+    stats = QueryStats(track_shapes=True, keep_statements=keep_statements)
+    with _observers_lock:
+        _observers.append(stats)
+    try:
+        yield stats
+    finally:
+        with _observers_lock:
+            _observers.remove(stats)
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, max_repeats: Optional[int] = None):
+    """Fail with AssertionError when the block runs more than ``max_queries``
+    statements, or one statement shape more than ``max_repeats`` times.
+
+    Wrap test-client calls to pin an endpoint's query budget::
+
+        with assert_query_budget(5, max_repeats=1):
+            client.get("/dashboard/statistics", headers=auth)
+    """
+    with count_queries() as stats:
+        yield stats
+    problems = []
+    if stats.count > max_queries:
+        problems.append(f"{stats.count} statements, budget is {max_queries}")
+    if max_repeats is not None:
+        problems.extend(
+            f"{count}x {shape}" for shape, count in stats.repeated(max_repeats + 1)
+        )
+    if problems:
+        raise AssertionError("Query budget exceeded: " + "; ".join(problems))
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None or _observers:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time so it
+    # does not pile up on the pooled connection or get paired with a later statement
+    if context.connection is not None:
+        context.connection.info.pop("query_start", None)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not conn.info.get("query_start"):
+        return
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if _observers:
+        with _observers_lock:
+            for observer in _observers:
+                observer.record(statement, elapsed, parameters)
@@ -1,6 +1,9 @@
 # app/utils/security.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -10,18 +13,78 @@ from app.config import settings
 from app.database import get_session
 from app.models.user import User
 from app.schemas.auth import TokenData
+from app.utils.metrics import Counter, Gauge, Histogram
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; pinning min/max rounds flags hashes made at another cost for rehash
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+    bcrypt__max_rounds=settings.bcrypt_rounds,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password against hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+HASH_QUEUE_DEPTH = Gauge("password_hash_queue_depth", "Password hash jobs queued or running")
+HASH_REJECTED = Counter("password_hash_rejected_total", "Password hash jobs rejected because the queue was full")
+HASH_SECONDS = Histogram(
+    "password_hash_seconds", "Time from submitting a password hash job to its result", ["operation"]
+)
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated, size-bounded thread pool.
+
+    bcrypt releases the GIL, so a few threads hash in parallel without starving
+    the request threadpool; once ``max_pending`` jobs are queued, new ones are
+    rejected with 503 instead of piling up behind a login spike.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, timeout: float):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._timeout = timeout
+
+    def _release(self, _future):
+        HASH_QUEUE_DEPTH.dec()
+        self._slots.release()
+
+    def run(self, operation: str, fn, *args):
+        """Run fn(*args) on the hashing pool and wait for its result"""
+        if not self._slots.acquire(blocking=False):
+            HASH_REJECTED.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, please retry",
+                headers={"Retry-After": "1"},
+            )
+        HASH_QUEUE_DEPTH.inc()
+        start = time.perf_counter()
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self._timeout)
+        except FuturesTimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication timed out, please retry",
+                headers={"Retry-After": "1"},
+            )
+        finally:
+            HASH_SECONDS.observe(time.perf_counter() - start, operation=operation)
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+    timeout=settings.password_hash_timeout_seconds,
+)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify password; also return a new hash if the stored one uses an outdated cost"""
+    return password_hasher.run("verify", pwd_context.verify_and_update, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hash password"""
-    return pwd_context.hash(password)
+    return password_hasher.run("hash", pwd_context.hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
@@ -41,7 +104,7 @@ def verify_token(token: str, credentials_exception):
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-        token_data = TokenData(username=username)
+        token_data = TokenData(username=username, user_id=payload.get("uid"))
     except JWTError:
         raise credentials_exception
     return token_data
@@ -0,0 +1,69 @@
+# app/utils/sql.py
+import sqlite3
+from datetime import datetime
+from sqlalchemy import Date, Integer, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from app.utils.timezones import to_local_date
+
+
+class day_number(FunctionElement):
+    """Integer day number of a DATE column (consecutive days differ by 1)"""
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(day_number)
+def _day_number_default(element, compiler, **kw):
+    # Postgres: date - date yields an integer number of days
+    return "(%s - DATE '1970-01-01')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(day_number, "sqlite")
+def _day_number_sqlite(element, compiler, **kw):
+    return "CAST(julianday(%s) AS INTEGER)" % compiler.process(element.clauses, **kw)
+
+
+class local_date(FunctionElement):
+    """Calendar date of a naive UTC timestamp in a timezone: local_date(timestamp, tz_name).
+
+    The timezone may be a column (e.g. User.timezone), so per-user day
+    boundaries are computed in SQL for every row at once.
+    """
+    type = Date()
+    inherit_cache = True
+
+
+@compiles(local_date)
+def _local_date_default(element, compiler, **kw):
+    timestamp, tz_name = list(element.clauses)
+    return "CAST(timezone(%s, timezone('UTC', %s)) AS DATE)" % (
+        compiler.process(tz_name, **kw), compiler.process(timestamp, **kw)
+    )
+
+
+@compiles(local_date, "sqlite")
+def _local_date_sqlite(element, compiler, **kw):
+    # SQLite has no timezone database; local_date() is registered on connect below
+    return "local_date(%s)" % compiler.process(element.clauses, **kw)
+
+
+def _sqlite_local_date(timestamp, tz_name):
+    if timestamp is None:
+        return None
+    return to_local_date(datetime.fromisoformat(timestamp), tz_name or "UTC").isoformat()
+
+
+@event.listens_for(Engine, "connect")
+def _register_sqlite_functions(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function("local_date", 2, _sqlite_local_date, deterministic=True)
+
+
+def dialect_insert(db, model):
+    """INSERT construct for the session's dialect, supporting on_conflict_do_update"""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
@@ -0,0 +1,71 @@
+# app/utils/startup.py
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+from sqlmodel import Session
+from app.config import settings
+from app.database import engine, read_engine, check_schema_version, create_db_and_tables, replica_enabled, warm_pool
+from app.utils.metrics import Gauge
+from app.utils.query_plans import precompile_hot_queries
+
+logger = logging.getLogger(__name__)
+
+STARTUP_SECONDS = Gauge("app_startup_seconds", "Time spent in each worker startup phase", ["phase"])
+
+
+@contextmanager
+def _phase(timings: Dict[str, float], name: str):
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    timings[name] = round(elapsed * 1000, 2)
+    STARTUP_SECONDS.set(elapsed, phase=name)
+
+
+def process_local_warnings() -> List[str]:
+    """Settings whose state stays in one process although requests are spread over several"""
+    warnings = []
+    if read_engine is not engine and not replica_enabled():
+        warnings.append(
+            "database_read_url is set but cache_url is not shared: reads stay on the primary. "
+            "Set a redis:// cache_url, or read_your_writes_single_process for a single worker"
+        )
+    if settings.rate_limit_enabled and settings.rate_limit_storage_uri.startswith("memory://") and settings.web_concurrency > 1:
+        warnings.append(
+            f"Rate limit counters are kept per process across {settings.web_concurrency} workers, "
+            "so every limit is that many times too high; set a redis:// rate_limit_storage_uri"
+        )
+    return warnings
+
+
+def prepare_worker() -> Dict[str, float]:
+    """Get a worker ready to serve; returns milliseconds per phase.
+
+    No DDL runs here: one read confirms the schema revision, then pooled
+    connections are opened and the hot queries compiled, so the first
+    requests do not pay for them.
+    """
+    timings = {}
+    if settings.db_auto_create:
+        with _phase(timings, "create_all"):
+            create_db_and_tables()
+    elif settings.db_schema_check:
+        with _phase(timings, "schema_check"):
+            check_schema_version()
+
+    for warning in process_local_warnings():
+        logger.warning(warning)
+
+    with _phase(timings, "pool_warmup"):
+        warm_pool(engine, settings.db_pool_warmup)
+        if replica_enabled():
+            warm_pool(read_engine, settings.db_pool_warmup)
+
+    with _phase(timings, "precompile"):
+        with Session(engine) as db:
+            precompile_hot_queries(db)
+
+    logger.info(json.dumps({"event": "startup", **timings, "total_ms": round(sum(timings.values()), 2)}))
+    return timings
@@ -0,0 +1,34 @@
+# app/utils/timezones.py
+from datetime import date, datetime, time, timezone
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+@lru_cache(maxsize=1024)
+def get_zone(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+def is_valid_timezone(name: str) -> bool:
+    try:
+        get_zone(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+def local_today(name: str, now: Optional[datetime] = None) -> date:
+    """Today's calendar date in an IANA timezone"""
+    return (now or datetime.now(timezone.utc)).astimezone(get_zone(name)).date()
+
+
+def to_local_date(value: datetime, name: str) -> date:
+    """Calendar date of a naive UTC timestamp (as stored) in an IANA timezone"""
+    return value.replace(tzinfo=timezone.utc).astimezone(get_zone(name)).date()
+
+
+def utc_minute_of_day(local_time: time, name: str, on: date) -> int:
+    """Minute of the UTC day at which a local wall-clock time falls on a given local date"""
+    utc = datetime.combine(on, local_time, tzinfo=get_zone(name)).astimezone(timezone.utc)
+    return utc.hour * 60 + utc.minute
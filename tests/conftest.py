@@ -0,0 +1,78 @@
+# tests/conftest.py
+import itertools
+import os
+import tempfile
+
+# Settings are read at import time, so the test environment goes first
+_DB_DIR = tempfile.mkdtemp(prefix="habit-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_DB_DIR}/test.db",
+    "ENVIRONMENT": "test",
+    "DB_AUTO_CREATE": "true",
+    "BCRYPT_ROUNDS": "4",
+    "RATE_LIMIT_ENABLED": "false",
+    "REMINDER_SCHEDULER_ENABLED": "false",
+})
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from app.database import engine
+from app.main import app
+from app.utils.query_stats import assert_query_budget, count_queries
+
+_usernames = (f"user{n}" for n in itertools.count())
+
+
+@pytest.fixture(scope="session")
+def client():
+    # One database for the session; every test registers its own users
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db():
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def make_user(client):
+    """Register and log in a new user; returns their auth headers"""
+    def _make_user(timezone: str = "UTC") -> dict:
+        username = next(_usernames)
+        response = client.post("/auth/register", json={
+            "username": username, "email": f"{username}@example.com",
+            "password": "password123", "timezone": timezone,
+        })
+        assert response.status_code == 200, response.text
+        response = client.post("/auth/login", data={"username": username, "password": "password123"})
+        assert response.status_code == 200, response.text
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        # Warm the identity cache so budgets below count the endpoint, not the login
+        client.get("/auth/me", headers=headers)
+        return headers
+    return _make_user
+
+
+@pytest.fixture
+def auth(make_user):
+    return make_user()
+
+
+@pytest.fixture
+def query_budget():
+    """Pin an endpoint's query budget::
+
+        def test_overview(client, auth, query_budget):
+            with query_budget(4, max_repeats=1):
+                client.get("/dashboard/overview", headers=auth)
+    """
+    return assert_query_budget
+
+
+@pytest.fixture
+def query_counter():
+    """Count the statements a block runs: ``with query_counter() as stats: ...; stats.count``"""
+    return count_queries
@@ -0,0 +1,89 @@
+# tests/test_bitmap.py
+import random
+from datetime import date, timedelta
+import pytest
+from app.utils.bitmap import CompletionBitmap
+
+ORIGIN = date(2024, 1, 1)
+
+
+def d(n: int) -> date:
+    return ORIGIN + timedelta(days=n)
+
+
+def reference_runs(days):
+    runs = []
+    for n in sorted(days):
+        if runs and runs[-1][1] == n - 1:
+            runs[-1][1] = n
+        else:
+            runs.append([n, n])
+    return runs
+
+
+def test_empty_bitmap():
+    bitmap = CompletionBitmap(ORIGIN)
+    assert bitmap.total_completed() == 0
+    assert bitmap.current_streak(d(10)) == 0
+    assert bitmap.longest_streak() == 0
+    assert bitmap.runs() == []
+    assert list(bitmap.days(d(0), d(1))) == [(d(0), False, False), (d(1), False, False)]
+
+
+def test_origin_moves_back_to_the_earliest_entry():
+    bitmap = CompletionBitmap.from_entries(d(5), [(d(2), True), (d(7), False)])
+    assert bitmap.origin == d(2)
+    assert bitmap.is_completed(d(2)) and not bitmap.is_completed(d(7))
+    assert bitmap.is_logged(d(7)) and not bitmap.is_logged(d(3))
+    assert not bitmap.is_completed(d(-1))
+
+
+def test_current_streak_counts_back_from_today():
+    bitmap = CompletionBitmap.from_entries(ORIGIN, [(d(n), True) for n in (0, 1, 3, 4, 5)])
+    assert bitmap.current_streak(d(5)) == 3
+    assert bitmap.current_streak(d(1)) == 2
+    assert bitmap.current_streak(d(2)) == 0
+    assert bitmap.current_streak(d(6)) == 0
+    assert bitmap.current_streak(d(-1)) == 0
+
+
+def test_windows_before_origin_and_past_the_end():
+    bitmap = CompletionBitmap.from_entries(ORIGIN, [(d(n), n % 2 == 0) for n in range(10)])
+    assert bitmap.completed_between(d(-5), d(3)) == 2
+    assert bitmap.logged_between(d(-5), d(3)) == 4
+    assert bitmap.completed_between(d(8)) == 1
+    assert bitmap.completed_between(d(5), d(4)) == 0
+    assert [day for day, done, _ in bitmap.days(d(-2), d(2)) if done] == [d(0), d(2)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_a_day_by_day_reference(seed):
+    rng = random.Random(seed)
+    span = rng.randint(1, 400)
+    logged = {n for n in range(span) if rng.random() < 0.7}
+    completed = {n for n in logged if rng.random() < 0.7}
+    bitmap = CompletionBitmap.from_entries(ORIGIN, [(d(n), n in completed) for n in logged])
+    runs = reference_runs(completed)
+
+    assert bitmap.total_completed() == len(completed)
+    assert bitmap.total_logged() == len(logged)
+    assert bitmap.longest_streak() == max((last - first + 1 for first, last in runs), default=0)
+    assert bitmap.runs() == [(d(first), d(last)) for first, last in runs]
+
+    today = rng.randrange(span)
+    expected_current = 0
+    while today - expected_current in completed:
+        expected_current += 1
+    assert bitmap.current_streak(d(today)) == expected_current
+
+    start, end = sorted(rng.randrange(-10, span + 10) for _ in range(2))
+    assert bitmap.completed_between(d(start), d(end)) == sum(start <= n <= end for n in completed)
+    assert bitmap.logged_between(d(start), d(end)) == sum(start <= n <= end for n in logged)
+    assert list(bitmap.days(d(start), d(end))) == [
+        (d(n), n in completed, n in logged) for n in range(start, end + 1)
+    ]
+
+
+def test_a_year_packs_into_46_bytes():
+    bitmap = CompletionBitmap.from_entries(ORIGIN, [(d(n), True) for n in range(365)])
+    assert (bitmap.completed.bit_length() + 7) // 8 <= 46
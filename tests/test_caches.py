@@ -0,0 +1,102 @@
+# tests/test_caches.py
+import json
+from datetime import date, datetime, timedelta
+from app.config import settings
+from app.services.bitmap_service import BitmapService, bitmap_cache
+from app.services.dashboard_cache import dashboard_cache
+from app.utils.cache import RedisCache
+from app.utils.dependencies import identity_cache
+from app.utils.timezones import local_today
+
+
+class FakeRedis:
+    """Stands in for redis.Redis: keeps the raw bytes the cache writes"""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, px=None):
+        self.values[key] = value.encode() if isinstance(value, str) else value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+
+def fake_redis_cache() -> RedisCache:
+    cache = RedisCache.__new__(RedisCache)
+    cache.client, cache.default_ttl, cache.prefix = FakeRedis(), None, "habits:"
+    return cache
+
+
+def test_redis_cache_stores_json():
+    cache = fake_redis_cache()
+    cache.set("k", {"id": 1, "names": ["a"]})
+    assert json.loads(cache.client.values["habits:k"]) == {"id": 1, "names": ["a"]}
+    assert cache.get("k") == {"id": 1, "names": ["a"]}
+    cache.delete("k")
+    assert cache.get("k") is None
+
+
+def test_identity_cache_holds_no_password_hash(client, auth):
+    me = client.get("/auth/me", headers=auth).json()
+    cached = identity_cache.get(f"identity:id:{me['id']}")
+    assert "password_hash" not in cached
+    assert json.loads(json.dumps(cached)) == cached
+    # Cached identities still authenticate and serve the profile
+    assert client.get("/auth/me", headers=auth).json() == me
+
+
+def test_bitmaps_round_trip_through_the_cache(db, monkeypatch):
+    monkeypatch.setattr(settings, "bitmap_cache_single_process", True)
+    habit_id = 10 ** 6
+    origin = datetime(2000, 1, 1)
+    bitmap_cache.set(
+        f"bitmap:{habit_id}",
+        # A long history: the int would be too big for json as a decimal number
+        ["2000-01-01", format((1 << 20000) - 1, "x"), format((1 << 20000) - 1, "x")]
+    )
+    [bitmap] = BitmapService.get_bitmaps(db, [(habit_id, origin)]).values()
+    assert bitmap.origin == date(2000, 1, 1)
+    assert bitmap.current_streak(date(2000, 1, 1) + timedelta(days=19999)) == 20000
+    BitmapService.invalidate(habit_id)
+
+
+def overview_after_unseen_write(client, auth, monkeypatch) -> tuple:
+    """completed_today before and after a write whose invalidation never reaches this
+    process, as with a write served by another worker"""
+    habit_id = client.post("/habits/", json={"name": "Stretch"}, headers=auth).json()["id"]
+    before = client.get("/dashboard/overview", headers=auth).json()["completed_today"]
+    monkeypatch.setattr(BitmapService, "invalidate", staticmethod(lambda *habit_ids: None))
+    today = local_today("UTC").isoformat()
+    client.post(f"/habits/{habit_id}/progress", json={"date": today, "completed": True}, headers=auth)
+    return before, client.get("/dashboard/overview", headers=auth).json()["completed_today"]
+
+
+def test_process_local_bitmaps_are_read_from_the_database(client, auth, monkeypatch):
+    assert overview_after_unseen_write(client, auth, monkeypatch) == (0, 1)
+
+
+def test_single_process_bitmaps_are_cached(client, auth, monkeypatch):
+    monkeypatch.setattr(settings, "bitmap_cache_single_process", True)
+    # Only safe because invalidate() normally runs in the one process there is
+    assert overview_after_unseen_write(client, auth, monkeypatch) == (0, 0)
+
+
+def test_cached_dashboards_are_json(client, auth, monkeypatch):
+    monkeypatch.setattr(settings, "dashboard_cache_single_process", True)
+    written = []
+    backend_set = dashboard_cache.backend.set
+    monkeypatch.setattr(
+        dashboard_cache.backend, "set",
+        lambda key, value, ttl=None: (written.append(value), backend_set(key, value, ttl))
+    )
+    first = client.get("/dashboard/home", headers=auth)
+    second = client.get("/dashboard/home", headers=auth)
+    assert second.json() == first.json()
+    assert written
+    for value in written:
+        json.dumps(value)
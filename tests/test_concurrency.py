@@ -0,0 +1,43 @@
+# tests/test_concurrency.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.services.dashboard_service import DashboardService
+
+SLOW_QUERY_SECONDS = 0.3
+
+
+def p99(samples):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+
+def timed_get(client, path, headers=None):
+    started = time.perf_counter()
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200
+    return time.perf_counter() - started
+
+
+def test_slow_database_routes_do_not_stall_the_event_loop(client, auth, monkeypatch):
+    """Load check: /health p99 stays low while slow dashboard queries are in flight"""
+    get_statistics = DashboardService.get_statistics
+
+    def slow_statistics(*args, **kwargs):
+        # Stands in for a slow round trip on a synchronous driver
+        time.sleep(SLOW_QUERY_SECONDS)
+        return get_statistics(*args, **kwargs)
+
+    monkeypatch.setattr(DashboardService, "get_statistics", staticmethod(slow_statistics))
+
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        started = time.perf_counter()
+        slow = [pool.submit(timed_get, client, "/dashboard/statistics", auth) for _ in range(4)]
+        health = [pool.submit(timed_get, client, "/health") for _ in range(200)]
+        health_latencies = [future.result() for future in health]
+        slow_latencies = [future.result() for future in slow]
+        elapsed = time.perf_counter() - started
+
+    # Blocking the loop would hold every /health call behind a slow query
+    assert p99(health_latencies) < SLOW_QUERY_SECONDS / 2
+    # The slow requests overlapped instead of queueing behind each other
+    assert elapsed < len(slow_latencies) * SLOW_QUERY_SECONDS
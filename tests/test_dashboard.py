@@ -0,0 +1,113 @@
+# tests/test_dashboard.py
+from datetime import date, timedelta
+import pytest
+from sqlmodel import select
+from app.models.streak import Streak
+from app.utils.timezones import local_today
+
+TODAY = local_today("UTC")
+
+
+def add_habits(client, auth, count: int, days: int = 30):
+    habit_ids = [client.post("/habits/", json={"name": f"habit {n}"}, headers=auth).json()["id"] for n in range(count)]
+    for habit_id in habit_ids:
+        entries = [
+            {"habit_id": habit_id, "date": (TODAY - timedelta(days=d)).isoformat(), "completed": d % 3 != 2}
+            for d in range(days)
+        ]
+        assert client.post("/habits/progress/batch", json={"entries": entries}, headers=auth).status_code == 200
+    return habit_ids
+
+
+@pytest.mark.parametrize("path", ["/dashboard/statistics", "/dashboard/overview", "/dashboard/home"])
+def test_query_count_is_flat_in_the_habit_count(client, auth, query_counter, path):
+    counts = []
+    for more in (2, 40):
+        add_habits(client, auth, more)
+        with query_counter() as stats:
+            assert client.get(path, headers=auth).status_code == 200
+        counts.append(stats.count)
+    assert counts[0] == counts[1]
+
+
+def test_statistics_per_habit(client, auth):
+    [habit_id] = add_habits(client, auth, 1, days=10)
+    statistics = client.get("/dashboard/statistics", headers=auth).json()
+    [stats] = [s for s in statistics["habits_statistics"] if s["habit_id"] == habit_id]
+    # Days 0..9 back, every third one (2, 5, 8) missed
+    assert stats["current_streak"] == 2
+    assert stats["longest_streak"] == 2
+    assert stats["total_completions"] == 7
+
+
+
+def test_streaks_are_read_from_the_streaks_table(client, auth, db):
+    ended_today, ended_yesterday = [
+        client.post("/habits/", json={"name": name}, headers=auth).json()["id"] for name in ("Today", "Yesterday")
+    ]
+    entries = [{"habit_id": ended_today, "date": (TODAY - timedelta(days=d)).isoformat(), "completed": True} for d in range(3)]
+    entries += [{"habit_id": ended_yesterday, "date": (TODAY - timedelta(days=d)).isoformat(), "completed": True} for d in (1, 2)]
+    assert client.post("/habits/progress/batch", json={"entries": entries}, headers=auth).status_code == 200
+
+    # Stored lengths are what the dashboard reports, with no recount from history
+    run = db.exec(select(Streak).where(Streak.habit_id == ended_today)).one()
+    run.length = 40
+    db.add(run)
+    db.commit()
+
+    statistics = client.get("/dashboard/statistics", headers=auth).json()
+    streaks = {s["habit_id"]: (s["current_streak"], s["longest_streak"]) for s in statistics["habits_statistics"]}
+    # A run that ended yesterday is not current, as on /habits/{id}/streaks/current
+    assert streaks == {ended_today: (40, 40), ended_yesterday: (0, 2)}
+    assert client.get("/dashboard/overview", headers=auth).json()["active_streaks"] == 1
+
+
+@pytest.mark.parametrize("path", [
+    "/dashboard/calendar/0",
+    "/dashboard/calendar/10000",
+    "/dashboard/calendar/9999/12",
+    "/dashboard/calendar/2024/13",
+    "/dashboard/calendar/2024/0",
+    "/dashboard/home?year=10000",
+    "/dashboard/home?year=2024&month=13",
+])
+def test_out_of_range_calendar_dates_are_422(client, auth, path):
+    assert client.get(path, headers=auth).status_code == 422
+
+
+@pytest.mark.parametrize("path, days", [
+    ("/dashboard/calendar/2024", 366),
+    ("/dashboard/calendar/2024/2", 29),
+    ("/dashboard/calendar/2999/12", 31),
+])
+def test_calendar_bounds(client, auth, path, days):
+    response = client.get(path, headers=auth)
+    assert response.status_code == 200
+    assert len(response.json()["entries"]) == days
+
+
+def test_yearly_heatmap_counts_each_day(client, auth):
+    first, second, archived = [
+        client.post("/habits/", json={"name": name}, headers=auth).json()["id"] for name in ("Run", "Read", "Old")
+    ]
+    entries = [
+        {"habit_id": first, "date": "2024-01-01", "completed": True},
+        {"habit_id": second, "date": "2024-01-01", "completed": False},
+        {"habit_id": first, "date": "2024-02-29", "completed": True},
+        {"habit_id": second, "date": "2024-02-29", "completed": True},
+        {"habit_id": first, "date": "2024-12-31", "completed": True},
+        {"habit_id": archived, "date": "2024-03-01", "completed": True},
+        # Neighbouring years stay out of the heatmap
+        {"habit_id": first, "date": "2023-12-31", "completed": True},
+        {"habit_id": second, "date": "2025-01-01", "completed": True},
+    ]
+    assert client.post("/habits/progress/batch", json={"entries": entries}, headers=auth).status_code == 200
+    assert client.patch(f"/habits/{archived}/archive", headers=auth).status_code == 200
+
+    heatmap = client.get("/dashboard/calendar/2024", headers=auth).json()
+    assert heatmap["year"] == 2024
+    expected = {"2024-01-01": 1, "2024-02-29": 2, "2024-12-31": 1}
+    days = [(date(2024, 1, 1) + timedelta(days=n)).isoformat() for n in range(366)]
+    assert heatmap["entries"] == [
+        {"date": day, "completed_habits": expected.get(day, 0), "total_habits": 2} for day in days
+    ]
@@ -0,0 +1,33 @@
+# tests/test_dashboard_cache.py
+import pytest
+from app.config import settings
+from app.utils.timezones import local_today
+
+
+@pytest.fixture
+def single_process(monkeypatch):
+    monkeypatch.setattr(settings, "dashboard_cache_single_process", True)
+
+
+def test_process_local_cache_sends_no_etag(client, auth):
+    # The test app uses the in-process backend, as a multi-worker deployment without Redis would
+    response = client.get("/dashboard/overview", headers=auth)
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+    client.post("/habits/", json={"name": "Walk"}, headers=auth)
+    assert client.get("/dashboard/overview", headers=auth).json()["total_habits"] == response.json()["total_habits"] + 1
+
+
+def test_etag_revalidates_until_a_write(client, auth, single_process):
+    first = client.get("/dashboard/overview", headers=auth)
+    etag = first.headers["etag"]
+    assert client.get("/dashboard/overview", headers={**auth, "If-None-Match": etag}).status_code == 304
+
+    habit_id = client.post("/habits/", json={"name": "Read"}, headers=auth).json()["id"]
+    client.post(f"/habits/{habit_id}/progress", json={"date": local_today("UTC").isoformat(), "completed": True}, headers=auth)
+
+    second = client.get("/dashboard/overview", headers={**auth, "If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+    assert second.json() != first.json()
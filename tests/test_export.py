@@ -0,0 +1,64 @@
+# tests/test_export.py
+import csv
+import gzip
+import io
+import json
+from collections import Counter
+from datetime import timedelta
+import pytest
+from app.config import settings
+from app.services.export_service import CSV_FIELDS
+from app.utils.timezones import local_today
+
+TODAY = local_today("UTC")
+
+
+@pytest.fixture
+def exported(client, auth, make_user, monkeypatch):
+    """Two habits with history and a reminder; returns the expected record counts"""
+    # Several cursor batches per record type
+    monkeypatch.setattr(settings, "export_yield_per", 2)
+    habit_ids = [client.post("/habits/", json={"name": name}, headers=auth).json()["id"] for name in ("Run", "Read")]
+    client.post("/habits/progress/batch", json={"entries": [
+        # Two runs for the first habit, one for the second
+        {"habit_id": habit_id, "date": (TODAY - timedelta(days=days)).isoformat(), "completed": days != 3}
+        for habit_id, history in ((habit_ids[0], range(6)), (habit_ids[1], range(2)))
+        for days in history
+    ]}, headers=auth)
+    client.post(f"/habits/{habit_ids[0]}/reminders", json={"reminder_time": "07:30:00"}, headers=auth)
+    # Another user's data never leaks into the export
+    other = make_user()
+    other_habit = client.post("/habits/", json={"name": "Other"}, headers=other).json()["id"]
+    client.post(f"/habits/{other_habit}/progress", json={"date": TODAY.isoformat(), "completed": True}, headers=other)
+    return {"habits": 2, "progress": 8, "reminders": 1, "streaks": 3}
+
+
+def test_ndjson_counts(client, auth, exported):
+    response = client.get("/export/", headers=auth)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert Counter(record["record_type"] for record in records) == exported
+    assert {record["name"] for record in records if record["record_type"] == "habits"} == {"Run", "Read"}
+
+
+def test_csv_header_and_counts(client, auth, exported):
+    response = client.get("/export/", params={"format": "csv"}, headers=auth)
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"].endswith('.csv"')
+    reader = csv.reader(io.StringIO(response.text))
+    assert tuple(next(reader)) == CSV_FIELDS
+    assert CSV_FIELDS[0] == "record_type"
+    assert Counter(row[0] for row in reader) == exported
+
+
+def test_gzip_and_include(client, auth, exported):
+    response = client.get("/export/", params={"include": "progress,streaks", "gzip": True}, headers=auth)
+    assert response.headers["content-type"] == "application/gzip"
+    records = [json.loads(line) for line in gzip.decompress(response.content).decode().splitlines()]
+    assert Counter(record["record_type"] for record in records) == {"progress": 8, "streaks": 3}
+
+
+@pytest.mark.parametrize("include", ["passwords", "", "habits,users"])
+def test_unknown_record_types_are_400(client, auth, include):
+    assert client.get("/export/", params={"include": include}, headers=auth).status_code == 400
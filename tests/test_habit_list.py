@@ -0,0 +1,101 @@
+# tests/test_habit_list.py
+import base64
+import pytest
+
+# Names repeat so sorting by name has ties for the id tie-break to settle
+HABITS = [
+    ("Read", "daily"), ("Run", "weekly"), ("read more", "daily"),
+    ("Read", "custom"), ("Yoga", "daily"), ("Read", "daily"),
+]
+
+
+@pytest.fixture
+def habits(client, auth):
+    created = [
+        client.post("/habits/", json={"name": name, "frequency": frequency}, headers=auth).json()
+        for name, frequency in HABITS
+    ]
+    client.patch(f"/habits/{created[4]['id']}/archive", headers=auth)
+    return created
+
+
+def listing(client, auth, **params):
+    response = client.get("/habits/", params=params, headers=auth)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def walk(client, auth, limit, **params) -> list:
+    """Every row of a listing, fetched one cursor page at a time"""
+    rows, cursor = [], None
+    while True:
+        response = listing(client, auth, limit=limit, **params, **({"cursor": cursor} if cursor else {}))
+        page = response.json()
+        assert len(page) <= limit
+        rows += page
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return rows
+
+
+@pytest.mark.parametrize("sort", ["id", "name", "created_at"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_sort_keys_break_ties_on_id(client, auth, habits, sort, order):
+    active = [habit for habit in habits if habit["name"] != "Yoga"]  # Yoga is archived
+    expected = sorted(active, key=lambda habit: (habit[sort], habit["id"]), reverse=order == "desc")
+    rows = listing(client, auth, sort=sort, order=order).json()
+    assert [row["id"] for row in rows] == [habit["id"] for habit in expected]
+    # Paging with a cursor yields the same order, ties included
+    assert [row["id"] for row in walk(client, auth, 1, sort=sort, order=order)] == [habit["id"] for habit in expected]
+
+
+def test_name_ties_are_ordered_by_id(client, auth, habits):
+    rows = listing(client, auth, sort="name").json()
+    reads = [row["id"] for row in rows if row["name"] == "Read"]
+    assert reads == sorted(reads) and len(reads) == 3
+
+
+@pytest.mark.parametrize("params, names", [
+    ({"status": "archived"}, ["Yoga"]),
+    ({"status": "all", "frequency": "daily"}, ["Read", "read more", "Yoga", "Read"]),
+    ({"prefix": "READ"}, ["Read", "read more", "Read", "Read"]),
+    ({"prefix": "%"}, []),
+])
+def test_filters(client, auth, habits, params, names):
+    assert [row["name"] for row in listing(client, auth, **params).json()] == names
+
+
+def test_cursor_round_trip_keeps_the_filters(client, auth, habits):
+    first = listing(client, auth, prefix="read", sort="name", order="desc", limit=2)
+    second = listing(client, auth, prefix="read", sort="name", order="desc", limit=2, cursor=first.headers["x-next-cursor"])
+    assert "x-next-cursor" not in second.headers
+    rows = first.json() + second.json()
+    assert [row["name"] for row in rows] == ["read more", "Read", "Read", "Read"]
+    assert [row["id"] for row in rows[1:]] == sorted((row["id"] for row in rows[1:]), reverse=True)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"[1, 2").decode(),
+    base64.urlsafe_b64encode(b"5").decode(),
+    base64.urlsafe_b64encode(b'["Read", "x"]').decode(),
+])
+def test_invalid_cursor_is_400(client, auth, habits, cursor):
+    response = client.get("/habits/", params={"sort": "name", "limit": 2, "cursor": cursor}, headers=auth)
+    assert response.status_code == 400
+
+
+def test_cursor_from_another_sort_key_is_400(client, auth, habits):
+    cursor = listing(client, auth, sort="name", limit=1).headers["x-next-cursor"]
+    response = client.get("/habits/", params={"sort": "created_at", "limit": 1, "cursor": cursor}, headers=auth)
+    assert response.status_code == 400
+
+
+def test_compact_projection(client, auth, habits):
+    rows = listing(client, auth, fields="compact", sort="created_at", limit=2).json()
+    assert [set(row) for row in rows] == [{"id", "name", "frequency", "archived"}] * 2
+
+
+@pytest.mark.parametrize("params", [{"fields": "name,id"}, {"fields": "password_hash"}, {"sort": "user_id"}, {"status": "deleted"}])
+def test_unknown_fields_and_sort_keys_are_422(client, auth, habits, params):
+    assert client.get("/habits/", params=params, headers=auth).status_code == 422
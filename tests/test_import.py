@@ -0,0 +1,61 @@
+# tests/test_import.py
+import io
+import json
+from app.config import settings
+
+
+def upload(client, auth, text: str, import_format: str = "ndjson"):
+    response = client.post(
+        f"/habits/progress/import?format={import_format}",
+        files={"file": (f"history.{import_format}", io.BytesIO(text.encode()), "text/plain")},
+        headers=auth,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_rejected_lines_are_reported(client, auth):
+    result = upload(client, auth, "\n".join([
+        json.dumps({"habit_name": "Swim", "date": "2024-03-01", "completed": True}),
+        "{not json",
+        json.dumps(["a", "list"]),
+        json.dumps({"habit_name": "Swim", "completed": True}),
+        json.dumps({"habit_name": "Swim", "date": "2024-03-02"}),
+        json.dumps({"habit_id": 999999, "date": "2024-03-03", "completed": True}),
+        json.dumps({"record_type": "habit", "id": 1, "name": "Swim"}),
+        json.dumps({"date": "2024-03-04", "completed": True}),
+    ]))
+    assert (result["rows_read"], result["rows_skipped"], result["rows_rejected"]) == (8, 1, 6)
+    assert result["progress_written"] == 1
+    assert result["habits_created"] == 1
+    assert [error["line"] for error in result["errors"]] == [2, 3, 4, 5, 6, 8]
+    messages = {error["line"]: error["message"] for error in result["errors"]}
+    assert messages[2].startswith("Invalid JSON")
+    assert messages[3] == "Expected a JSON object"
+    assert messages[4] == "date: Field required"
+    # A missing completed is not taken as done
+    assert messages[5] == "completed: Field required"
+    assert messages[6] == "habit_id: Habit not found"
+    assert "habit_id or habit_name is required" in messages[8]
+
+
+def test_blank_completed_cell_is_rejected(client, auth):
+    result = upload(client, auth, "habit_name,date,completed,note\nRow,2024-03-01,,\nRow,2024-03-02,true,\n", "csv")
+    assert result["rows_rejected"] == 1
+    assert result["errors"] == [{"line": 2, "message": "completed: Field required"}]
+    assert result["progress_written"] == 1
+
+
+def test_errors_are_capped_but_all_counted(client, auth, monkeypatch):
+    monkeypatch.setattr(settings, "import_max_errors", 3)
+    monkeypatch.setattr(settings, "import_chunk_rows", 4)
+    lines = []
+    for n in range(20):
+        if n % 2:
+            lines.append(json.dumps({"habit_name": "Cap", "date": "2024-03-01"}))
+        else:
+            lines.append(json.dumps({"habit_id": 999999, "date": "2024-03-01", "completed": True}))
+    result = upload(client, auth, "\n".join(lines))
+    assert result["rows_rejected"] == 20
+    # The earliest lines, whichever check rejected them
+    assert [error["line"] for error in result["errors"]] == [1, 2, 3]
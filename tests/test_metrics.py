@@ -0,0 +1,29 @@
+# tests/test_metrics.py
+from app.middleware.metrics import REQUEST_DB_QUERIES, REQUESTS
+
+
+def test_metrics_endpoint(client, auth):
+    habit_id = client.post("/habits/", json={"name": "Read"}, headers=auth).json()["id"]
+    before = REQUESTS.value(method="GET", route="/habits/{habit_id}", status="200")
+    client.get(f"/habits/{habit_id}", headers=auth)
+    client.get("/habits/999999", headers=auth)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE http_requests_total counter" in body
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    # Labelled by the route template, not the concrete path
+    assert REQUESTS.value(method="GET", route="/habits/{habit_id}", status="200") == before + 1
+    assert REQUESTS.value(method="GET", route="/habits/{habit_id}", status="404") >= 1
+    assert 'route="/habits/{habit_id}"' in body
+    assert f"/habits/{habit_id}\"" not in body
+    assert 'http_request_db_queries_count{route="/habits/{habit_id}"}' in body
+
+
+def test_unmatched_paths_share_one_label(client):
+    client.get("/no/such/path")
+    client.get("/another/missing/path")
+    assert REQUESTS.value(method="GET", route="<unmatched>", status="404") >= 2
+    assert not any("/no/such/path" in sample for sample in REQUEST_DB_QUERIES.samples())
@@ -0,0 +1,84 @@
+# tests/test_migrations.py
+import argparse
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlmodel import SQLModel
+from app import cli
+from app.config import settings
+from app.database import SCHEMA_REVISION
+
+
+@pytest.fixture
+def scratch_engine(tmp_path, monkeypatch):
+    """An empty database that Alembic and the migrate command point at"""
+    url = f"sqlite:///{tmp_path}/migrations.db"
+    scratch = create_engine(url)
+    monkeypatch.setattr(settings, "database_url", url)
+    monkeypatch.setattr(cli, "engine", scratch)
+    yield scratch
+    scratch.dispose()
+
+
+def version(db_engine) -> str:
+    with db_engine.connect() as connection:
+        return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def test_head_matches_the_models(scratch_engine):
+    command.upgrade(Config(cli.ALEMBIC_INI), "head")
+    assert version(scratch_engine) == SCHEMA_REVISION
+    with scratch_engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection), SQLModel.metadata) == []
+
+
+def test_baseline_install_is_stamped_then_upgraded(scratch_engine):
+    # Revision 0001 is the create_all baseline; without alembic_version it is what an old install looks like
+    command.upgrade(Config(cli.ALEMBIC_INI), "0001")
+    with scratch_engine.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))
+        connection.execute(text(
+            "INSERT INTO users (id, username, email, password_hash, created_at) "
+            "VALUES (1, 'old', 'old@example.com', 'x', '2024-01-01 00:00:00')"
+        ))
+        connection.execute(text(
+            "INSERT INTO habits (id, name, frequency, user_id, created_at, archived) "
+            "VALUES (1, 'Run', 'DAILY', 1, '2024-01-01 00:00:00', 0)"
+        ))
+        # The baseline had no unique constraint, so duplicates may exist
+        for progress_id, day, completed in ((1, "01-02", 0), (2, "01-02", 1), (3, "01-03", 1), (4, "01-05", 1)):
+            connection.execute(text(
+                "INSERT INTO habit_progress (id, habit_id, date, completed, created_at) "
+                f"VALUES ({progress_id}, 1, '2024-{day}', {completed}, '2024-{day} 00:00:00')"
+            ))
+        # A run as the baseline stored it, with no length
+        connection.execute(text(
+            "INSERT INTO streaks (habit_id, start_date, end_date, longest, current) "
+            "VALUES (1, '2024-01-01', '2024-01-09', 1, 1)"
+        ))
+
+    cli.migrate(argparse.Namespace(revision="head"))
+
+    assert version(scratch_engine) == SCHEMA_REVISION
+    inspector = inspect(scratch_engine)
+    assert "length" in {column["name"] for column in inspector.get_columns("streaks")}
+    assert "unique_habit_date" in {c["name"] for c in inspector.get_unique_constraints("habit_progress")}
+    with scratch_engine.connect() as connection:
+        # The newest duplicate wins
+        assert connection.execute(text("SELECT id, completed FROM habit_progress WHERE id < 3")).all() == [(2, 1)]
+        # Derived tables are rebuilt from that history, not left for a manual rebuild
+        assert connection.execute(text(
+            "SELECT start_date, end_date, length, current, longest FROM streaks ORDER BY start_date"
+        )).all() == [("2024-01-02", "2024-01-03", 2, 0, 1), ("2024-01-05", "2024-01-05", 1, 1, 0)]
+        assert connection.execute(text(
+            "SELECT date, active_habits, entries, completed FROM user_daily_rollup ORDER BY date"
+        )).all() == [("2024-01-02", 1, 1, 1), ("2024-01-03", 1, 1, 1), ("2024-01-05", 1, 1, 1)]
+
+
+def test_unversioned_database_newer_than_the_baseline_is_refused(scratch_engine):
+    SQLModel.metadata.create_all(scratch_engine)
+    with pytest.raises(SystemExit):
+        cli.migrate(argparse.Namespace(revision="head"))
@@ -0,0 +1,57 @@
+# tests/test_ownership.py
+import pytest
+from app.utils.timezones import local_today
+
+TODAY = local_today("UTC").isoformat()
+
+HABIT_READS = [
+    "/habits/{habit_id}/progress",
+    "/habits/{habit_id}/progress/{today}",
+    "/habits/{habit_id}/streaks",
+    "/habits/{habit_id}/streaks/current",
+    "/habits/{habit_id}/streaks/longest",
+    "/habits/{habit_id}/reminders",
+]
+
+
+@pytest.mark.parametrize("path", HABIT_READS)
+def test_reads_of_a_deleted_habit_are_404(client, auth, path):
+    habit_id = client.post("/habits/", json={"name": "Read"}, headers=auth).json()["id"]
+    client.post(f"/habits/{habit_id}/progress", json={"date": TODAY, "completed": True}, headers=auth)
+    assert client.get(path.format(habit_id=habit_id, today=TODAY), headers=auth).status_code == 200
+
+    assert client.delete(f"/habits/{habit_id}", headers=auth).status_code == 200
+    assert client.get(path.format(habit_id=habit_id, today=TODAY), headers=auth).status_code == 404
+
+
+@pytest.mark.parametrize("path", HABIT_READS)
+def test_reads_of_another_users_habit_are_404(client, make_user, path):
+    owner, other = make_user(), make_user()
+    habit_id = client.post("/habits/", json={"name": "Private"}, headers=owner).json()["id"]
+    client.post(f"/habits/{habit_id}/progress", json={"date": TODAY, "completed": True}, headers=owner)
+    assert client.get(path.format(habit_id=habit_id, today=TODAY), headers=other).status_code == 404
+
+
+def test_empty_reads_of_an_owned_habit_are_200(client, auth):
+    habit_id = client.post("/habits/", json={"name": "Empty"}, headers=auth).json()["id"]
+    assert client.get(f"/habits/{habit_id}/progress", headers=auth).json() == []
+    assert client.get(f"/habits/{habit_id}/streaks", headers=auth).json() == []
+    assert client.get(f"/habits/{habit_id}/reminders", headers=auth).json() == []
+    assert client.get(f"/habits/{habit_id}/progress/{TODAY}", headers=auth).status_code == 404
+
+
+def test_writes_to_a_deleted_habit_are_404(client, auth):
+    habit_id = client.post("/habits/", json={"name": "Gone"}, headers=auth).json()["id"]
+    # Warm every per-user cache first
+    client.post(f"/habits/{habit_id}/progress", json={"date": TODAY, "completed": True}, headers=auth)
+    client.delete(f"/habits/{habit_id}", headers=auth)
+
+    response = client.post(f"/habits/{habit_id}/progress", json={"date": TODAY, "completed": True}, headers=auth)
+    assert response.status_code == 404
+    response = client.post(
+        "/habits/progress/batch",
+        json={"entries": [{"habit_id": habit_id, "date": TODAY, "completed": True}]},
+        headers=auth,
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["status"] == "not_found"
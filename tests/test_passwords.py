@@ -0,0 +1,81 @@
+# tests/test_passwords.py
+import threading
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from sqlmodel import select
+from app.config import settings
+from app.models.user import User
+from app.utils import security
+from app.utils.security import HASH_REJECTED, PasswordHasher
+
+
+@pytest.fixture
+def busy_hasher():
+    """A one-slot hasher whose slot is held by a job until the event is set"""
+    hasher = PasswordHasher(max_workers=1, max_pending=1, timeout=5)
+    release, started = threading.Event(), threading.Event()
+
+    def slow_hash():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    results = []
+    worker = threading.Thread(target=lambda: results.append(hasher.run("hash", slow_hash)))
+    worker.start()
+    started.wait(5)
+    yield hasher
+    release.set()
+    worker.join(5)
+    assert results == ["done"]
+
+
+def test_saturated_pool_rejects_with_503(busy_hasher):
+    rejected = HASH_REJECTED.value()
+    with pytest.raises(HTTPException) as raised:
+        busy_hasher.run("verify", lambda: True)
+    assert raised.value.status_code == 503
+    assert raised.value.headers["Retry-After"] == "1"
+    assert HASH_REJECTED.value() == rejected + 1
+
+
+def test_saturated_pool_turns_logins_away(client, auth, busy_hasher, monkeypatch):
+    monkeypatch.setattr(security, "password_hasher", busy_hasher)
+    username = client.get("/auth/me", headers=auth).json()["username"]
+    response = client.post("/auth/login", data={"username": username, "password": "password123"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_slot_is_freed_after_a_job():
+    hasher = PasswordHasher(max_workers=1, max_pending=1, timeout=5)
+    assert [hasher.run("hash", lambda: n) for n in range(3)] == [0, 1, 2]
+
+
+def test_slow_job_times_out_with_503():
+    hasher = PasswordHasher(max_workers=1, max_pending=2, timeout=0.05)
+    release = threading.Event()
+    with pytest.raises(HTTPException) as raised:
+        hasher.run("verify", release.wait, 5)
+    release.set()
+    assert raised.value.status_code == 503
+
+
+def test_login_upgrades_a_hash_made_at_another_cost(client, auth, db):
+    username = client.get("/auth/me", headers=auth).json()["username"]
+    user = db.exec(select(User).where(User.username == username)).one()
+    user.password_hash = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=settings.bcrypt_rounds + 1).hash("password123")
+    db.add(user)
+    db.commit()
+
+    def login_and_read_hash() -> str:
+        response = client.post("/auth/login", data={"username": username, "password": "password123"})
+        assert response.status_code == 200
+        db.expire_all()
+        return db.get(User, user.id).password_hash
+
+    upgraded = login_and_read_hash()
+    assert upgraded.startswith(f"$2b${settings.bcrypt_rounds:02d}$")
+    # Already at the configured cost: left alone
+    assert login_and_read_hash() == upgraded
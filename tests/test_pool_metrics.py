@@ -0,0 +1,34 @@
+# tests/test_pool_metrics.py
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.config import settings
+from app.database import POOL_CHECKOUT_SECONDS, POOL_IN_USE, POOL_OVERFLOW, POOL_TIMEOUTS, build_engine
+
+
+def test_pool_metrics(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 2)
+    monkeypatch.setattr(settings, "db_max_overflow", 1)
+    monkeypatch.setattr(settings, "db_pool_timeout_seconds", 0.1)
+    pool_engine = build_engine(f"sqlite:///{tmp_path}/pool.db", "pool_test")
+    labels = {"engine": "pool_test"}
+
+    connections = [pool_engine.connect() for _ in range(3)]
+    assert POOL_IN_USE.value(**labels) == 3
+    # The third connection is past pool_size
+    assert POOL_OVERFLOW.value(**labels) == 1
+
+    with pytest.raises(PoolTimeoutError):
+        pool_engine.connect()
+    assert POOL_TIMEOUTS.value(**labels) == 1
+
+    for connection in connections:
+        connection.close()
+    assert POOL_IN_USE.value(**labels) == 0
+
+    # Reusing pooled connections opens no new overflow
+    with pool_engine.connect():
+        assert POOL_IN_USE.value(**labels) == 1
+    assert POOL_OVERFLOW.value(**labels) == 1
+    # Every checkout attempt is timed, the failed one included
+    assert 'db_pool_checkout_seconds_count{engine="pool_test"} 5' in POOL_CHECKOUT_SECONDS.samples()
+    pool_engine.dispose()
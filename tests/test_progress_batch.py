@@ -0,0 +1,35 @@
+# tests/test_progress_batch.py
+from datetime import timedelta
+from app.utils.timezones import local_today
+
+TODAY = local_today("UTC")
+
+
+def test_results_match_entries_in_order(client, auth, make_user):
+    habit_id = client.post("/habits/", json={"name": "Read"}, headers=auth).json()["id"]
+    foreign_id = client.post("/habits/", json={"name": "Theirs"}, headers=make_user()).json()["id"]
+    client.post(f"/habits/{habit_id}/progress", json={"date": TODAY.isoformat(), "completed": False}, headers=auth)
+
+    entries = [
+        {"habit_id": habit_id, "date": (TODAY - timedelta(days=1)).isoformat(), "completed": True},
+        {"habit_id": foreign_id, "date": TODAY.isoformat(), "completed": True},
+        {"habit_id": habit_id, "date": TODAY.isoformat(), "completed": True},
+    ]
+    response = client.post("/habits/progress/batch", json={"entries": entries}, headers=auth)
+    assert response.status_code == 200
+    results = response.json()
+    assert [(r["habit_id"], r["date"], r["status"]) for r in results] == [
+        (habit_id, entries[0]["date"], "created"),
+        (foreign_id, entries[1]["date"], "not_found"),
+        (habit_id, entries[2]["date"], "updated"),
+    ]
+    assert results[1]["id"] is None and results[0]["id"] and results[2]["id"]
+
+
+def test_duplicate_entries_are_rejected(client, auth):
+    habit_id = client.post("/habits/", json={"name": "Run"}, headers=auth).json()["id"]
+    entry = {"habit_id": habit_id, "date": TODAY.isoformat(), "completed": True}
+    response = client.post("/habits/progress/batch", json={"entries": [entry, {**entry, "completed": False}]}, headers=auth)
+    assert response.status_code == 422
+    assert "Duplicate entry" in response.text
+    assert client.get(f"/habits/{habit_id}/progress", headers=auth).json() == []
@@ -0,0 +1,77 @@
+# tests/test_progress_listing.py
+from datetime import date, timedelta
+import pytest
+
+START = date(2024, 1, 1)
+DAYS = 150
+
+
+@pytest.fixture
+def habit_id(client, auth):
+    habit_id = client.post("/habits/", json={"name": "Journal"}, headers=auth).json()["id"]
+    response = client.post("/habits/progress/batch", json={"entries": [
+        {"habit_id": habit_id, "date": (START + timedelta(days=n)).isoformat(), "completed": n % 2 == 0}
+        for n in range(DAYS)
+    ]}, headers=auth)
+    assert response.status_code == 200
+    return habit_id
+
+
+def dates(response) -> list:
+    return [entry["date"] for entry in response.json()]
+
+
+def test_unpaged_by_default(client, auth, habit_id):
+    response = client.get(f"/habits/{habit_id}/progress", headers=auth)
+    assert len(response.json()) == DAYS
+    assert dates(response) == sorted(dates(response))
+    assert "x-next-cursor" not in response.headers
+
+
+def test_cursor_walks_every_page_once(client, auth, habit_id):
+    seen, pages, cursor = [], 0, None
+    while True:
+        params = {"limit": 40, **({"cursor": cursor} if cursor else {})}
+        response = client.get(f"/habits/{habit_id}/progress", params=params, headers=auth)
+        seen += dates(response)
+        pages += 1
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+        assert cursor == seen[-1]
+    assert pages == 4
+    assert seen == [(START + timedelta(days=n)).isoformat() for n in range(DAYS)]
+
+
+def test_date_range_is_inclusive_and_pages(client, auth, habit_id):
+    params = {"from": "2024-02-01", "to": "2024-02-10"}
+    assert dates(client.get(f"/habits/{habit_id}/progress", params=params, headers=auth)) == [
+        f"2024-02-{day:02d}" for day in range(1, 11)
+    ]
+
+    first = client.get(f"/habits/{habit_id}/progress", params={**params, "limit": 6}, headers=auth)
+    assert first.headers["x-next-cursor"] == "2024-02-06"
+    rest = client.get(
+        f"/habits/{habit_id}/progress", params={**params, "limit": 6, "cursor": "2024-02-06"}, headers=auth
+    )
+    assert dates(rest) == [f"2024-02-{day:02d}" for day in range(7, 11)]
+    assert "x-next-cursor" not in rest.headers
+
+
+def test_compact_rows(client, auth, habit_id):
+    response = client.get(f"/habits/{habit_id}/progress", params={"fields": "compact", "limit": 2}, headers=auth)
+    assert response.json() == [
+        {"date": "2024-01-01", "completed": True},
+        {"date": "2024-01-02", "completed": False},
+    ]
+
+
+@pytest.mark.parametrize("params", [{"cursor": "yesterday"}, {"limit": 0}, {"limit": 1001}, {"from": "2024-13-01"}])
+def test_invalid_paging_parameters_are_422(client, auth, habit_id, params):
+    assert client.get(f"/habits/{habit_id}/progress", params=params, headers=auth).status_code == 422
+
+
+def test_empty_range_of_an_owned_habit(client, auth, habit_id, make_user):
+    params = {"from": "2030-01-01"}
+    assert client.get(f"/habits/{habit_id}/progress", params=params, headers=auth).json() == []
+    assert client.get(f"/habits/{habit_id}/progress", params=params, headers=make_user()).status_code == 404
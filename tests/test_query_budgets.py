@@ -0,0 +1,75 @@
+# tests/test_query_budgets.py
+from datetime import timedelta
+import pytest
+from app.utils.timezones import local_today
+
+TODAY = local_today("UTC")
+
+
+@pytest.fixture
+def seeded(client, auth):
+    """A user with five habits, twenty days of history each and a reminder"""
+    habit_ids = [client.post("/habits/", json={"name": f"habit {n}"}, headers=auth).json()["id"] for n in range(5)]
+    entries = [
+        {"habit_id": habit_id, "date": (TODAY - timedelta(days=days)).isoformat(), "completed": days % 4 != 0}
+        for habit_id in habit_ids for days in range(20)
+    ]
+    response = client.post("/habits/progress/batch", json={"entries": entries}, headers=auth)
+    assert response.status_code == 200
+    client.post(f"/habits/{habit_ids[0]}/reminders", json={"reminder_time": "08:00:00"}, headers=auth)
+    return auth, habit_ids
+
+
+@pytest.mark.parametrize("path, budget", [
+    ("/habits/", 1),
+    ("/habits/{habit_id}", 1),
+    ("/habits/{habit_id}/progress", 1),
+    ("/habits/{habit_id}/progress/{today}", 1),
+    ("/habits/{habit_id}/streaks", 1),
+    ("/habits/{habit_id}/streaks/current", 1),
+    ("/habits/{habit_id}/streaks/longest", 1),
+    ("/habits/{habit_id}/reminders", 1),
+    ("/dashboard/overview", 3),
+    ("/dashboard/statistics", 4),
+    ("/dashboard/home", 4),
+    ("/dashboard/calendar/{year}/{month}", 1),
+    ("/dashboard/calendar/{year}", 1),
+])
+def test_read_endpoint_budget(client, seeded, query_budget, path, budget):
+    auth, habit_ids = seeded
+    url = path.format(habit_id=habit_ids[0], today=TODAY, year=TODAY.year, month=TODAY.month)
+    with query_budget(budget, max_repeats=1):
+        response = client.get(url, headers=auth)
+    assert response.status_code == 200, response.text
+
+
+def test_progress_write_budget(client, seeded, query_budget):
+    auth, habit_ids = seeded
+    with query_budget(13):
+        response = client.post(
+            f"/habits/{habit_ids[0]}/progress",
+            json={"date": (TODAY - timedelta(days=4)).isoformat(), "completed": True},
+            headers=auth,
+        )
+    assert response.status_code == 200
+
+
+def test_batch_write_budget_is_independent_of_batch_size(client, seeded, query_counter):
+    auth, habit_ids = seeded
+    counts = []
+    for days in (1, 30):
+        entries = [
+            {"habit_id": habit_id, "date": (TODAY - timedelta(days=100 + d)).isoformat(), "completed": True}
+            for habit_id in habit_ids for d in range(days)
+        ]
+        with query_counter() as stats:
+            assert client.post("/habits/progress/batch", json={"entries": entries}, headers=auth).status_code == 200
+        counts.append(stats.count)
+    assert counts[0] == counts[1]
+
+
+def test_budget_violation_is_reported(client, seeded, query_budget):
+    auth, _ = seeded
+    with pytest.raises(AssertionError, match="Query budget exceeded"):
+        with query_budget(0):
+            client.get("/habits/", headers=auth)
@@ -0,0 +1,67 @@
+# tests/test_query_plans.py
+from datetime import timedelta
+from app.utils.query_plans import capture_hot_reads, check_hot_queries, check_statements
+from app.utils.timezones import local_today
+
+TODAY = local_today("UTC")
+
+
+def drive_hot_endpoints(client, auth):
+    """Exercise the request paths the way clients do, writes included"""
+    habit_ids = [client.post("/habits/", json={"name": f"habit {n}"}, headers=auth).json()["id"] for n in range(3)]
+    first = habit_ids[0]
+    # Creates two runs, merges them, then splits them again
+    for days, completed in ((3, True), (1, True), (2, True), (2, False)):
+        client.post(
+            f"/habits/{first}/progress",
+            json={"date": (TODAY - timedelta(days=days)).isoformat(), "completed": completed},
+            headers=auth,
+        )
+    client.post("/habits/progress/batch", json={"entries": [
+        {"habit_id": habit_id, "date": TODAY.isoformat(), "completed": True} for habit_id in habit_ids
+    ]}, headers=auth)
+    reminder = client.post(f"/habits/{first}/reminders", json={"reminder_time": "07:30:00"}, headers=auth).json()
+
+    for path in (
+        "/habits/", "/habits/?fields=compact&limit=2", "/habits/?sort=name&limit=1",
+        f"/habits/{first}", f"/habits/{first}/progress", f"/habits/{first}/progress?fields=compact&limit=2",
+        f"/habits/{first}/progress/{TODAY}", f"/habits/{first}/streaks", f"/habits/{first}/streaks/current",
+        f"/habits/{first}/streaks/longest", f"/habits/{first}/reminders",
+        "/dashboard/overview", "/dashboard/statistics", "/dashboard/home",
+        f"/dashboard/calendar/{TODAY.year}/{TODAY.month}", f"/dashboard/calendar/{TODAY.year}",
+    ):
+        assert client.get(path, headers=auth).status_code == 200, path
+
+    client.put(f"/reminders/{reminder['id']}", json={"enabled": False}, headers=auth)
+    client.patch(f"/habits/{habit_ids[1]}/archive", headers=auth)
+    client.patch(f"/habits/{habit_ids[1]}/unarchive", headers=auth)
+    client.delete(f"/habits/{habit_ids[2]}", headers=auth)
+
+
+def test_statements_the_endpoints_run_use_indexes(client, auth, db, query_counter):
+    with query_counter(keep_statements=True) as stats:
+        drive_hot_endpoints(client, auth)
+    assert stats.statements
+    assert check_statements(db, stats.statements) == []
+
+
+def test_startup_workload_runs_the_service_statements(client, auth, db, query_counter):
+    """The placeholder workload behind check-indexes and startup precompiling
+    issues the same statement shapes as the real read endpoints"""
+    captured = {statement for statement, _ in capture_hot_reads(db)}
+    with query_counter(keep_statements=True) as stats:
+        drive_hot_endpoints(client, auth)
+    served = {statement for statement, _ in stats.statements if statement.lstrip().upper().startswith("SELECT")}
+    for statement in (
+        "SELECT streaks.id, streaks.habit_id, streaks.start_date, streaks.end_date, streaks.length, "
+        "streaks.longest, streaks.current \nFROM streaks JOIN habits ON streaks.habit_id = habits.id \n"
+        "WHERE streaks.habit_id = ? AND habits.user_id = ? ORDER BY streaks.start_date",
+    ):
+        assert statement in captured and statement in served
+    assert len(captured & served) >= 10
+    assert check_hot_queries(db) == []
+
+
+def test_a_missing_index_is_reported(db):
+    [(shape, tables)] = check_statements(db, [("SELECT id FROM habit_progress WHERE note = ?", ("x",))])
+    assert tables == ["habit_progress"]
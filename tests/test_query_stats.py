@@ -0,0 +1,30 @@
+# tests/test_query_stats.py
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.config import settings
+from app.database import engine
+
+
+def test_failed_statement_leaves_no_start_time(query_counter):
+    with query_counter() as stats, engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM no_such_table"))
+        assert not connection.info.get("query_start")
+        # The next statement is timed from its own start, not the failed one's
+        connection.execute(text("SELECT 1"))
+        assert not connection.info.get("query_start")
+    assert stats.count == 1
+
+
+def test_profiling_headers(client, auth, monkeypatch):
+    monkeypatch.setattr(settings, "db_profiling", True)
+    response = client.get("/habits/", headers=auth)
+    assert int(response.headers["X-DB-Queries"]) >= 1
+    assert float(response.headers["X-DB-Time"]) >= 0
+
+
+def test_no_profiling_headers_by_default(client, auth):
+    response = client.get("/habits/", headers=auth)
+    assert "X-DB-Queries" not in response.headers
+    assert "X-DB-Time" not in response.headers
@@ -0,0 +1,66 @@
+# tests/test_rate_limits.py
+import pytest
+from limits import parse
+from app.config import settings
+from app.middleware import rate_limiting
+from app.middleware.rate_limiting import RATE_LIMITED, api_rate_limit, auth_rate_limit
+from app.utils.startup import process_local_warnings
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """Limits switched on, with the in-memory counter store standing in for Redis"""
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    rate_limiting.storage.reset()
+    yield
+    rate_limiting.storage.reset()
+
+
+def test_limits_are_per_user_and_send_retry_after(client, make_user, limits, monkeypatch):
+    first, second = make_user(), make_user()
+    monkeypatch.setattr(api_rate_limit, "limit", parse("3/minute"))
+    for _ in range(3):
+        assert client.get("/habits/", headers=first).status_code == 200
+    rejected = RATE_LIMITED.value(scope="api")
+
+    response = client.get("/habits/", headers=first)
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["retry-after"]) <= 60
+    assert response.headers["x-ratelimit-remaining"] == "0"
+    assert RATE_LIMITED.value(scope="api") == rejected + 1
+    # Same client address, different user: its own counter
+    assert client.get("/habits/", headers=second).status_code == 200
+
+
+def test_credential_routes_are_limited_per_forwarded_ip(client, limits, monkeypatch):
+    monkeypatch.setattr(auth_rate_limit, "limit", parse("2/minute"))
+    monkeypatch.setattr(settings, "rate_limit_trusted_proxies", 1)
+
+    def login(client_ip):
+        return client.post(
+            "/auth/login", data={"username": "nobody", "password": "wrong"},
+            # The proxy appends the address it saw; anything left of it is client-supplied
+            headers={"X-Forwarded-For": f"10.9.9.9, {client_ip}"},
+        ).status_code
+
+    assert [login("203.0.113.7") for _ in range(3)] == [401, 401, 429]
+    assert login("203.0.113.8") == 401
+
+
+def test_unreachable_store_lets_requests_through(client, auth, limits, monkeypatch):
+    def broken_hit(*args):
+        raise ConnectionError("store down")
+
+    monkeypatch.setattr(rate_limiting.strategy, "hit", broken_hit)
+    assert client.get("/habits/", headers=auth).status_code == 200
+
+
+def test_memory_counters_with_several_workers_warn(monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "web_concurrency", 4)
+    assert any("rate_limit_storage_uri" in warning for warning in process_local_warnings())
+    monkeypatch.setattr(settings, "rate_limit_storage_uri", "redis://localhost:6379")
+    assert not process_local_warnings()
+    monkeypatch.setattr(settings, "rate_limit_storage_uri", "memory://")
+    monkeypatch.setattr(settings, "web_concurrency", 1)
+    assert not process_local_warnings()
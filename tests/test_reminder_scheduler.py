@@ -0,0 +1,157 @@
+# tests/test_reminder_scheduler.py
+import asyncio
+import os
+import time as time_module
+from datetime import datetime, time, timezone
+import pytest
+from app.services.reminder_scheduler import QueueSink, ReminderScheduler, ReminderSink, ScheduledReminder, reminder_scheduler
+
+
+@pytest.fixture
+def host_tz():
+    """Run under a host timezone far from UTC"""
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = "America/New_York"
+    time_module.tzset()
+    yield
+    if previous is None:
+        os.environ.pop("TZ")
+    else:
+        os.environ["TZ"] = previous
+    time_module.tzset()
+
+
+def scheduler_with(reminder_time: time) -> ReminderScheduler:
+    scheduler = ReminderScheduler(sink=QueueSink())
+    scheduler.wheel.upsert(ScheduledReminder(1, 1, 1, "Stretch", reminder_time, "UTC"))
+    return scheduler
+
+
+def drain(scheduler: ReminderScheduler):
+    items = []
+    while not scheduler.sink.queue.empty():
+        items.append(scheduler.sink.queue.get_nowait())
+    return items
+
+
+@pytest.mark.parametrize("now", [
+    datetime(2024, 6, 1, 8, 0, 30, tzinfo=timezone.utc),
+    datetime(2024, 6, 1, 8, 0, 30),
+])
+def test_dispatch_ignores_the_host_timezone(host_tz, now):
+    scheduler = scheduler_with(time(8, 0))
+    assert scheduler.dispatch_until(now) == 1
+    [due] = drain(scheduler)
+    assert due.due_at == datetime(2024, 6, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def test_dispatch_catches_up_on_missed_minutes():
+    scheduler = scheduler_with(time(8, 1))
+    assert scheduler.dispatch_until(datetime(2024, 6, 1, 8, 0, tzinfo=timezone.utc)) == 0
+    assert scheduler.dispatch_until(datetime(2024, 6, 1, 8, 3, tzinfo=timezone.utc)) == 1
+    assert scheduler.dispatch_until(datetime(2024, 6, 1, 8, 3, 40, tzinfo=timezone.utc)) == 0
+
+
+def test_failed_initial_load_is_retried(monkeypatch):
+    scheduler = ReminderScheduler(sink=QueueSink())
+    loads = []
+
+    def flaky_reload():
+        loads.append(1)
+        if len(loads) == 1:
+            raise RuntimeError("database is starting up")
+
+    class Stop(Exception):
+        pass
+
+    async def fake_sleep(moment):
+        if len(loads) >= 2:
+            raise Stop
+
+    monkeypatch.setattr(scheduler, "_reload", flaky_reload)
+    monkeypatch.setattr(scheduler, "_sleep_until", fake_sleep)
+    with pytest.raises(Stop):
+        asyncio.run(scheduler.run())
+    assert len(loads) == 2
+
+
+def test_recorded_changes_are_polled_between_full_reloads(monkeypatch):
+    scheduler = ReminderScheduler(sink=QueueSink())
+    calls = []
+
+    class Stop(Exception):
+        pass
+
+    async def fake_sleep(moment):
+        if len(calls) >= 3:
+            raise Stop
+
+    monkeypatch.setattr(scheduler, "_reload", lambda: calls.append("reload"))
+    monkeypatch.setattr(scheduler, "_poll_changes", lambda: calls.append("poll"))
+    monkeypatch.setattr(scheduler, "_sleep_until", fake_sleep)
+    with pytest.raises(Stop):
+        asyncio.run(scheduler.run())
+    assert calls == ["reload", "poll", "poll"]
+
+
+def test_sinks_must_implement_emit():
+    with pytest.raises(TypeError):
+        ReminderSink()
+
+
+def test_processes_without_the_scheduler_keep_no_wheel(client, auth, query_counter):
+    habit_id = client.post("/habits/", json={"name": "Floss"}, headers=auth).json()["id"]
+    with query_counter(keep_statements=True) as stats:
+        client.post(f"/habits/{habit_id}/reminders", json={"reminder_time": "21:00:00"}, headers=auth)
+        client.patch(f"/habits/{habit_id}/unarchive", headers=auth)
+        client.put("/auth/me", json={"timezone": "Europe/Paris"}, headers=auth)
+    assert len(reminder_scheduler.wheel) == 0
+    # Only the change rows are written; nothing re-reads reminders for a wheel
+    assert not [statement for statement, _ in stats.statements if "users.timezone" in statement and "reminders" in statement]
+
+
+def test_changes_from_any_worker_reach_the_scheduler(client, auth, db):
+    scheduler = ReminderScheduler(sink=QueueSink())
+    habit_id = client.post("/habits/", json={"name": "Stretch"}, headers=auth).json()["id"]
+    reminder_id = client.post(
+        f"/habits/{habit_id}/reminders", json={"reminder_time": "07:30:00"}, headers=auth
+    ).json()["id"]
+    scheduler.load(db)
+
+    def scheduled(minute: int):
+        # The reminder's entry at a UTC minute of day, if it is there
+        return next((entry for entry in scheduler.wheel.due(minute) if entry.reminder_id == reminder_id), None)
+
+    def after(method, path, **kwargs):
+        assert client.request(method, path, headers=auth, **kwargs).status_code == 200
+        assert scheduler.apply_changes(db) > 0
+        db.expire_all()
+
+    assert scheduled(7 * 60 + 30)
+    after("PUT", f"/reminders/{reminder_id}", json={"reminder_time": "08:00:00"})
+    assert not scheduled(7 * 60 + 30) and scheduled(8 * 60)
+    after("PUT", f"/reminders/{reminder_id}", json={"enabled": False})
+    assert not scheduled(8 * 60)
+    after("PUT", f"/reminders/{reminder_id}", json={"enabled": True})
+    assert scheduled(8 * 60)
+    after("PATCH", f"/habits/{habit_id}/archive")
+    assert not scheduled(8 * 60)
+    after("PATCH", f"/habits/{habit_id}/unarchive")
+    after("PUT", f"/habits/{habit_id}", json={"name": "Stretch twice"})
+    assert scheduled(8 * 60).habit_name == "Stretch twice"
+    # 08:00 in Kolkata (UTC+05:30) is 02:30 UTC
+    after("PUT", "/auth/me", json={"timezone": "Asia/Kolkata"})
+    assert not scheduled(8 * 60) and scheduled(2 * 60 + 30)
+    after("DELETE", f"/reminders/{reminder_id}")
+    assert not scheduled(2 * 60 + 30)
+
+
+def test_deleted_habits_leave_the_wheel(client, auth, db):
+    scheduler = ReminderScheduler(sink=QueueSink())
+    habit_id = client.post("/habits/", json={"name": "Walk"}, headers=auth).json()["id"]
+    client.post(f"/habits/{habit_id}/reminders", json={"reminder_time": "06:15:00"}, headers=auth)
+    scheduler.load(db)
+    assert habit_id in {entry.habit_id for entry in scheduler.wheel.due(6 * 60 + 15)}
+    client.delete(f"/habits/{habit_id}", headers=auth)
+    scheduler.apply_changes(db)
+    assert habit_id not in {entry.habit_id for entry in scheduler.wheel.due(6 * 60 + 15)}
@@ -0,0 +1,45 @@
+# tests/test_replica.py
+import time
+import pytest
+from sqlmodel import SQLModel
+from app import database
+from app.config import settings
+from app.database import build_engine
+from app.utils.cache import MemoryCache, NamedCache
+
+PIN_SECONDS = 0.3
+
+
+@pytest.fixture
+def replica(auth, monkeypatch, tmp_path):
+    """A second SQLite file as the replica; it never receives the primary's writes,
+    so reads that reach it see a replica lagging forever"""
+    replica_engine = build_engine(f"sqlite:///{tmp_path}/replica.db", "replica")
+    SQLModel.metadata.create_all(replica_engine)
+    monkeypatch.setattr(database, "read_engine", replica_engine)
+    monkeypatch.setattr(database, "recent_writes", NamedCache("recent_writes", MemoryCache(default_ttl=PIN_SECONDS)))
+    yield replica_engine
+    replica_engine.dispose()
+
+
+def habit_names(client, auth):
+    return [habit["name"] for habit in client.get("/habits/", headers=auth).json()]
+
+
+def test_reads_follow_writes_then_go_to_the_replica(client, auth, replica, monkeypatch):
+    monkeypatch.setattr(settings, "read_your_writes_single_process", True)
+    assert database.replica_enabled()
+    client.post("/habits/", json={"name": "Swim"}, headers=auth)
+    # Pinned to the primary right after the user's own write
+    assert habit_names(client, auth) == ["Swim"]
+
+    time.sleep(PIN_SECONDS + 0.1)
+    assert habit_names(client, auth) == []
+
+
+def test_process_local_markers_keep_reads_on_the_primary(client, auth, replica):
+    # In-process markers with several workers: the replica is not used at all
+    assert not database.replica_enabled()
+    client.post("/habits/", json={"name": "Swim"}, headers=auth)
+    time.sleep(PIN_SECONDS + 0.1)
+    assert habit_names(client, auth) == ["Swim"]
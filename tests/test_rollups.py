@@ -0,0 +1,106 @@
+# tests/test_rollups.py
+import io
+import json
+from datetime import timedelta
+from sqlmodel import select
+from app.models.user_daily_rollup import UserDailyRollup
+from app.services.rollup_service import RollupService
+from app.utils.timezones import local_today
+
+TODAY = local_today("UTC")
+
+
+def iso(days_ago: int) -> str:
+    return (TODAY - timedelta(days=days_ago)).isoformat()
+
+
+def rollup(db, user_id: int, days_ago: int):
+    db.expire_all()
+    row = db.exec(select(UserDailyRollup).where(
+        (UserDailyRollup.user_id == user_id) & (UserDailyRollup.date == TODAY - timedelta(days=days_ago))
+    )).first()
+    return (row.active_habits, row.entries, row.completed) if row else None
+
+
+def assert_consistent(db, user_id: int):
+    db.expire_all()
+    assert RollupService.check_rollups(db, [user_id]) == []
+
+
+def test_progress_writes_apply_deltas(client, auth, db):
+    user_id = client.get("/auth/me", headers=auth).json()["id"]
+    first = client.post("/habits/", json={"name": "Read"}, headers=auth).json()["id"]
+    second = client.post("/habits/", json={"name": "Run"}, headers=auth).json()["id"]
+
+    client.post(f"/habits/{first}/progress", json={"date": iso(0), "completed": True}, headers=auth)
+    assert rollup(db, user_id, 0) == (2, 1, 1)
+    # Rewriting the same day changes the completed count but not the entries
+    client.post(f"/habits/{first}/progress", json={"date": iso(0), "completed": False}, headers=auth)
+    assert rollup(db, user_id, 0) == (2, 1, 0)
+    client.post(f"/habits/{first}/progress", json={"date": iso(0), "completed": False}, headers=auth)
+    assert rollup(db, user_id, 0) == (2, 1, 0)
+
+    client.post("/habits/progress/batch", json={"entries": [
+        {"habit_id": first, "date": iso(0), "completed": True},
+        {"habit_id": second, "date": iso(0), "completed": True},
+        {"habit_id": second, "date": iso(1), "completed": False},
+    ]}, headers=auth)
+    assert rollup(db, user_id, 0) == (2, 2, 2)
+    assert_consistent(db, user_id)
+
+
+def test_archive_unarchive_and_delete_move_a_habits_contribution(client, auth, db):
+    user_id = client.get("/auth/me", headers=auth).json()["id"]
+    kept = client.post("/habits/", json={"name": "Keep"}, headers=auth).json()["id"]
+    moved = client.post("/habits/", json={"name": "Move"}, headers=auth).json()["id"]
+    for habit_id in (kept, moved):
+        client.post(f"/habits/{habit_id}/progress", json={"date": iso(0), "completed": True}, headers=auth)
+    assert rollup(db, user_id, 0) == (2, 2, 2)
+
+    client.patch(f"/habits/{moved}/archive", headers=auth)
+    assert rollup(db, user_id, 0) == (1, 1, 1)
+    # Writes to an archived habit stay out of the rollup
+    client.post(f"/habits/{moved}/progress", json={"date": iso(0), "completed": False}, headers=auth)
+    assert rollup(db, user_id, 0) == (1, 1, 1)
+
+    client.patch(f"/habits/{moved}/unarchive", headers=auth)
+    assert rollup(db, user_id, 0) == (2, 2, 1)
+    assert_consistent(db, user_id)
+
+    client.delete(f"/habits/{moved}", headers=auth)
+    assert rollup(db, user_id, 0) == (1, 1, 1)
+    assert_consistent(db, user_id)
+
+
+def test_import_rebuild_matches_the_checker(client, auth, db):
+    user_id = client.get("/auth/me", headers=auth).json()["id"]
+    lines = "\n".join(
+        json.dumps({"habit_name": name, "date": iso(days_ago), "completed": days_ago % 2 == 0})
+        for name in ("Swim", "Cook") for days_ago in range(10)
+    )
+    response = client.post(
+        "/habits/progress/import",
+        files={"file": ("history.ndjson", io.BytesIO(lines.encode()), "application/x-ndjson")},
+        headers=auth,
+    )
+    assert response.status_code == 200, response.text
+    assert rollup(db, user_id, 0) == (2, 2, 2)
+    assert rollup(db, user_id, 1) == (2, 2, 0)
+    assert_consistent(db, user_id)
+
+
+def test_checker_reports_drift_and_rebuild_repairs_it(client, auth, db):
+    user_id = client.get("/auth/me", headers=auth).json()["id"]
+    habit_id = client.post("/habits/", json={"name": "Drift"}, headers=auth).json()["id"]
+    client.post(f"/habits/{habit_id}/progress", json={"date": iso(0), "completed": True}, headers=auth)
+
+    row = db.exec(select(UserDailyRollup).where(UserDailyRollup.user_id == user_id)).one()
+    row.completed = 5
+    db.add(row)
+    db.commit()
+    [(_, day, stored, expected)] = RollupService.check_rollups(db, [user_id])
+    assert (day, stored, expected) == (TODAY, (1, 1, 5), (1, 1, 1))
+
+    RollupService.rebuild_rollups(db, [user_id])
+    db.commit()
+    assert_consistent(db, user_id)
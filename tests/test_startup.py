@@ -0,0 +1,33 @@
+# tests/test_startup.py
+from app.utils.query_plans import capture_hot_reads
+from app.utils.query_stats import statement_shape
+from app.utils.startup import prepare_worker
+from app.utils.timezones import local_today
+
+TODAY = local_today("UTC")
+
+
+def test_prepare_worker_reports_each_phase():
+    timings = prepare_worker()
+    assert {"pool_warmup", "precompile"} <= set(timings)
+
+
+def test_precompile_covers_the_read_endpoints(client, auth, db, query_counter):
+    """Every statement a read endpoint sends was already compiled at startup"""
+    habit_id = client.post("/habits/", json={"name": "read"}, headers=auth).json()["id"]
+    client.post(f"/habits/{habit_id}/progress", json={"date": TODAY.isoformat(), "completed": True}, headers=auth)
+    client.post(f"/habits/{habit_id}/reminders", json={"reminder_time": "07:30:00"}, headers=auth)
+
+    precompiled = {statement_shape(statement) for statement, _ in capture_hot_reads(db)}
+    for path in (
+        "/habits/", "/habits/?fields=compact&limit=50", f"/habits/{habit_id}", f"/habits/{habit_id}/progress",
+        f"/habits/{habit_id}/progress?limit=100",
+        f"/habits/{habit_id}/progress/{TODAY}", f"/habits/{habit_id}/streaks", f"/habits/{habit_id}/streaks/current",
+        f"/habits/{habit_id}/streaks/longest", f"/habits/{habit_id}/reminders",
+        "/dashboard/statistics", "/dashboard/home",
+        f"/dashboard/calendar/{TODAY.year}/{TODAY.month}", f"/dashboard/calendar/{TODAY.year}",
+    ):
+        with query_counter(keep_statements=True) as stats:
+            assert client.get(path, headers=auth).status_code == 200
+        served = {statement_shape(statement) for statement, _ in stats.statements}
+        assert served <= precompiled, path
@@ -0,0 +1,140 @@
+# tests/test_streaks.py
+import random
+from datetime import date, timedelta
+import pytest
+from sqlmodel import select
+from app.models.streak import Streak
+from app.services.streak_service import StreakService
+
+START = date(2024, 3, 1)
+
+
+def day(n: int) -> str:
+    return (START + timedelta(days=n)).isoformat()
+
+
+@pytest.fixture
+def habit(client, auth):
+    habit_id = client.post("/habits/", json={"name": "Run"}, headers=auth).json()["id"]
+    return auth, habit_id
+
+
+def set_day(client, habit, n: int, completed: bool = True):
+    auth, habit_id = habit
+    response = client.post(f"/habits/{habit_id}/progress", json={"date": day(n), "completed": completed}, headers=auth)
+    assert response.status_code == 200, response.text
+
+
+def stored_runs(client, habit):
+    """[(start, end, length, current, longest)] as served by the API"""
+    auth, habit_id = habit
+    return [
+        (s["start_date"], s["end_date"], s["length"], s["current"], s["longest"])
+        for s in client.get(f"/habits/{habit_id}/streaks", headers=auth).json()
+    ]
+
+
+def expected_runs(days):
+    """Runs and flags for a set of completed day numbers, as rebuild_streaks defines them"""
+    runs = []
+    for n in sorted(days):
+        if runs and runs[-1][1] == n - 1:
+            runs[-1][1] = n
+        else:
+            runs.append([n, n])
+    if not runs:
+        return []
+    current = max(range(len(runs)), key=lambda i: runs[i][1])
+    longest = max(range(len(runs)), key=lambda i: (runs[i][1] - runs[i][0], runs[i][1]))
+    return [
+        (day(first), day(last), last - first + 1, i == current, i == longest)
+        for i, (first, last) in enumerate(runs)
+    ]
+
+
+def test_completing_the_gap_merges_runs(client, habit):
+    set_day(client, habit, 0)
+    set_day(client, habit, 2)
+    assert len(stored_runs(client, habit)) == 2
+
+    set_day(client, habit, 1)
+    assert stored_runs(client, habit) == [(day(0), day(2), 3, True, True)]
+
+
+def test_uncompleting_a_middle_day_splits_the_run(client, habit):
+    for n in range(5):
+        set_day(client, habit, n)
+    set_day(client, habit, 2, completed=False)
+    # Equal lengths: the later run is the longest
+    assert stored_runs(client, habit) == [
+        (day(0), day(1), 2, False, False),
+        (day(3), day(4), 2, True, True),
+    ]
+
+
+def test_uncompleting_run_edges_shrinks_and_removes(client, habit):
+    for n in range(3):
+        set_day(client, habit, n)
+    set_day(client, habit, 0, completed=False)
+    set_day(client, habit, 2, completed=False)
+    assert stored_runs(client, habit) == [(day(1), day(1), 1, True, True)]
+    set_day(client, habit, 1, completed=False)
+    assert stored_runs(client, habit) == []
+
+
+def test_flags_hand_off_between_runs(client, habit):
+    for n in range(5):
+        set_day(client, habit, n)
+    set_day(client, habit, 10)
+    set_day(client, habit, 11)
+    assert stored_runs(client, habit) == [
+        (day(0), day(4), 5, False, True),
+        (day(10), day(11), 2, True, False),
+    ]
+
+    for n in range(12, 15):
+        set_day(client, habit, n)
+    assert stored_runs(client, habit) == [
+        (day(0), day(4), 5, False, False),
+        (day(10), day(14), 5, True, True),
+    ]
+
+    # Back-filling an older day moves neither flag onto a newer run
+    set_day(client, habit, 20)
+    set_day(client, habit, 14, completed=False)
+    set_day(client, habit, 5)
+    assert stored_runs(client, habit) == expected_runs({*range(6), *range(10, 14), 20})
+
+
+def test_incremental_updates_match_a_rebuild(client, habit, db):
+    rng = random.Random(2024)
+    auth, habit_id = habit
+    completed = set()
+    for _ in range(120):
+        if rng.random() < 0.2:
+            # Batches take the rebuild path
+            changes = {rng.randrange(30): rng.random() < 0.6 for _ in range(5)}
+            entries = [{"habit_id": habit_id, "date": day(n), "completed": done} for n, done in changes.items()]
+            assert client.post("/habits/progress/batch", json={"entries": entries}, headers=auth).status_code == 200
+        else:
+            changes = {rng.randrange(30): rng.random() < 0.6}
+            for n, done in changes.items():
+                set_day(client, habit, n, done)
+        for n, done in changes.items():
+            (completed.add if done else completed.discard)(n)
+        assert stored_runs(client, habit) == expected_runs(completed)
+
+    incremental = stored_runs(client, habit)
+    StreakService.rebuild_streaks(db, [habit_id])
+    db.commit()
+    assert stored_runs(client, habit) == incremental
+
+
+def test_at_most_one_run_carries_each_flag(client, habit, db):
+    for n in (0, 1, 3, 4, 6, 7):
+        set_day(client, habit, n)
+    for n in (1, 4):
+        set_day(client, habit, n, completed=False)
+    streaks = db.exec(select(Streak).where(Streak.habit_id == habit[1])).all()
+    assert sum(s.current for s in streaks) == 1
+    assert sum(s.longest for s in streaks) == 1
@@ -0,0 +1,52 @@
+# tests/test_timezones.py
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import literal
+from sqlmodel import select
+from app.utils.sql import local_date
+from app.utils.timezones import local_today, to_local_date
+
+# UTC+14 and UTC-11: at any moment at least one of them is on another date than UTC
+FAR_ZONES = ("Pacific/Kiritimati", "Pacific/Pago_Pago")
+
+
+@pytest.fixture(params=FAR_ZONES)
+def far_zone(request):
+    """A timezone whose date differs from UTC's right now"""
+    if local_today(request.param) == local_today("UTC"):
+        pytest.skip(f"{request.param} is on UTC's date at the moment")
+    return request.param
+
+
+@pytest.mark.parametrize("zone, expected", [
+    ("UTC", "2024-01-01"),
+    ("Pacific/Kiritimati", "2024-01-02"),
+    ("Pacific/Pago_Pago", "2024-01-01"),
+    ("America/New_York", "2024-01-01"),
+])
+def test_local_date_in_sql_matches_python(db, zone, expected):
+    timestamp = datetime(2024, 1, 1, 20, 30)
+    assert to_local_date(timestamp, zone).isoformat() == expected
+    assert db.exec(select(local_date(literal(timestamp), literal(zone)))).one().isoformat() == expected
+
+
+def test_today_is_the_users_local_date(client, make_user, far_zone):
+    auth = make_user(far_zone)
+    today, utc_today = local_today(far_zone), local_today("UTC")
+    habit_id = client.post("/habits/", json={"name": "Journal"}, headers=auth).json()["id"]
+    entry = {"habit_id": habit_id, "date": today.isoformat(), "completed": True}
+    assert client.post("/habits/progress/batch", json={"entries": [entry]}, headers=auth).status_code == 200
+
+    overview = client.get("/dashboard/overview", headers=auth).json()
+    assert overview["completed_today"] == 1
+    assert overview["active_streaks"] == 1
+    assert client.get(f"/habits/{habit_id}/streaks/current", headers=auth).json()["current_streak"] == 1
+    month = client.get(f"/dashboard/calendar/{today.year}/{today.month}", headers=auth).json()
+    assert month["entries"][today.day - 1] == {"date": today.isoformat(), "completed_habits": 1, "total_habits": 1}
+
+    # Seen from UTC the entry is on another day (tomorrow or yesterday), so nothing is done today
+    assert client.put("/auth/me", json={"timezone": "UTC"}, headers=auth).status_code == 200
+    overview = client.get("/dashboard/overview", headers=auth).json()
+    assert overview["completed_today"] == 0
+    month = client.get(f"/dashboard/calendar/{utc_today.year}/{utc_today.month}", headers=auth).json()
+    assert month["entries"][utc_today.day - 1]["completed_habits"] == 0